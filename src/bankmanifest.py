@@ -0,0 +1,237 @@
+import json
+import os
+from checkdata import CheckData
+from compiledbank import file_hash
+
+
+class BankManifest():
+    """
+    Summary of a question bank that has passed the deep validation.
+
+    The manifest is a small JSON file written next to the bank. At
+    startup CheckData trusts the bank if the size and the modification
+    time recorded in the manifest match the bank, so the bank is not
+    read at all. If they differ, the hash of the bank is compared, and a
+    bank without a matching manifest is validated again. Manifests are
+    written by "python bankmanifest.py BANK...", or by CheckData if its
+    write_manifest flag is set.
+
+    Attributes
+    ----------
+    bank_name : str
+        The name of the question bank.
+    sha256 : str
+        The SHA-256 hash of the bank in hexadecimal.
+    size : int
+        The size of the bank in bytes.
+    mtime_ns : int
+        The modification time of the bank in nanoseconds.
+    questions : int
+        Number of questions in the bank.
+    answer_counts : str
+        Number of answers of every question, one digit per question.
+    schema_version : int
+        Version of the manifest format.
+    """
+
+    SCHEMA_VERSION = 1
+    SUFFIX = '.manifest.json'
+
+    def __init__(
+        self,
+        bank_name: str,
+        sha256: str,
+        size: int,
+        mtime_ns: int,
+        questions: int,
+        answer_counts: str,
+        schema_version: int = SCHEMA_VERSION
+    ) -> None:
+        self.bank_name = bank_name
+        self.sha256 = sha256
+        self.size = size
+        self.mtime_ns = mtime_ns
+        self.questions = questions
+        self.answer_counts = answer_counts
+        self.schema_version = schema_version
+
+    @classmethod
+    def manifest_name(cls, bank_name: str) -> str:
+        """Returns the name of the manifest of the bank."""
+
+        return bank_name + cls.SUFFIX
+
+    @classmethod
+    def build(
+        cls,
+        bank_name: str,
+        check_data: CheckData = None,
+        limit: int = 20
+    ) -> 'BankManifest':
+        """Validates the whole bank and returns its manifest.
+
+        Parameters
+        ----------
+        bank_name : str
+            The name of the question bank.
+        check_data : CheckData
+            The validator. By default a new one.
+        limit : int
+            Maximum number of problems reported.
+
+        Returns
+        -------
+        BankManifest
+            The manifest of the bank.
+
+        Raises
+        ------
+        ValueError
+            If the bank is invalid. The message lists the problems found.
+        """
+
+        if check_data is None:
+            check_data = CheckData()
+        if not check_data.allowed_file(bank_name):
+            raise ValueError(f'{bank_name}: unsupported file format')
+        stat = os.stat(bank_name)
+        sha256 = file_hash(bank_name).hex()
+        counts = []
+        problems = check_data.bank_problems(bank_name, limit, counts)
+        if problems:
+            raise ValueError(
+                '\n'.join(f'{bank_name}: {problem}' for problem in problems)
+            )
+        answer_counts = ''.join(map(str, counts))
+        return cls(
+            bank_name,
+            sha256,
+            stat.st_size,
+            stat.st_mtime_ns,
+            len(answer_counts),
+            answer_counts
+        )
+
+    @classmethod
+    def load(cls, bank_name: str) -> 'BankManifest':
+        """Reads the manifest of the bank.
+
+        Parameters
+        ----------
+        bank_name : str
+            The name of the question bank.
+
+        Returns
+        -------
+        BankManifest
+            The manifest, or None if it does not exist, cannot be read or
+            has another schema version.
+        """
+
+        try:
+            with open(cls.manifest_name(bank_name), 'r') as f:
+                data = json.load(f)
+            if data['schema_version'] != cls.SCHEMA_VERSION:
+                return None
+            return cls(
+                bank_name,
+                str(data['sha256']),
+                int(data['size']),
+                int(data['mtime_ns']),
+                int(data['questions']),
+                str(data['answer_counts'])
+            )
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def save(self) -> str:
+        """Writes the manifest next to the bank. The file is replaced
+        atomically, so concurrent readers never see a partial manifest.
+
+        Returns
+        -------
+        str
+            The name of the manifest file.
+        """
+
+        file_name = self.manifest_name(self.bank_name)
+        temporary = f'{file_name}.{os.getpid()}.tmp'
+        try:
+            with open(temporary, 'w') as f:
+                json.dump(self.to_dict(), f, indent=2)
+            os.replace(temporary, file_name)
+        except OSError:
+            if os.path.exists(temporary):
+                os.remove(temporary)
+            raise
+        return file_name
+
+    def matches(self) -> bool:
+        """Checks whether the bank is the one the manifest was written for.
+        The hash is computed only if the size or the modification time of
+        the bank differ from the recorded ones. If the hash matches, the
+        new modification time is saved, so the bank is not hashed again.
+
+        Returns
+        -------
+        bool
+            Returns True if the bank is unchanged. False - otherwise.
+        """
+
+        try:
+            stat = os.stat(self.bank_name)
+            if (
+                stat.st_size == self.size and
+                stat.st_mtime_ns == self.mtime_ns
+            ):
+                return True
+            if (
+                stat.st_size != self.size or
+                file_hash(self.bank_name).hex() != self.sha256
+            ):
+                return False
+        except OSError:
+            return False
+        self.mtime_ns = stat.st_mtime_ns
+        try:
+            self.save()
+        except OSError:
+            pass
+        return True
+
+    def to_dict(self) -> dict:
+        """Returns the manifest in the file format."""
+
+        return {
+            'schema_version': self.schema_version,
+            'bank': os.path.basename(self.bank_name),
+            'sha256': self.sha256,
+            'size': self.size,
+            'mtime_ns': self.mtime_ns,
+            'questions': self.questions,
+            'answer_counts': self.answer_counts,
+        }
+
+
+if __name__ == '__main__':
+    import argparse
+    import sys
+
+    parser = argparse.ArgumentParser(
+        description='Validates question banks and writes their manifests.'
+    )
+    parser.add_argument('banks', nargs='+', help='question bank files')
+    args = parser.parse_args()
+    status = 0
+    for bank_name in args.banks:
+        try:
+            manifest = BankManifest.build(bank_name)
+        except (OSError, ValueError) as error:
+            print(error, file=sys.stderr)
+            status = 1
+            continue
+        print(
+            f'{bank_name}: {manifest.questions} questions, '
+            f'manifest written to {manifest.save()}'
+        )
+    sys.exit(status)
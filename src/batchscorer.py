@@ -0,0 +1,235 @@
+import numpy as np
+from scoringrules import ScoringRules
+from voightkampfftest import VoightKampffTest
+
+
+class BatchScorer():
+    """
+    Vectorized scoring of the Voight-Kampff test for many subjects.
+
+    The normal ranges and the threshold are taken from the same
+    ScoringRules as VoightKampffTest, so the coefficients match
+    VoightKampffTest.get_result exactly.
+
+    Attributes
+    ----------
+    test : VoightKampffTest
+        The test whose rules are applied.
+    rules : ScoringRules
+        The normal ranges and the threshold.
+    """
+
+    HUMAN = 'human'
+    REPLICANT = 'replicant'
+
+    def __init__(
+        self,
+        test: VoightKampffTest = None,
+        rules: ScoringRules = None
+    ) -> None:
+        """
+        Parameters
+        ----------
+        test : VoightKampffTest
+            The test whose rules are applied.
+        rules : ScoringRules
+            The normal ranges and the threshold. By default the rules of
+            the test.
+        """
+
+        self.test = test if test is not None else VoightKampffTest(rules)
+        self.rules = rules if rules is not None else self.test.rules
+
+    def normal_counts(
+        self,
+        respiration,
+        heart_rate,
+        blushing_level,
+        pupillary_dilation
+    ):
+        """Counts the readings within the normal ranges.
+
+        Parameters
+        ----------
+        respiration : array_like
+            Respiration values.
+        heart_rate : array_like
+            Heart rate values.
+        blushing_level : array_like
+            Blushing level values.
+        pupillary_dilation : array_like
+            Pupillary dilation values.
+
+        Returns
+        -------
+        numpy.ndarray
+            The number of normal values (from 0 to 4) for every reading,
+            in the shape of the input arrays.
+        """
+
+        counts = self._in_range(
+            respiration, self.rules.respiration, np.float64
+        ).astype(np.int64)
+        counts += self._in_range(heart_rate, self.rules.heart_rate)
+        counts += self._in_range(blushing_level, self.rules.blushing_level)
+        counts += self._in_range(
+            pupillary_dilation, self.rules.pupillary_dilation
+        )
+        return counts
+
+    def score(
+        self,
+        respiration,
+        heart_rate,
+        blushing_level,
+        pupillary_dilation,
+        lengths=None
+    ):
+        """Scores subjects whose readings are stored as rows of
+        two-dimensional arrays.
+
+        Parameters
+        ----------
+        respiration : array_like
+            Respiration values, one row per subject.
+        heart_rate : array_like
+            Heart rate values, one row per subject.
+        blushing_level : array_like
+            Blushing level values, one row per subject.
+        pupillary_dilation : array_like
+            Pupillary dilation values, one row per subject.
+        lengths : array_like, optional
+            The number of readings of every subject. The rest of the row
+            is padding and is ignored. By default all readings are used.
+
+        Returns
+        -------
+        tuple
+            The coefficients and the verdicts ("human" or "replicant")
+            of the subjects. A subject without readings gets the NaN
+            coefficient and the "replicant" verdict.
+
+        Raises
+        ------
+        ValueError
+            If the readings are not two-dimensional arrays, or the
+            lengths do not give one number between 0 and the row length
+            for every subject.
+        """
+
+        counts = self.normal_counts(
+            respiration, heart_rate, blushing_level, pupillary_dilation
+        )
+        if counts.ndim != 2:
+            raise ValueError('Readings must be two-dimensional arrays')
+        if lengths is None:
+            lengths = np.full(counts.shape[0], counts.shape[1])
+        else:
+            lengths = np.asarray(lengths, dtype=np.int64)
+            if lengths.shape != counts.shape[:1]:
+                raise ValueError('There must be one length per subject')
+            if np.any((lengths < 0) | (lengths > counts.shape[1])):
+                raise ValueError(
+                    'Lengths must be between 0 and the number of readings'
+                )
+            counts[np.arange(counts.shape[1]) >= lengths[:, None]] = 0
+        return self._verdicts(counts.sum(axis=1), lengths)
+
+    def score_flat(
+        self,
+        respiration,
+        heart_rate,
+        blushing_level,
+        pupillary_dilation,
+        offsets
+    ):
+        """Scores subjects whose readings are concatenated into flat
+        columns.
+
+        Parameters
+        ----------
+        respiration : array_like
+            Respiration values of all subjects.
+        heart_rate : array_like
+            Heart rate values of all subjects.
+        blushing_level : array_like
+            Blushing level values of all subjects.
+        pupillary_dilation : array_like
+            Pupillary dilation values of all subjects.
+        offsets : array_like
+            Index of the first reading of every subject followed by the
+            total number of readings.
+
+        Returns
+        -------
+        tuple
+            The coefficients and the verdicts of the subjects.
+
+        Raises
+        ------
+        ValueError
+            If the offsets are not a non-empty non-decreasing sequence
+            between 0 and the number of readings.
+        """
+
+        counts = self.normal_counts(
+            respiration, heart_rate, blushing_level, pupillary_dilation
+        )
+        offsets = np.asarray(offsets, dtype=np.int64)
+        if (
+            offsets.ndim != 1 or
+            not len(offsets) or
+            offsets[0] < 0 or
+            offsets[-1] > len(counts) or
+            np.any(np.diff(offsets) < 0)
+        ):
+            raise ValueError(
+                'Offsets must be non-decreasing and between 0 and the '
+                'number of readings'
+            )
+        cumulative = np.concatenate(([0], np.cumsum(counts)))
+        sums = cumulative[offsets[1:]] - cumulative[offsets[:-1]]
+        return self._verdicts(sums, np.diff(offsets))
+
+    def score_buffers(self, buffers):
+        """Scores subjects whose readings are stored in ReadingBuffer
+        objects.
+
+        Parameters
+        ----------
+        buffers : iterable
+            ReadingBuffer objects, one per subject.
+
+        Returns
+        -------
+        tuple
+            The coefficients and the verdicts of the subjects.
+        """
+
+        views = [buffer.columns() for buffer in buffers]
+        offsets = np.cumsum([0] + [len(view[0]) for view in views])
+        columns = [
+            np.concatenate(
+                [np.asarray(view[i]) for view in views] or [np.empty(0)]
+            )
+            for i in range(4)
+        ]
+        return self.score_flat(*columns, offsets)
+
+    def _in_range(self, values, bounds: tuple, dtype=None):
+        """Returns the mask of values within the bounds."""
+
+        values = np.asarray(values, dtype=dtype)
+        return (values >= bounds[0]) & (values <= bounds[1])
+
+    def _verdicts(self, sums, lengths):
+        """Converts the numbers of normal values into the results."""
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            coefficients = sums / (lengths * 4)
+        verdicts = np.where(
+            coefficients >= self.rules.threshold,
+            self.HUMAN,
+            self.REPLICANT
+        )
+        return coefficients, verdicts
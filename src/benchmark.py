@@ -0,0 +1,365 @@
+import argparse
+import builtins
+import contextlib
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from checkdata import CheckData
+from questionbank import QuestionBank
+from reader import Reader
+from voightkampfftest import VoightKampffTest
+
+
+DEFAULT_SIZES = (10, 1000, 100000)
+STARTUP_MODULES = ('main', 'viewer')
+STARTUP_BUDGET = 0.05
+HEAVY_MODULES = ('numpy', 'asyncio', 'concurrent.futures')
+
+
+def make_bank(file_name: str, size: int) -> None:
+    """Writes a synthetic question bank.
+
+    Parameters
+    ----------
+    file_name : str
+        The name of the file to write.
+    size : int
+        Number of questions.
+    """
+
+    with open(file_name, 'w', encoding='utf-8') as f:
+        json.dump({
+            'questions': [f'Вопрос номер {i}?' for i in range(size)],
+            'answers': [
+                [f'Ответ {j} на вопрос {i}' for j in range(1, 5)]
+                for i in range(size)
+            ],
+        }, f, ensure_ascii=False)
+
+
+def make_session(size: int, seed: int = 0) -> dict:
+    """Returns a synthetic recorded session with string values.
+
+    Parameters
+    ----------
+    size : int
+        Number of questions.
+    seed : int
+        Seed of the random values.
+
+    Returns
+    -------
+    dict
+        The columns of answers and readings.
+    """
+
+    rng = random.Random(seed)
+    return {
+        'answers': [str(rng.randint(1, 4)) for _ in range(size)],
+        'respiration': [
+            str(round(rng.uniform(10.0, 18.0), 1)) for _ in range(size)
+        ],
+        'heart_rate': [str(rng.randint(55, 105)) for _ in range(size)],
+        'blushing_level': [str(rng.randint(1, 5)) for _ in range(size)],
+        'pupillary_dilation': [str(rng.randint(1, 9)) for _ in range(size)],
+    }
+
+
+def best_time(function, repeat: int) -> float:
+    """Returns the shortest of several runs of the function in seconds."""
+
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def bench_read(bank_name: str, session: dict) -> None:
+    """Parses the bank and walks all questions."""
+
+    QuestionBank.clear_cache()
+    for _ in Reader(bank_name).items():
+        pass
+
+
+def bench_validate(bank_name: str, session: dict) -> None:
+    """Validates all values of the session."""
+
+    CheckData().check_columns(
+        session['answers'],
+        session['respiration'],
+        session['heart_rate'],
+        session['blushing_level'],
+        session['pupillary_dilation']
+    )
+
+
+def bench_score(bank_name: str, session: dict) -> None:
+    """Adds all readings of the session and computes the result."""
+
+    test = VoightKampffTest()
+    for resp, heart, blush, pup in zip(
+        session['respiration'],
+        session['heart_rate'],
+        session['blushing_level'],
+        session['pupillary_dilation']
+    ):
+        test.add_respiration(float(resp))
+        test.add_heart_rate(int(heart))
+        test.add_blushing_level(int(blush))
+        test.add_pupillary_dilation(int(pup))
+    with contextlib.redirect_stdout(None):
+        test.get_result()
+
+
+def bench_session(bank_name: str, session: dict) -> None:
+    """Runs main() with the session entered as scripted input."""
+
+    from main import main
+
+    QuestionBank.clear_cache()
+    inputs = iter([bank_name] + [
+        value
+        for row in zip(
+            session['answers'],
+            session['respiration'],
+            session['heart_rate'],
+            session['blushing_level'],
+            session['pupillary_dilation']
+        )
+        for value in row
+    ])
+    original_input = builtins.input
+    builtins.input = lambda _: next(inputs)
+    try:
+        with open(os.devnull, 'w') as devnull:
+            with contextlib.redirect_stdout(devnull):
+                main()
+    finally:
+        builtins.input = original_input
+
+
+def startup_time(modules=STARTUP_MODULES, repeat: int = 5) -> float:
+    """Measures the import time of the interactive mode with
+    "-X importtime" in fresh interpreters.
+
+    Parameters
+    ----------
+    modules : iterable
+        The modules imported by the interactive mode.
+    repeat : int
+        Number of interpreters started; the best time is kept.
+
+    Returns
+    -------
+    float
+        The total cumulative import time of the modules in seconds.
+    """
+
+    modules = list(modules)
+    times = []
+    for _ in range(repeat):
+        stderr = subprocess.run(
+            [
+                sys.executable, '-X', 'importtime', '-c',
+                'import ' + ', '.join(modules)
+            ],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            capture_output=True,
+            text=True,
+            check=True
+        ).stderr
+        microseconds = 0
+        for line in stderr.splitlines():
+            fields = line.split('|')
+            if (
+                len(fields) == 3 and
+                fields[2].strip() in modules and
+                not fields[2].startswith('  ')
+            ):
+                microseconds += int(fields[1])
+        times.append(microseconds / 1e6)
+    return min(times)
+
+
+def loaded_modules(code: str) -> set:
+    """Returns the modules loaded by the code run in a fresh
+    interpreter."""
+
+    return set(subprocess.run(
+        [
+            sys.executable, '-c',
+            code + '\nimport sys\nprint("\\n".join(sys.modules))'
+        ],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        capture_output=True,
+        text=True,
+        check=True
+    ).stdout.split())
+
+
+BENCHMARKS = {
+    'read': bench_read,
+    'validate': bench_validate,
+    'score': bench_score,
+    'session': bench_session,
+}
+
+
+def run(sizes, names=None, repeat: int = 3) -> dict:
+    """Runs the benchmarks for every size.
+
+    Parameters
+    ----------
+    sizes : iterable
+        Numbers of questions.
+    names : iterable, optional
+        Names of the benchmarks. By default all are run.
+    repeat : int
+        Number of runs of every benchmark; the best time is kept.
+
+    Returns
+    -------
+    dict
+        The machine-readable results.
+    """
+
+    names = list(names or BENCHMARKS)
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        for size in sizes:
+            bank_name = os.path.join(directory, f'bank{size}.json')
+            make_bank(bank_name, size)
+            session = make_session(size)
+            for name in names:
+                seconds = best_time(
+                    lambda: BENCHMARKS[name](bank_name, session), repeat
+                )
+                results.append({
+                    'name': name,
+                    'size': size,
+                    'seconds': seconds,
+                    'per_question': seconds/size,
+                })
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'results': results,
+    }
+
+
+def compare(current: dict, baseline: dict, tolerance: float) -> list:
+    """Finds the benchmarks that became slower than the baseline.
+
+    Parameters
+    ----------
+    current : dict
+        Results of the current run.
+    baseline : dict
+        Stored results.
+    tolerance : float
+        Allowed slowdown, 0.2 means 20 percent.
+
+    Returns
+    -------
+    list
+        Messages about the regressions.
+    """
+
+    stored = {
+        (result['name'], result['size']): result['seconds']
+        for result in baseline['results']
+    }
+    regressions = []
+    for result in current['results']:
+        key = (result['name'], result['size'])
+        if key in stored and result['seconds'] > stored[key]*(1 + tolerance):
+            regressions.append(
+                f'{result["name"]}[{result["size"]}]: '
+                f'{result["seconds"]:.6f} s, baseline {stored[key]:.6f} s'
+            )
+    return regressions
+
+
+def main(argv=None) -> int:
+    """Runs the benchmarks from the command line.
+
+    Returns
+    -------
+    int
+        The exit status: 1 if a regression was found, 0 otherwise.
+    """
+
+    parser = argparse.ArgumentParser(
+        description='Benchmarks of the Voight-Kampff test hot paths.'
+    )
+    parser.add_argument(
+        '-s', '--sizes',
+        default=','.join(str(size) for size in DEFAULT_SIZES),
+        help='comma-separated numbers of questions (up to 1000000)'
+    )
+    parser.add_argument(
+        '-b', '--benchmarks',
+        default=','.join(BENCHMARKS),
+        help='comma-separated benchmark names'
+    )
+    parser.add_argument('-r', '--repeat', type=int, default=3)
+    parser.add_argument(
+        '-o', '--output',
+        default='benchmark.json',
+        help='file for the results'
+    )
+    parser.add_argument('--compare', help='baseline results file')
+    parser.add_argument(
+        '--startup-budget',
+        type=float,
+        default=STARTUP_BUDGET,
+        help='allowed import time of the interactive mode in seconds'
+    )
+    parser.add_argument(
+        '--tolerance',
+        type=float,
+        default=0.2,
+        help='allowed slowdown against the baseline'
+    )
+    args = parser.parse_args(argv)
+    results = run(
+        [int(size) for size in args.sizes.split(',')],
+        args.benchmarks.split(','),
+        args.repeat
+    )
+    results['startup'] = startup_time(repeat=args.repeat)
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=2)
+    for result in results['results']:
+        print(
+            f'{result["name"]:>10} {result["size"]:>8} '
+            f'{result["seconds"]:.6f} s'
+        )
+    print(f'{"startup":>10} {"":>8} {results["startup"]:.6f} s')
+    status = 0
+    if results['startup'] > args.startup_budget:
+        print(
+            f'STARTUP OVER BUDGET {results["startup"]:.6f} s, '
+            f'budget {args.startup_budget:.6f} s'
+        )
+        status = 1
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for regression in regressions:
+            print(f'REGRESSION {regression}')
+        if regressions:
+            status = 1
+    return status
+
+
+if __name__ == '__main__':
+    sys.exit(main())
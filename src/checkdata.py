@@ -1,15 +1,29 @@
-import json
+import os
+from array import array
+from collections import namedtuple
 from enum import Enum
+from metrics import metrics
 
 
 class CheckData():
     """
     The class is used to validate input data.
 
+    The validate_* methods do not change the object and return
+    a CheckResult, so one object can be shared between threads and
+    coroutines. The check_* methods are kept for the console viewer:
+    they also store the error in the error attribute.
+
     Attributes
     ----------
     error : ErrorCheckData
         Stores the error type or absence thereof
+    stream : bool
+        If True, JSON question banks are checked incrementally with
+        bounded memory.
+    write_manifest : bool
+        If True, the manifest of a bank that passes the deep check is
+        written next to it.
     """
 
     class ErrorCheckData(Enum):
@@ -59,12 +73,57 @@ class CheckData():
         INVALID_INT_VALUE = 8
         INVALID_FLOAT_VALUE = 9
 
-    def __init__(self) -> None:
+    class CheckResult(namedtuple('CheckResult', ('code', 'value', 'raw'))):
+        """
+        The immutable result of a check.
+
+        Attributes
+        ----------
+        code : ErrorCheckData
+            The error type or absence thereof.
+        value : object
+            The parsed value, or None if the check failed.
+        raw : str
+            The checked value as it was entered.
+        """
+
+        __slots__ = ()
+
+    COLUMN_RULES = (
+        (int, 1, 4, ErrorCheckData.INVALID_INPUT),
+        (float, 0.0, 120.0, ErrorCheckData.INVALID_RESPIRATION),
+        (int, 30, 200, ErrorCheckData.INVALID_HEART_RATE),
+        (int, 0, 5, ErrorCheckData.INVALID_BLUSHING_LEVEL),
+        (int, 1, 15, ErrorCheckData.INVALID_PUPILLARY_DILATION),
+    )
+
+    def __init__(
+        self,
+        stream: bool = False,
+        write_manifest: bool = False
+    ) -> None:
+        """
+        Parameters
+        ----------
+        stream : bool
+            If True, JSON question banks are checked incrementally
+            instead of being parsed whole, as read by Reader in the
+            streaming mode.
+        write_manifest : bool
+            If True, the manifest of a bank that passes the deep check is
+            written next to it, so the next check does not read the
+            bank. By default the checks do not write any files.
+        """
+
         self.error = self.ErrorCheckData.NO_ERROR
+        self.stream = stream
+        self.write_manifest = write_manifest
 
-    def check_file(self, file_name: str) -> None:
+    def check_file(self, file_name: str) -> CheckResult:
         """ Checks whether the file exists, is in the required format
-            and contains the required fields.
+            and contains the required fields. The bank is checked with
+            valid_bank: it is trusted if its manifest is up to date and
+            read through once otherwise.
 
         Parameters
         ----------
@@ -72,21 +131,243 @@ class CheckData():
             The name of the file being checked.
         """
 
-        if file_name == 'exit':
-            self.error = self.ErrorCheckData.EXIT
+        return self._store(self.validate_file(file_name))
+
+    def validate_file(self, file_name: str) -> CheckResult:
+        """Checks the file like check_file without storing the error.
+
+        Parameters
+        ----------
+        file_name : str
+            The name of the file being checked.
+
+        Returns
+        -------
+        CheckResult
+            The error type and the file name as the value.
+        """
+
+        with metrics.phase('file_check'):
+            if file_name == 'exit':
+                code = self.ErrorCheckData.EXIT
+            elif not os.path.isfile(file_name):
+                code = self.ErrorCheckData.FILE_DOES_NOT_EXIST
+            else:
+                try:
+                    if (
+                        self.allowed_file(file_name) and
+                        self.valid_bank(file_name)
+                    ):
+                        code = self.ErrorCheckData.NO_ERROR
+                    else:
+                        code = self.ErrorCheckData.INVALID_FILE
+                except (FileNotFoundError, IsADirectoryError):
+                    code = self.ErrorCheckData.FILE_DOES_NOT_EXIST
+        if metrics.enabled and code not in (
+            self.ErrorCheckData.NO_ERROR,
+            self.ErrorCheckData.EXIT
+        ):
+            metrics.count('validation_failures', code.name)
+        value = file_name if code == self.ErrorCheckData.NO_ERROR else None
+        return self.CheckResult(code, value, file_name)
+
+    def valid_bank(self, file_name: str) -> bool:
+        """Checks whether the question bank can be used for a session. A
+        bank with an up-to-date manifest written by BankManifest is
+        trusted without reading it. Other banks are checked with
+        bank_problems. If write_manifest is set, the manifest of a valid
+        bank is then written next to it, so the next check only compares
+        its size and modification time. A manifest that cannot be written
+        does not make the bank invalid.
+
+        Parameters
+        ----------
+        file_name : str
+            The name of the file being checked.
+
+        Returns
+        -------
+        bool
+            Returns True if the bank is valid. False - otherwise.
+        """
+
+        from bankmanifest import BankManifest
+
+        manifest = BankManifest.load(file_name)
+        if manifest is not None and manifest.matches():
+            if metrics.enabled:
+                metrics.count('manifest_hits')
+            return manifest.questions > 0 and not self._stale(file_name)
+        if not self.write_manifest:
+            return not self.bank_problems(file_name, limit=1)
+        try:
+            manifest = BankManifest.build(file_name, self, limit=1)
+        except ValueError:
+            return False
+        try:
+            manifest.save()
+        except OSError:
+            pass
+        return True
+
+    def bank_problems(
+        self,
+        file_name: str,
+        limit: int = None,
+        answer_counts: list = None
+    ) -> list:
+        """Checks the whole question bank: the questions and the answer
+        lists must line up, every question must be a non-empty string and
+        have from 1 to 4 string answers, as accepted by check_answer.
+
+        Parameters
+        ----------
+        file_name : str
+            The name of the file being checked.
+        limit : int
+            Maximum number of problems reported. By default all problems
+            are reported.
+        answer_counts : list
+            If set, the number of answers of every question is appended
+            to it.
+
+        Returns
+        -------
+        list
+            Descriptions of the problems found, empty for a valid bank.
+        """
+
+        import itertools
+        import json
+        from reader import Reader
+
+        reader = Reader(file_name, self.stream)
+        streamed = self.stream and not reader.paired() and \
+            not reader.compiled()
+        items = reader.items()
+        missing = object()
+        problems = []
+        try:
+            if streamed:
+                items = itertools.zip_longest(
+                    reader.questions(), reader.answers(), fillvalue=missing
+                )
+            elif not reader.paired():
+                bank = reader.bank()
+                if reader.compiled():
+                    if bank.stale():
+                        problems.append('the source file has changed')
+                elif not isinstance(bank.questions, list) or \
+                        not isinstance(bank.answers, list):
+                    return ['the questions or answers are not lists']
+                if len(bank.questions) != len(bank.answers):
+                    problems.append(
+                        f'{len(bank.questions)} questions and '
+                        f'{len(bank.answers)} answer lists'
+                    )
+            count = 0
+            for question, answers in items:
+                if limit is not None and len(problems) >= limit:
+                    return problems
+                if question is missing or answers is missing:
+                    problems.append(
+                        'the numbers of questions and answer lists differ'
+                    )
+                    break
+                count += 1
+                problem = self.item_problem(question, answers)
+                if problem:
+                    problems.append(f'question {count}: {problem}')
+                elif answer_counts is not None:
+                    answer_counts.append(len(answers))
+        except (json.decoder.JSONDecodeError, KeyError, TypeError):
+            problems.append('the file contains an invalid record')
+        except ValueError:
+            problems.append('the file is not a question bank')
         else:
+            if count == 0:
+                problems.append('the bank contains no questions')
+        return problems[:limit]
+
+    def item_problem(self, question, answers) -> str:
+        """Checks one question with its answers.
+
+        Parameters
+        ----------
+        question
+            The question read from the bank.
+        answers
+            The answers read from the bank.
+
+        Returns
+        -------
+        str
+            The description of the problem, or None if the question is
+            valid.
+        """
+
+        _, low, high, _ = self.COLUMN_RULES[0]
+        if not isinstance(question, str) or not question.strip():
+            return 'the question is not a non-empty string'
+        if not isinstance(answers, list):
+            return 'the answers are not a list'
+        if not low <= len(answers) <= high:
+            return f'{len(answers)} answers instead of {low} to {high}'
+        if not all(isinstance(answer, str) for answer in answers):
+            return 'an answer is not a string'
+        return None
+
+    def _stale(self, file_name: str) -> bool:
+        """Checks whether the file is a compiled bank whose source has
+        changed."""
+
+        from compiledbank import CompiledBank
+        from reader import Reader
+
+        if not Reader(file_name).compiled():
+            return False
+        try:
+            return CompiledBank.load(file_name).stale()
+        except ValueError:
+            return True
+
+    def empty_bank(self, file_name: str) -> bool:
+        """Checks whether the question bank contains the required fields.
+        Files in the paired-record layout, and JSON files in the
+        streaming mode, are checked by their first record only. Compiled
+        banks are also invalid if their source file has changed since
+        compilation.
+
+        Parameters
+        ----------
+        file_name : str
+            The name of the file being checked.
+
+        Returns
+        -------
+        bool
+            Returns True if the bank is empty or does not contain the
+            required fields. False - otherwise.
+        """
+
+        import json
+        from compiledbank import CompiledBank
+        from questionbank import QuestionBank
+        from reader import Reader
+
+        reader = Reader(file_name, self.stream)
+        if reader.compiled():
             try:
-                f = open(file_name, 'r')
-                if (
-                    self.allowed_file(file_name) and
-                    not self.empty_file(f)
-                ):
-                    self.error = self.ErrorCheckData.NO_ERROR
-                else:
-                    self.error = self.ErrorCheckData.INVALID_FILE
-                f.close()
-            except (FileNotFoundError, IsADirectoryError):
-                self.error = self.ErrorCheckData.FILE_DOES_NOT_EXIST
+                bank = CompiledBank.load(file_name)
+            except ValueError:
+                return True
+            return bank.stale() or bank.empty()
+        if not reader.paired() and not self.stream:
+            return QuestionBank.load(file_name).empty()
+        try:
+            return next(reader.items(), None) is None
+        except (json.decoder.JSONDecodeError, KeyError, TypeError):
+            return True
 
     def empty_file(self, file) -> bool:
         """Checks whether the file can be processed and whether it
@@ -104,6 +385,8 @@ class CheckData():
             required fields. False - otherwise.
         """
 
+        import json
+
         answer = False
         try:
             tmp: dict = json.load(file)
@@ -116,7 +399,8 @@ class CheckData():
         return answer
 
     def allowed_file(self, file_name: str) -> bool:
-        """Checks that the file is in json format.
+        """Checks that the file is in json, paired-record jsonl or compiled
+        vkqb format.
 
         Parameters
         ----------
@@ -126,14 +410,17 @@ class CheckData():
         Returns
         -------
         bool
-            Returns True if the file is in json format. False - otherwise.
+            Returns True if the file is in json, jsonl or vkqb format.
+            False - otherwise.
         """
 
-        allowed = set(['json'])
+        from compiledbank import CompiledBank
+
+        allowed = set(['json', 'jsonl', CompiledBank.EXTENSION])
         return '.' in file_name and \
             file_name.rsplit('.', 1)[1].lower() in allowed
 
-    def check_answer(self, answer: str) -> None:
+    def check_answer(self, answer: str) -> CheckResult:
         """Checks the response value.
 
         Parameters
@@ -142,11 +429,9 @@ class CheckData():
             Checks that the entered answer is an integer from 1 to 4.
         """
 
-        self.check_int_value(answer, 1, 4)
-        if self.error == self.ErrorCheckData.INVALID_INT_VALUE:
-            self.error = self.ErrorCheckData.INVALID_INPUT
+        return self._store(self.validate_answer(answer))
 
-    def check_respiration(self, respiration: str) -> None:
+    def check_respiration(self, respiration: str) -> CheckResult:
         """Checks the respiration value.
 
         Parameters
@@ -155,11 +440,9 @@ class CheckData():
             Checks that the entered answer is an float from 0.0 to 120.0.
         """
 
-        self.check_float_value(respiration, 0.0, 120.0)
-        if self.error == self.ErrorCheckData.INVALID_FLOAT_VALUE:
-            self.error = self.ErrorCheckData.INVALID_RESPIRATION
+        return self._store(self.validate_respiration(respiration))
 
-    def check_heart_rate(self, heart_rate: str) -> None:
+    def check_heart_rate(self, heart_rate: str) -> CheckResult:
         """Checks the heart rate value.
 
         Parameters
@@ -168,11 +451,9 @@ class CheckData():
             Checks that the entered answer is an integer from 30 to 200.
         """
 
-        self.check_int_value(heart_rate, 30, 200)
-        if self.error == self.ErrorCheckData.INVALID_INT_VALUE:
-            self.error = self.ErrorCheckData.INVALID_HEART_RATE
+        return self._store(self.validate_heart_rate(heart_rate))
 
-    def check_blushing_level(self, blushing_level: str) -> None:
+    def check_blushing_level(self, blushing_level: str) -> CheckResult:
         """Checks the blushing level value.
 
         Parameters
@@ -181,11 +462,12 @@ class CheckData():
             Checks that the entered answer is an integer from 0 to 5.
         """
 
-        self.check_int_value(blushing_level, 0, 5)
-        if self.error == self.ErrorCheckData.INVALID_INT_VALUE:
-            self.error = self.ErrorCheckData.INVALID_BLUSHING_LEVEL
+        return self._store(self.validate_blushing_level(blushing_level))
 
-    def check_pupillary_dilation(self, pupillary_dilation: str) -> None:
+    def check_pupillary_dilation(
+        self,
+        pupillary_dilation: str
+    ) -> CheckResult:
         """Checks the pupillary dilation value.
 
         Parameters
@@ -194,16 +476,16 @@ class CheckData():
             Checks that the entered answer is an integer from 1 to 15.
         """
 
-        self.check_int_value(pupillary_dilation, 1, 15)
-        if self.error == self.ErrorCheckData.INVALID_INT_VALUE:
-            self.error = self.ErrorCheckData.INVALID_PUPILLARY_DILATION
+        return self._store(
+            self.validate_pupillary_dilation(pupillary_dilation)
+        )
 
     def check_int_value(
         self,
         value: str,
         min_value: int,
         max_value: int
-    ) -> None:
+    ) -> CheckResult:
         """Checks that the value is an integer and is in the range from
         min_value to max_value.
 
@@ -217,23 +499,14 @@ class CheckData():
             Maximum allowed value.
         """
 
-        if value == 'exit':
-            self.error = self.ErrorCheckData.EXIT
-        else:
-            try:
-                if int(value) < min_value or int(value) > max_value:
-                    self.error = self.ErrorCheckData.INVALID_INT_VALUE
-                else:
-                    self.error = self.ErrorCheckData.NO_ERROR
-            except ValueError:
-                self.error = self.ErrorCheckData.INVALID_INT_VALUE
+        return self._store(self.validate_int(value, min_value, max_value))
 
     def check_float_value(
         self,
         value: str,
         min_value: float,
         max_value: float
-    ) -> None:
+    ) -> CheckResult:
         """Checks that the value is an floating point and is in the range from
         min_value to max_value.
 
@@ -247,13 +520,272 @@ class CheckData():
             Maximum allowed value.
         """
 
+        return self._store(self.validate_float(value, min_value, max_value))
+
+    def validate_answer(self, answer: str) -> CheckResult:
+        """Checks that the answer is an integer from 1 to 4.
+
+        Parameters
+        ----------
+        answer : str
+            Check value.
+
+        Returns
+        -------
+        CheckResult
+            The error type and the parsed answer number.
+        """
+
+        return self.validate_int(
+            answer, 1, 4, self.ErrorCheckData.INVALID_INPUT
+        )
+
+    def validate_respiration(self, respiration: str) -> CheckResult:
+        """Checks that the respiration is a float from 0.0 to 120.0.
+
+        Parameters
+        ----------
+        respiration : str
+            Check value.
+
+        Returns
+        -------
+        CheckResult
+            The error type and the parsed respiration.
+        """
+
+        return self.validate_float(
+            respiration, 0.0, 120.0, self.ErrorCheckData.INVALID_RESPIRATION
+        )
+
+    def validate_heart_rate(self, heart_rate: str) -> CheckResult:
+        """Checks that the heart rate is an integer from 30 to 200.
+
+        Parameters
+        ----------
+        heart_rate : str
+            Check value.
+
+        Returns
+        -------
+        CheckResult
+            The error type and the parsed heart rate.
+        """
+
+        return self.validate_int(
+            heart_rate, 30, 200, self.ErrorCheckData.INVALID_HEART_RATE
+        )
+
+    def validate_blushing_level(self, blushing_level: str) -> CheckResult:
+        """Checks that the blushing level is an integer from 0 to 5.
+
+        Parameters
+        ----------
+        blushing_level : str
+            Check value.
+
+        Returns
+        -------
+        CheckResult
+            The error type and the parsed blushing level.
+        """
+
+        return self.validate_int(
+            blushing_level, 0, 5, self.ErrorCheckData.INVALID_BLUSHING_LEVEL
+        )
+
+    def validate_pupillary_dilation(
+        self,
+        pupillary_dilation: str
+    ) -> CheckResult:
+        """Checks that the pupillary dilation is an integer from 1 to 15.
+
+        Parameters
+        ----------
+        pupillary_dilation : str
+            Check value.
+
+        Returns
+        -------
+        CheckResult
+            The error type and the parsed pupillary dilation.
+        """
+
+        return self.validate_int(
+            pupillary_dilation,
+            1,
+            15,
+            self.ErrorCheckData.INVALID_PUPILLARY_DILATION
+        )
+
+    def validate_int(
+        self,
+        value: str,
+        min_value: int,
+        max_value: int,
+        error: ErrorCheckData = ErrorCheckData.INVALID_INT_VALUE
+    ) -> CheckResult:
+        """Checks that the value is an integer and is in the range from
+        min_value to max_value.
+
+        Parameters
+        ----------
+        value : str
+            Check value.
+        min_value : int
+            Minimum allowed value.
+        max_value : int
+            Maximum allowed value.
+        error : ErrorCheckData
+            The error returned if the check fails.
+
+        Returns
+        -------
+        CheckResult
+            The error type and the parsed integer.
+        """
+
+        return self._validate_number(int, value, min_value, max_value, error)
+
+    def validate_float(
+        self,
+        value: str,
+        min_value: float,
+        max_value: float,
+        error: ErrorCheckData = ErrorCheckData.INVALID_FLOAT_VALUE
+    ) -> CheckResult:
+        """Checks that the value is a floating point number and is in the
+        range from min_value to max_value.
+
+        Parameters
+        ----------
+        value : str
+            Check value.
+        min_value : float
+            Minimum allowed value.
+        max_value : float
+            Maximum allowed value.
+        error : ErrorCheckData
+            The error returned if the check fails.
+
+        Returns
+        -------
+        CheckResult
+            The error type and the parsed number.
+        """
+
+        return self._validate_number(
+            float, value, min_value, max_value, error
+        )
+
+    def _validate_number(
+        self,
+        parse,
+        value: str,
+        min_value,
+        max_value,
+        error: ErrorCheckData
+    ) -> CheckResult:
+        """Parses the value once and checks the range."""
+
         if value == 'exit':
-            self.error = self.ErrorCheckData.EXIT
-        else:
-            try:
-                if float(value) < min_value or float(value) > max_value:
-                    self.error = self.ErrorCheckData.INVALID_FLOAT_VALUE
+            return self.CheckResult(self.ErrorCheckData.EXIT, None, value)
+        try:
+            number = parse(value)
+            if number < min_value or number > max_value:
+                number = None
+        except ValueError:
+            number = None
+        if number is None:
+            if metrics.enabled:
+                metrics.count('validation_failures', error.name)
+            return self.CheckResult(error, None, value)
+        return self.CheckResult(self.ErrorCheckData.NO_ERROR, number, value)
+
+    def _store(self, result: CheckResult) -> CheckResult:
+        """Stores the error of the result for the stateful checks."""
+
+        self.error = result.code
+        return result
+
+    def check_columns(
+        self,
+        answers,
+        respiration,
+        heart_rate,
+        blushing_level,
+        pupillary_dilation
+    ) -> tuple:
+        """Checks whole columns of entered values at once. Every value is
+        parsed only once and the error attribute is not changed.
+
+        Parameters
+        ----------
+        answers : sequence
+            Answer numbers as strings.
+        respiration : sequence
+            Respiration values as strings.
+        heart_rate : sequence
+            Heart rate values as strings.
+        blushing_level : sequence
+            Blushing level values as strings.
+        pupillary_dilation : sequence
+            Pupillary dilation values as strings.
+
+        Returns
+        -------
+        tuple
+            The array of ErrorCheckData values with the first error of
+            every row, and the list of five columns with the parsed values
+            (None where the value is invalid or not checked).
+
+        Raises
+        ------
+        ValueError
+            If the columns have different lengths.
+        """
+
+        columns = (
+            answers,
+            respiration,
+            heart_rate,
+            blushing_level,
+            pupillary_dilation
+        )
+        rows = len(answers)
+        if any(len(column) != rows for column in columns):
+            raise ValueError('Columns must have the same length')
+        no_error = self.ErrorCheckData.NO_ERROR.value
+        exit_code = self.ErrorCheckData.EXIT.value
+        errors = array('b', [no_error]) * rows
+        parsed = []
+        for column, (parse, min_value, max_value, error) in zip(
+            columns,
+            self.COLUMN_RULES
+        ):
+            code = error.value
+            values = [None] * rows
+            for i, value in enumerate(column):
+                if errors[i] != no_error:
+                    continue
+                if value == 'exit':
+                    errors[i] = exit_code
+                    continue
+                try:
+                    number = parse(value)
+                except ValueError:
+                    errors[i] = code
+                    continue
+                if number < min_value or number > max_value:
+                    errors[i] = code
                 else:
-                    self.error = self.ErrorCheckData.NO_ERROR
-            except ValueError:
-                self.error = self.ErrorCheckData.INVALID_FLOAT_VALUE
+                    values[i] = number
+            parsed.append(values)
+        if metrics.enabled:
+            for code in errors:
+                if code != no_error and code != exit_code:
+                    metrics.count(
+                        'validation_failures',
+                        self.ErrorCheckData(code).name
+                    )
+        return errors, parsed
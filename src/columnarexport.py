@@ -0,0 +1,423 @@
+import math
+import mmap
+import os
+import struct
+from array import array
+from voightkampfftest import VoightKampffTest
+
+
+class ColumnarWriter():
+    """
+    Appends scored sessions to a chunked columnar binary file.
+
+    The sessions are buffered in typed arrays and written in chunks, so
+    the memory does not depend on the number of exported sessions. A
+    chunk starts with a header holding the numbers of sessions and
+    readings and the size of the identifiers, followed by the columns,
+    each padded to 8 bytes:
+
+    - session offsets of the first reading (uint64, sessions + 1),
+    - identifier offsets (uint64, sessions + 1) and utf-8 identifiers,
+    - coefficients (float64) and verdicts (uint8, 1 for human),
+    - respiration (float64), heart rate, blushing level, pupillary
+      dilation and the normal flags (uint8) of every reading.
+
+    The flags are the ScoringRules bit masks of the rules of the test:
+    bit 0 respiration, bit 1 heart rate, bit 2 blushing level and bit 3
+    pupillary dilation. A session without readings has a NaN coefficient.
+
+    Attributes
+    ----------
+    file_name : str
+        The name of the export file.
+    chunk_sessions : int
+        Number of sessions buffered before a chunk is written.
+    sessions : int
+        Number of exported sessions.
+    """
+
+    MAGIC = b'VKCX'
+    VERSION = 1
+    FILE_HEADER = struct.Struct('<4sH2x')
+    CHUNK_HEADER = struct.Struct('<4sIQQ')
+    CHUNK_MAGIC = b'VKCC'
+
+    def __init__(
+        self,
+        file_name: str,
+        chunk_sessions: int = 4096
+    ) -> None:
+        """
+        Parameters
+        ----------
+        file_name : str
+            The name of the export file. An existing export is continued
+            after its last complete chunk, so a chunk left partial by an
+            interrupted writer is dropped.
+        chunk_sessions : int
+            Number of sessions buffered before a chunk is written.
+
+        Raises
+        ------
+        ValueError
+            If the file is not an export or a chunk is damaged.
+        """
+
+        if chunk_sessions < 1:
+            raise ValueError('chunk_sessions must be positive')
+        self.file_name = file_name
+        self.chunk_sessions = chunk_sessions
+        self.sessions = 0
+        self.file = open(file_name, 'a+b')
+        try:
+            self.file.truncate(self._complete_size())
+        except (OSError, ValueError):
+            self.file.close()
+            raise
+        if self.file.seek(0, os.SEEK_END) == 0:
+            self.file.write(self.FILE_HEADER.pack(self.MAGIC, self.VERSION))
+        self._reset()
+
+    def __enter__(self) -> 'ColumnarWriter':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def _complete_size(self) -> int:
+        """Returns the size of the export up to the end of its last
+        complete chunk."""
+
+        self.file.seek(0)
+        header = self.file.read(self.FILE_HEADER.size)
+        if len(header) < self.FILE_HEADER.size:
+            return 0
+        if self.FILE_HEADER.unpack(header) != (self.MAGIC, self.VERSION):
+            raise ValueError('Not a columnar export')
+        size = self.file.seek(0, os.SEEK_END)
+        position = self.FILE_HEADER.size
+        while position + self.CHUNK_HEADER.size <= size:
+            self.file.seek(position)
+            magic, *counts = self.CHUNK_HEADER.unpack(
+                self.file.read(self.CHUNK_HEADER.size)
+            )
+            if magic != self.CHUNK_MAGIC:
+                raise ValueError('Damaged columnar export')
+            end = position + self.CHUNK_HEADER.size + sum(
+                size + -size % 8
+                for size in ColumnarReader.column_sizes(*counts)
+            )
+            if end > size:
+                break
+            position = end
+        return position
+
+    def _reset(self) -> None:
+        """Empties the buffered chunk."""
+
+        self.offsets = array('Q', [0])
+        self.id_offsets = array('Q', [0])
+        self.ids = bytearray()
+        self.coefficients = array('d')
+        self.verdicts = array('B')
+        self.respiration = array('d')
+        self.heart_rate = array('B')
+        self.blushing_level = array('B')
+        self.pupillary_dilation = array('B')
+        self.flags = array('B')
+
+    def add(self, session_id: str, test: VoightKampffTest) -> None:
+        """Buffers a scored session, writing the chunk when it is full.
+
+        Parameters
+        ----------
+        session_id : str
+            The identifier of the session.
+        test : VoightKampffTest
+            The test with the readings of the session.
+        """
+
+        size = len(test.readings)
+        columns = test.readings.columns()
+        for column, values in zip(
+            (
+                self.respiration,
+                self.heart_rate,
+                self.blushing_level,
+                self.pupillary_dilation
+            ),
+            columns
+        ):
+            column.frombytes(values.cast('B'))
+        self.flags.frombytes(test.rules.mask_columns(*columns))
+        self.offsets.append(self.offsets[-1] + size)
+        self.ids.extend(str(session_id).encode('utf-8'))
+        self.id_offsets.append(len(self.ids))
+        coefficient = test.get_coefficient() if size else math.nan
+        self.coefficients.append(coefficient)
+        self.verdicts.append(test.rules.is_human(coefficient))
+        self.sessions += 1
+        if len(self.verdicts) >= self.chunk_sessions:
+            self.flush()
+
+    def flush(self) -> None:
+        """Writes the buffered sessions as a chunk."""
+
+        count = len(self.verdicts)
+        if not count:
+            return
+        self.file.write(self.CHUNK_HEADER.pack(
+            self.CHUNK_MAGIC, count, self.offsets[-1], len(self.ids)
+        ))
+        for column in (
+            self.offsets,
+            self.id_offsets,
+            self.ids,
+            self.coefficients,
+            self.verdicts,
+            self.respiration,
+            self.heart_rate,
+            self.blushing_level,
+            self.pupillary_dilation,
+            self.flags
+        ):
+            self.file.write(column)
+            self.file.write(bytes(-len(memoryview(column).cast('B')) % 8))
+        self.file.flush()
+        self._reset()
+
+    def close(self) -> None:
+        """Writes the last chunk and closes the file."""
+
+        if not self.file.closed:
+            self.flush()
+            self.file.close()
+
+
+class ColumnarChunk():
+    """
+    Columns of one chunk of an export, viewing the mapped file without
+    copying it.
+
+    Attributes
+    ----------
+    offsets : memoryview
+        Index of the first reading of every session followed by the
+        number of readings.
+    coefficients : memoryview
+        Coefficients of the sessions.
+    verdicts : memoryview
+        1 for a human, 0 for a replicant.
+    respiration, heart_rate, blushing_level, pupillary_dilation : memoryview
+        The readings of all sessions of the chunk.
+    flags : memoryview
+        Bit masks of the normal readings.
+    """
+
+    def __init__(self, columns: dict, ids, id_offsets) -> None:
+        self.__dict__.update(columns)
+        self._ids = ids
+        self._id_offsets = id_offsets
+
+    def __len__(self) -> int:
+        return len(self.verdicts)
+
+    def session_id(self, index: int) -> str:
+        """Returns the identifier of the session."""
+
+        return str(
+            self._ids[self._id_offsets[index]:self._id_offsets[index + 1]],
+            'utf-8'
+        )
+
+
+class ColumnarReader():
+    """
+    Reads an export written by ColumnarWriter through mmap.
+
+    The columns are memory views of the mapped file, so they are not
+    copied and can be passed to numpy.frombuffer. The reader can only be
+    closed after all views have been released.
+
+    Attributes
+    ----------
+    file_name : str
+        The name of the export file.
+    """
+
+    COLUMNS = (
+        ('offsets', 'Q', 'sessions + 1'),
+        ('id_offsets', 'Q', 'sessions + 1'),
+        ('ids', 'B', 'ids'),
+        ('coefficients', 'd', 'sessions'),
+        ('verdicts', 'B', 'sessions'),
+        ('respiration', 'd', 'readings'),
+        ('heart_rate', 'B', 'readings'),
+        ('blushing_level', 'B', 'readings'),
+        ('pupillary_dilation', 'B', 'readings'),
+        ('flags', 'B', 'readings'),
+    )
+
+    def __init__(self, file_name: str) -> None:
+        """
+        Parameters
+        ----------
+        file_name : str
+            The name of the export file.
+
+        Raises
+        ------
+        ValueError
+            If the file is not an export.
+        """
+
+        self.file_name = file_name
+        with open(file_name, 'rb') as f:
+            self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        header = ColumnarWriter.FILE_HEADER
+        if (
+            len(self.data) < header.size or
+            header.unpack_from(self.data) !=
+            (ColumnarWriter.MAGIC, ColumnarWriter.VERSION)
+        ):
+            self.data.close()
+            raise ValueError('Not a columnar export')
+
+    @classmethod
+    def column_sizes(cls, sessions: int, readings: int, ids: int) -> list:
+        """Returns the sizes of the columns of a chunk in bytes without
+        the padding."""
+
+        counts = {
+            'sessions + 1': sessions + 1,
+            'sessions': sessions,
+            'readings': readings,
+            'ids': ids,
+        }
+        return [
+            struct.calcsize(code) * counts[count]
+            for _, code, count in cls.COLUMNS
+        ]
+
+    def __enter__(self) -> 'ColumnarReader':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def chunks(self):
+        """Returns the chunks of the export.
+
+        Yields
+        ------
+        ColumnarChunk
+            The columns of the next chunk.
+
+        Raises
+        ------
+        ValueError
+            If a chunk is damaged or truncated.
+        """
+
+        view = memoryview(self.data)
+        header = ColumnarWriter.CHUNK_HEADER
+        position = ColumnarWriter.FILE_HEADER.size
+        while position < len(view):
+            if position + header.size > len(view):
+                raise ValueError('Truncated columnar export')
+            magic, sessions, readings, ids = header.unpack_from(
+                view, position
+            )
+            if magic != ColumnarWriter.CHUNK_MAGIC:
+                raise ValueError('Damaged columnar export')
+            position += header.size
+            columns = dict()
+            for (name, code, _), size in zip(
+                self.COLUMNS, self.column_sizes(sessions, readings, ids)
+            ):
+                if position + size + -size % 8 > len(view):
+                    raise ValueError('Truncated columnar export')
+                columns[name] = view[position:position + size].cast(code)
+                position += size + -size % 8
+            yield ColumnarChunk(
+                columns, columns.pop('ids'), columns.pop('id_offsets')
+            )
+
+    def sessions(self):
+        """Returns the sessions of the export one by one.
+
+        Yields
+        ------
+        tuple
+            The identifier, the coefficient and the verdict ("human" or
+            "replicant") of the next session.
+        """
+
+        for chunk in self.chunks():
+            for i in range(len(chunk)):
+                yield (
+                    chunk.session_id(i),
+                    chunk.coefficients[i],
+                    'human' if chunk.verdicts[i] else 'replicant'
+                )
+
+    def summary(self) -> dict:
+        """Returns the numbers of sessions, readings and verdicts."""
+
+        summary = dict.fromkeys(
+            ('sessions', 'readings', 'human', 'replicant'), 0
+        )
+        for chunk in self.chunks():
+            humans = bytes(chunk.verdicts).count(1)
+            summary['sessions'] += len(chunk)
+            summary['readings'] += len(chunk.respiration)
+            summary['human'] += humans
+            summary['replicant'] += len(chunk) - humans
+        return summary
+
+    def close(self) -> None:
+        """Unmaps the file."""
+
+        self.data.close()
+
+
+if __name__ == '__main__':
+    import argparse
+    from scoringrules import ScoringRules
+    from sessionscorer import SessionScorer
+
+    parser = argparse.ArgumentParser(
+        description='Exports recorded sessions to a columnar file.'
+    )
+    parser.add_argument('export', help='the export file')
+    parser.add_argument(
+        'paths',
+        nargs='*',
+        help='session files, directories or glob patterns'
+    )
+    parser.add_argument(
+        '-r', '--rules',
+        help='JSON ruleset with the normal ranges and the threshold'
+    )
+    parser.add_argument(
+        '-c', '--chunk-sessions',
+        type=int,
+        default=4096,
+        help='number of sessions written at a time'
+    )
+    args = parser.parse_args()
+    if args.paths:
+        rules = ScoringRules.load(args.rules) if args.rules else None
+        with ColumnarWriter(args.export, args.chunk_sessions) as exporter:
+            scorer = SessionScorer(rules, exporter=exporter)
+            for result in scorer.score_files(
+                SessionScorer.expand(args.paths)
+            ):
+                if result.verdict is None:
+                    print(result.line())
+    with ColumnarReader(args.export) as reader:
+        summary = reader.summary()
+    print(
+        f"{summary['sessions']} sessions, {summary['readings']} readings, "
+        f"{summary['human']} human, {summary['replicant']} replicant"
+    )
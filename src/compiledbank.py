@@ -0,0 +1,286 @@
+import mmap
+import os
+import struct
+from questionbank import QuestionBank
+
+
+class CompiledBank(QuestionBank):
+    """
+    A question bank compiled into a binary file and read through mmap.
+
+    The file starts with a header holding the SHA-256 hash, the size
+    and the modification time of the source JSON file, followed by an
+    index of record offsets and the records themselves. A record is
+    decoded only when its question is requested, so opening a bank does
+    not depend on its size.
+
+    Attributes
+    ----------
+    file_name : str
+        The name of the compiled file.
+    source_name : str
+        The name of the source JSON file.
+    source_hash : bytes
+        SHA-256 hash of the source file at compile time.
+    questions : sequence
+        Lazily decoded questions.
+    answers : sequence
+        Lazily decoded answer lists.
+    """
+
+    MAGIC = b'VKQB'
+    VERSION = 1
+    EXTENSION = 'vkqb'
+    HEADER = struct.Struct('<4sH32sQqIH')
+    OFFSET = struct.Struct('<Q')
+    LENGTH = struct.Struct('<I')
+    COUNT = struct.Struct('<H')
+
+    def __init__(self, file_name: str) -> None:
+        """
+        Parameters
+        ----------
+        file_name : str
+            The name of the compiled file.
+
+        Raises
+        ------
+        ValueError
+            If the file is not a compiled question bank or is truncated.
+        """
+
+        self.file_name = file_name
+        with open(file_name, 'rb') as f:
+            self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self._open()
+        except ValueError:
+            self.data.close()
+            raise
+
+    def _open(self) -> None:
+        """Reads the header and the location of the index."""
+
+        if len(self.data) < self.HEADER.size:
+            raise ValueError('Not a compiled question bank')
+        (
+            magic,
+            version,
+            self.source_hash,
+            self.source_size,
+            self.source_mtime_ns,
+            self.count,
+            name_size
+        ) = self.HEADER.unpack_from(self.data)
+        if magic != self.MAGIC or version != self.VERSION:
+            raise ValueError('Not a compiled question bank')
+        start = self.HEADER.size
+        source_name = self.data[start:start + name_size].decode('utf-8')
+        self.source_name = os.path.join(
+            os.path.dirname(self.file_name), source_name
+        )
+        self.index = start + name_size
+        self.records = self.index + (self.count + 1) * self.OFFSET.size
+        if len(self.data) < self.records:
+            raise ValueError('Truncated compiled question bank')
+        self.questions = _Column(self, 0)
+        self.answers = _Column(self, 1)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __getitem__(self, index: int) -> tuple:
+        """Decodes one question with its answers.
+
+        Parameters
+        ----------
+        index : int
+            The number of the question.
+
+        Returns
+        -------
+        tuple
+            The question and the list of answers.
+
+        Raises
+        ------
+        ValueError
+            If the record is corrupt or lies outside the file.
+        """
+
+        if index < 0:
+            index += self.count
+        if not 0 <= index < self.count:
+            raise IndexError('question index out of range')
+        try:
+            position = self.records + self.OFFSET.unpack_from(
+                self.data, self.index + index * self.OFFSET.size
+            )[0]
+            question, position = self._string(position)
+            count = self.COUNT.unpack_from(self.data, position)[0]
+            position += self.COUNT.size
+            answers = []
+            for _ in range(count):
+                answer, position = self._string(position)
+                answers.append(answer)
+        except (struct.error, IndexError, UnicodeDecodeError):
+            raise ValueError('Corrupt compiled question bank') from None
+        return question, answers
+
+    def pairs(self):
+        """Returns the questions together with their answers, decoding
+        every record once.
+
+        Yields
+        ------
+        tuple
+            The next question and the list of answers to it.
+        """
+
+        for i in range(self.count):
+            yield self[i]
+
+    def stale(self) -> bool:
+        """Checks whether the source file has changed since compilation.
+        The hash is computed only if the size or the modification time of
+        the source differ from the recorded ones.
+
+        Returns
+        -------
+        bool
+            Returns True if the source file has changed. False if it is
+            unchanged or no longer exists: a compiled bank can be shipped
+            without its source.
+        """
+
+        try:
+            stat = os.stat(self.source_name)
+        except OSError:
+            return False
+        if (
+            stat.st_size == self.source_size and
+            stat.st_mtime_ns == self.source_mtime_ns
+        ):
+            return False
+        return file_hash(self.source_name) != self.source_hash
+
+    def _string(self, position: int) -> tuple:
+        """Decodes the string stored at the position."""
+
+        size = self.LENGTH.unpack_from(self.data, position)[0]
+        start = position + self.LENGTH.size
+        if start + size > len(self.data):
+            raise IndexError('string outside the compiled bank')
+        return str(self.data[start:start + size], 'utf-8'), start + size
+
+
+class _Column():
+    """Sequence of the questions or the answers of a compiled bank."""
+
+    __slots__ = ('bank', 'field')
+
+    def __init__(self, bank: CompiledBank, field: int) -> None:
+        self.bank = bank
+        self.field = field
+
+    def __len__(self) -> int:
+        return len(self.bank)
+
+    def __getitem__(self, index: int):
+        return self.bank[index][self.field]
+
+
+def file_hash(file_name: str) -> bytes:
+    """Returns the SHA-256 hash of the file."""
+
+    import hashlib
+
+    digest = hashlib.sha256()
+    with open(file_name, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.digest()
+
+
+def compile_bank(source_name: str, file_name: str = None) -> str:
+    """Compiles a JSON question bank into the binary format.
+
+    Parameters
+    ----------
+    source_name : str
+        The name of the JSON file.
+    file_name : str
+        The name of the compiled file. By default the extension of the
+        source is replaced with ".vkqb".
+
+    Returns
+    -------
+    str
+        The name of the compiled file.
+
+    Raises
+    ------
+    ValueError
+        If the numbers of questions and answer lists differ.
+    """
+
+    if file_name is None:
+        file_name = os.path.splitext(source_name)[0] + '.' +\
+            CompiledBank.EXTENSION
+    stat = os.stat(source_name)
+    digest = file_hash(source_name)
+    bank = QuestionBank(source_name)
+    count = len(bank.questions)
+    if count != len(bank.answers):
+        raise ValueError(
+            f'{source_name}: {count} questions and '
+            f'{len(bank.answers)} answer lists'
+        )
+    name = os.path.relpath(
+        os.path.abspath(source_name),
+        os.path.dirname(os.path.abspath(file_name))
+    ).encode('utf-8')
+    records = []
+    offsets = []
+    position = 0
+    for question, answers in zip(bank.questions, bank.answers):
+        record = [_encode(question), CompiledBank.COUNT.pack(len(answers))]
+        record.extend(_encode(answer) for answer in answers)
+        record = b''.join(record)
+        offsets.append(CompiledBank.OFFSET.pack(position))
+        records.append(record)
+        position += len(record)
+    offsets.append(CompiledBank.OFFSET.pack(position))
+    with open(file_name, 'wb') as f:
+        f.write(CompiledBank.HEADER.pack(
+            CompiledBank.MAGIC,
+            CompiledBank.VERSION,
+            digest,
+            stat.st_size,
+            stat.st_mtime_ns,
+            count,
+            len(name)
+        ))
+        f.write(name)
+        f.writelines(offsets)
+        f.writelines(records)
+    return file_name
+
+
+def _encode(text: str) -> bytes:
+    """Encodes a string with its length."""
+
+    data = str(text).encode('utf-8')
+    return CompiledBank.LENGTH.pack(len(data)) + data
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description='Compiles a JSON question bank into the binary format.'
+    )
+    parser.add_argument('source', help='JSON question bank')
+    parser.add_argument('-o', '--output', help='compiled file')
+    args = parser.parse_args()
+    print(compile_bank(args.source, args.output))
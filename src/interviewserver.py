@@ -0,0 +1,315 @@
+import asyncio
+from checkdata import CheckData
+from reader import Reader
+from readings import Reading
+from viewer import Viewer
+from voightkampfftest import VoightKampffTest
+
+
+class InterviewSession():
+    """
+    One interview held over a line-based connection.
+
+    The session follows the flow of Viewer: the question file is chosen,
+    every question is followed by the answer and the four readings, and
+    the result is sent at the end. Every message is sent as one line and
+    every line received is one entered value. Closing the connection is
+    the same as entering "exit".
+
+    Attributes
+    ----------
+    reader : asyncio.StreamReader
+        Stream of the entered values.
+    writer : asyncio.StreamWriter
+        Stream of the messages.
+    file_name : str
+        File name containing the question/answers.
+    check_data : CheckData
+        An object of the CheckData class that validates user input. It is
+        shared by all sessions of the server.
+    error : CheckData.ErrorCheckData
+        The result of the last check of user input.
+    test : VoightKampffTest
+        An object of the class VoightKampffTest which produces the test result.
+    """
+
+    def __init__(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+        file_name: str = None,
+        check_data: CheckData = None
+    ) -> None:
+        """
+        Parameters
+        ----------
+        reader : asyncio.StreamReader
+            Stream of the entered values.
+        writer : asyncio.StreamWriter
+            Stream of the messages.
+        file_name : str
+            File name containing the question/answers. If not set, the
+            user is asked for it.
+        check_data : CheckData
+            The validator of user input. By default a new one is created.
+        """
+
+        self.reader = reader
+        self.writer = writer
+        self.file_name = file_name
+        self.check_data = check_data if check_data is not None else\
+            CheckData()
+        self.error = CheckData.ErrorCheckData.NO_ERROR
+        self.test = VoightKampffTest()
+
+    async def run(self) -> None:
+        """Holds the interview and closes the connection."""
+
+        try:
+            if self.file_name is None:
+                result = await self.ask(
+                    Viewer.FILE_PROMPT,
+                    self.check_data.validate_file,
+                    blocking=True
+                )
+                if self.error == CheckData.ErrorCheckData.NO_ERROR:
+                    self.file_name = result.value
+            if self.file_name:
+                await self.send(Viewer.BEGIN_BANNER)
+                await self.testing()
+                await self.send(Viewer.END_BANNER)
+                if self.error == CheckData.ErrorCheckData.NO_ERROR:
+                    await self.send(
+                        f"test subject's is {self.test.get_verdict()}".upper()
+                    )
+        except ConnectionError:
+            pass
+        finally:
+            self.writer.close()
+
+    async def testing(self) -> None:
+        """Sends the questions and receives the answers and readings. The
+        questions are read in a thread, so loading a bank that is not
+        cached does not hold up the other sessions."""
+
+        checks = (
+            (Viewer.ANSWER_PROMPT, self.check_data.validate_answer),
+            (Viewer.RESPIRATION_PROMPT, self.check_data.validate_respiration),
+            (Viewer.HEART_RATE_PROMPT, self.check_data.validate_heart_rate),
+            (
+                Viewer.BLUSHING_LEVEL_PROMPT,
+                self.check_data.validate_blushing_level
+            ),
+            (
+                Viewer.PUPILLARY_DILATION_PROMPT,
+                self.check_data.validate_pupillary_dilation
+            ),
+        )
+        items = Reader(self.file_name).items()
+        try:
+            while True:
+                item = await asyncio.to_thread(next, items, None)
+                if item is None:
+                    return
+                await self.send(Viewer.format_question(*item))
+                values = []
+                for message, check in checks:
+                    values.append((await self.ask(message, check)).value)
+                    if self.error == CheckData.ErrorCheckData.EXIT:
+                        return
+                self.test.add_reading(Reading(*values[1:]))
+        finally:
+            items.close()
+
+    async def ask(
+        self,
+        message: str,
+        check,
+        blocking: bool = False
+    ) -> CheckData.CheckResult:
+        """Prompts the user for some data until it passes the check or
+        "exit" is entered. Bytes that are not valid UTF-8 make the value
+        invalid. A closed connection or a line longer than the limit of
+        the stream is the same as "exit".
+
+        Parameters
+        ----------
+        message : str
+            Message sent to the user.
+        check
+            Function returning the CheckData.CheckResult of the entered
+            value.
+        blocking : bool
+            If True, the check reads files and is run in a thread, so the
+            other sessions are not held up.
+
+        Returns
+        -------
+        CheckData.CheckResult
+            The result of the check with the parsed value.
+        """
+
+        while True:
+            await self.send(message)
+            try:
+                line = await self.reader.readline()
+            except ValueError:
+                line = b''
+            if line:
+                value = line.decode('utf-8', errors='replace').strip()
+            else:
+                value = 'exit'
+            if blocking:
+                result = await asyncio.to_thread(check, value)
+            else:
+                result = check(value)
+            self.error = result.code
+            if self.error in (
+                CheckData.ErrorCheckData.NO_ERROR,
+                CheckData.ErrorCheckData.EXIT
+            ):
+                return result
+            await self.send(Viewer.error_message(self.error))
+
+    async def send(self, message: str) -> None:
+        """Sends the message as one line."""
+
+        self.writer.write(message.encode('utf-8') + b'\n')
+        await self.writer.drain()
+
+
+class InterviewServer():
+    """
+    Asyncio server holding many interviews in one event loop.
+
+    All sessions share one validator and the question banks parsed
+    through the QuestionBank cache.
+
+    Attributes
+    ----------
+    file_name : str
+        File name containing the question/answers used by all sessions.
+        If not set, every user chooses the file.
+    check_data : CheckData
+        The validator of user input shared by all sessions.
+    server : asyncio.base_events.Server
+        The listening server, or None before it is started.
+    sessions : int
+        Number of sessions in progress.
+    """
+
+    def __init__(self, file_name: str = None) -> None:
+        """
+        Parameters
+        ----------
+        file_name : str
+            File name containing the question/answers used by all
+            sessions. If not set, every user chooses the file. The file
+            is validated once when the server is started.
+        """
+
+        self.file_name = file_name
+        self.check_data = CheckData()
+        self.server = None
+        self.sessions = 0
+
+    async def start(self, host: str = '127.0.0.1', port: int = 0):
+        """Starts listening on a TCP port.
+
+        Parameters
+        ----------
+        host : str
+            The interface to listen on.
+        port : int
+            The port to listen on. With 0 a free port is chosen.
+
+        Returns
+        -------
+        asyncio.base_events.Server
+            The listening server.
+
+        Raises
+        ------
+        ValueError
+            If the question file of all sessions is invalid.
+        """
+
+        await self.check_file()
+        self.server = await asyncio.start_server(self.handle, host, port)
+        return self.server
+
+    async def start_unix(self, path: str):
+        """Starts listening on a Unix socket.
+
+        Parameters
+        ----------
+        path : str
+            The path of the socket.
+
+        Returns
+        -------
+        asyncio.base_events.Server
+            The listening server.
+
+        Raises
+        ------
+        ValueError
+            If the question file of all sessions is invalid.
+        """
+
+        await self.check_file()
+        self.server = await asyncio.start_unix_server(self.handle, path)
+        return self.server
+
+    async def check_file(self) -> None:
+        """Validates the question file of all sessions in a thread.
+
+        Raises
+        ------
+        ValueError
+            If the file is invalid.
+        """
+
+        if self.file_name is None:
+            return
+        result = await asyncio.to_thread(
+            self.check_data.validate_file, self.file_name
+        )
+        if result.code != CheckData.ErrorCheckData.NO_ERROR:
+            raise ValueError(
+                f'{self.file_name}: {Viewer.error_message(result.code)}'
+            )
+
+    async def handle(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter
+    ) -> None:
+        """Holds the interview of a new connection."""
+
+        self.sessions += 1
+        try:
+            await InterviewSession(
+                reader, writer, self.file_name, self.check_data
+            ).run()
+        finally:
+            self.sessions -= 1
+
+    async def close(self) -> None:
+        """Stops listening for new connections."""
+
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+
+
+async def serve(host: str = '127.0.0.1', port: int = 8021) -> None:
+    """Runs the interview server until it is cancelled."""
+
+    server = await InterviewServer().start(host, port)
+    async with server:
+        await server.serve_forever()
+
+
+if __name__ == '__main__':
+    asyncio.run(serve())
@@ -0,0 +1,181 @@
+import json
+import re
+
+
+class JsonStream():
+    """
+    Incremental reader of a JSON document.
+
+    Only the element being decoded and one chunk of the file are kept
+    in memory, so arrays of any size can be walked with bounded memory.
+
+    Attributes
+    ----------
+    file : file object
+        File opened in text mode.
+    chunk_size : int
+        Number of characters read from the file at a time.
+    """
+
+    WHITESPACE = re.compile(r'[ \t\n\r]*')
+    NUMBER_CHARS = set('0123456789.eE+-')
+
+    def __init__(self, file, chunk_size: int = 65536) -> None:
+        """
+        Parameters
+        ----------
+        file : file object
+            File opened in text mode.
+        chunk_size : int
+            Number of characters read from the file at a time.
+        """
+
+        self.file = file
+        self.chunk_size = chunk_size
+        self.buffer = ''
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    def array(self, key: str):
+        """Finds the array stored under the key of the top-level object
+        and returns its elements one by one.
+
+        Parameters
+        ----------
+        key : str
+            The name of the field containing the array.
+
+        Yields
+        ------
+        object
+            The next element of the array.
+
+        Raises
+        ------
+        json.decoder.JSONDecodeError
+            If the document is not valid JSON.
+        """
+
+        self._expect('{')
+        if self._peek() == '}':
+            return
+        while True:
+            name = self.value()
+            self._expect(':')
+            if name == key:
+                if self._peek() == '[':
+                    yield from self.elements()
+                else:
+                    self.skip()
+                return
+            self.skip()
+            if self._expect(',}') == '}':
+                return
+
+    def elements(self):
+        """Returns the elements of the array starting at the current
+        position.
+
+        Yields
+        ------
+        object
+            The next element of the array.
+        """
+
+        self._expect('[')
+        if self._peek() == ']':
+            self.pos += 1
+            return
+        while True:
+            yield self.value()
+            if self._expect(',]') == ']':
+                return
+
+    def value(self):
+        """Decodes the value starting at the current position. A number
+        that ends at the end of the buffer may continue in the next chunk,
+        so it is decoded again after more data is read.
+
+        Returns
+        -------
+        object
+            The decoded value.
+        """
+
+        self._peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+                if self.eof or (
+                    end < len(self.buffer) and
+                    self.buffer[end] not in self.NUMBER_CHARS
+                ):
+                    self.pos = end
+                    return value
+            except json.decoder.JSONDecodeError:
+                if self.eof:
+                    raise
+            self._read()
+
+    def skip(self) -> None:
+        """Skips the value starting at the current position without
+        keeping nested arrays or objects in memory."""
+
+        opening = self._peek()
+        if opening not in '[{':
+            self.value()
+            return
+        closing = ']' if opening == '[' else '}'
+        self.pos += 1
+        if self._peek() == closing:
+            self.pos += 1
+            return
+        while True:
+            if opening == '{':
+                self.value()
+                self._expect(':')
+            self.skip()
+            if self._expect(',' + closing) == closing:
+                return
+
+    def _read(self) -> bool:
+        """Reads the next chunk and drops the already decoded part of
+        the buffer.
+
+        Returns
+        -------
+        bool
+            Returns False if the end of the file has been reached.
+        """
+
+        chunk = '' if self.eof else self.file.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def _peek(self) -> str:
+        """Skips whitespace and returns the next character."""
+
+        while True:
+            self.pos = self.WHITESPACE.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._read():
+                raise json.decoder.JSONDecodeError(
+                    'Unexpected end of data', self.buffer, self.pos
+                )
+
+    def _expect(self, chars: str) -> str:
+        """Consumes the next character if it is one of chars."""
+
+        char = self._peek()
+        if char not in chars:
+            raise json.decoder.JSONDecodeError(
+                f'Expecting one of {chars!r}', self.buffer, self.pos
+            )
+        self.pos += 1
+        return char
@@ -1,15 +1,114 @@
-from viewer import Viewer
+import sys
+from metrics import metrics
 
 
-def main():
-    viewer = Viewer()
-    viewer.ask_file_name()
-    if (viewer.file_name):
-        viewer.test_begin()
-        viewer.testing()
-        viewer.test_end()
-        viewer.print_result_test()
+def main(log_name: str = None):
+    """Runs the interview on the console.
+
+    Parameters
+    ----------
+    log_name : str, optional
+        The session log. An interrupted interview recorded in it is
+        resumed, otherwise a new interview is recorded in it.
+    """
+
+    from viewer import Viewer
+
+    viewer = Viewer(log_name=log_name)
+    viewer.resume()
+    viewer.run()
+    metrics.write()
+
+
+def batch(argv=None):
+    """Scores recorded sessions without user interaction and writes one
+    verdict line per session.
+
+    Parameters
+    ----------
+    argv : list, optional
+        Command line arguments. By default sys.argv is used.
+    """
+
+    import argparse
+    from parallelscorer import ParallelScorer
+    from scoringrules import ScoringRules
+    from sessionscorer import SessionScorer
+
+    parser = argparse.ArgumentParser(
+        description='Scores recorded Voight-Kampff test sessions.'
+    )
+    parser.add_argument(
+        'paths',
+        nargs='+',
+        help='session files, directories or glob patterns'
+    )
+    parser.add_argument(
+        '-o', '--output',
+        help='file for the verdict lines (standard output by default)'
+    )
+    parser.add_argument(
+        '-w', '--workers',
+        type=int,
+        default=0,
+        help='number of worker processes (0 scores in this process)'
+    )
+    parser.add_argument(
+        '-c', '--chunk-size',
+        type=int,
+        default=64,
+        help='number of sessions sent to a worker at a time'
+    )
+    parser.add_argument(
+        '--unordered',
+        action='store_true',
+        help='write the verdicts as soon as they are ready'
+    )
+    parser.add_argument(
+        '-r', '--rules',
+        help='JSON ruleset with the normal ranges and the threshold'
+    )
+    parser.add_argument(
+        '--cache',
+        help='SQLite file caching the verdicts of unchanged sessions'
+    )
+    parser.add_argument(
+        '--cache-size',
+        type=int,
+        default=1000000,
+        help='maximum number of cached verdicts'
+    )
+    parser.add_argument(
+        '--stats',
+        action='store_true',
+        help='print the throughput to standard error'
+    )
+    args = parser.parse_args(argv)
+    rules = ScoringRules.load(args.rules) if args.rules else None
+    scorer = ParallelScorer(
+        args.workers,
+        args.chunk_size,
+        not args.unordered,
+        rules,
+        args.cache,
+        args.cache_size
+    )
+    output = open(args.output, 'w') if args.output else sys.stdout
+    try:
+        for result in scorer.score_files(SessionScorer.expand(args.paths)):
+            output.write(result.line() + '\n')
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    if args.stats:
+        print(scorer.report(), file=sys.stderr)
+    metrics.write()
 
 
 if __name__ == '__main__':
-    main()
+    if len(sys.argv) == 3 and sys.argv[1] == '--resume':
+        main(sys.argv[2])
+    elif len(sys.argv) > 1:
+        batch()
+    else:
+        main()
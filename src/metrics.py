@@ -0,0 +1,196 @@
+import os
+import time
+from contextlib import nullcontext
+
+
+class Metrics():
+    """
+    Opt-in collection of timings and counters.
+
+    When disabled, phase() returns a shared empty context manager and
+    the callers check the enabled attribute before counting, so the
+    instrumentation costs almost nothing.
+
+    Attributes
+    ----------
+    enabled : bool
+        If False, nothing is recorded.
+    file_name : str
+        File the snapshot is written to by write(). A name ending with
+        ".json" selects JSON, any other name the Prometheus text format.
+    phases : dict
+        Number of calls and total wall time of every phase.
+    counters : dict
+        Values of the counters by name and label.
+    """
+
+    PREFIX = 'voight_kampff'
+    _DISABLED = nullcontext()
+
+    def __init__(self, file_name: str = None) -> None:
+        """
+        Parameters
+        ----------
+        file_name : str
+            File for the snapshot. If set, the metrics are enabled.
+        """
+
+        self.file_name = file_name
+        self.enabled = bool(file_name)
+        self.phases = dict()
+        self.counters = dict()
+
+    def enable(self) -> None:
+        """Starts recording."""
+
+        self.enabled = True
+
+    def disable(self) -> None:
+        """Stops recording."""
+
+        self.enabled = False
+
+    def reset(self) -> None:
+        """Forgets everything recorded."""
+
+        self.phases.clear()
+        self.counters.clear()
+
+    def phase(self, name: str):
+        """Returns a context manager measuring the wall time of a phase.
+
+        Parameters
+        ----------
+        name : str
+            The name of the phase.
+        """
+
+        if not self.enabled:
+            return self._DISABLED
+        return _Phase(self, name)
+
+    def add_time(self, name: str, seconds: float) -> None:
+        """Adds a call of the phase lasting the given time."""
+
+        calls, total = self.phases.get(name, (0, 0.0))
+        self.phases[name] = (calls + 1, total + seconds)
+
+    def count(self, name: str, label: str = None, amount: int = 1) -> None:
+        """Increases the counter.
+
+        Parameters
+        ----------
+        name : str
+            The name of the counter.
+        label : str
+            Optional label, for example an error code.
+        amount : int
+            The increase.
+        """
+
+        key = (name, label)
+        self.counters[key] = self.counters.get(key, 0) + amount
+
+    def readings_per_second(self) -> float:
+        """Returns the number of readings taken per second of the
+        interview phase."""
+
+        readings = self.counters.get(('readings', None), 0)
+        seconds = self.phases.get('interview', (0, 0.0))[1]
+        return readings/seconds if seconds else 0.0
+
+    def to_dict(self) -> dict:
+        """Returns the snapshot as a dictionary."""
+
+        counters = dict()
+        for (name, label), value in self._sorted_counters():
+            if label is None:
+                counters[name] = value
+            else:
+                counters.setdefault(name, dict())[label] = value
+        return {
+            'phases': {
+                name: {'calls': calls, 'seconds': seconds}
+                for name, (calls, seconds) in sorted(self.phases.items())
+            },
+            'counters': counters,
+            'readings_per_second': self.readings_per_second(),
+        }
+
+    def to_json(self) -> str:
+        """Returns the snapshot in JSON."""
+
+        import json
+
+        return json.dumps(self.to_dict(), indent=2)
+
+    def to_prometheus(self) -> str:
+        """Returns the snapshot in the Prometheus text format."""
+
+        prefix = self.PREFIX
+        lines = [
+            f'# TYPE {prefix}_phase_calls_total counter',
+            f'# TYPE {prefix}_phase_seconds_total counter',
+        ]
+        for name, (calls, seconds) in sorted(self.phases.items()):
+            labels = f'{{phase="{name}"}}'
+            lines.append(f'{prefix}_phase_calls_total{labels} {calls}')
+            lines.append(f'{prefix}_phase_seconds_total{labels} {seconds!r}')
+        previous = None
+        for (name, label), value in self._sorted_counters():
+            if name != previous:
+                lines.append(f'# TYPE {prefix}_{name}_total counter')
+                previous = name
+            labels = '' if label is None else f'{{code="{label}"}}'
+            lines.append(f'{prefix}_{name}_total{labels} {value}')
+        lines.append(f'# TYPE {prefix}_readings_per_second gauge')
+        lines.append(
+            f'{prefix}_readings_per_second {self.readings_per_second()!r}'
+        )
+        return '\n'.join(lines) + '\n'
+
+    def _sorted_counters(self) -> list:
+        """Returns the counters sorted by name and label."""
+
+        return sorted(
+            self.counters.items(),
+            key=lambda item: (item[0][0], item[0][1] or '')
+        )
+
+    def write(self, file_name: str = None) -> None:
+        """Writes the snapshot if the metrics are enabled.
+
+        Parameters
+        ----------
+        file_name : str
+            The name of the file. By default the file_name attribute.
+        """
+
+        file_name = file_name or self.file_name
+        if not self.enabled or not file_name:
+            return
+        with open(file_name, 'w') as f:
+            if file_name.endswith('.json'):
+                f.write(self.to_json())
+            else:
+                f.write(self.to_prometheus())
+
+
+class _Phase():
+    """Context manager adding its wall time to a phase."""
+
+    __slots__ = ('metrics', 'name', 'start')
+
+    def __init__(self, metrics: Metrics, name: str) -> None:
+        self.metrics = metrics
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.metrics.add_time(self.name, time.perf_counter() - self.start)
+
+
+metrics = Metrics(os.environ.get('VOIGHT_KAMPFF_METRICS'))
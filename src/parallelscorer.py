@@ -0,0 +1,260 @@
+import sqlite3
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from checkdata import CheckData
+from scoringrules import ScoringRules
+from sessionscorer import SessionScorer
+from verdictcache import VerdictCache
+
+
+_scorer = None
+
+
+def start_worker(
+    rules: ScoringRules = None,
+    cache_name: str = None,
+    cache_size: int = 1000000
+) -> None:
+    """Creates the scorer of a worker process. The verdict cache is
+    opened once per worker and kept for all its chunks.
+
+    Parameters
+    ----------
+    rules : ScoringRules
+        The normal ranges and the threshold.
+    cache_name : str
+        The database file of the verdict cache, or None.
+    cache_size : int
+        Maximum number of results kept in the cache.
+    """
+
+    global _scorer
+    cache = None
+    if cache_name is not None:
+        try:
+            cache = VerdictCache(cache_name, cache_size)
+        except sqlite3.OperationalError:
+            cache = None
+    _scorer = SessionScorer(rules, cache)
+
+
+def stop_worker() -> None:
+    """Commits the cache of the worker scorer and closes it."""
+
+    global _scorer
+    if _scorer is not None and _scorer.cache is not None:
+        try:
+            _scorer.cache.close()
+        except sqlite3.OperationalError:
+            pass
+    _scorer = None
+
+
+def score_chunk(file_names: list) -> list:
+    """Scores a chunk of session files with the scorer created by
+    start_worker.
+
+    Parameters
+    ----------
+    file_names : list
+        The names of the session files.
+
+    Returns
+    -------
+    list
+        SessionResult objects in the order of the file names. The new
+        results are written to the cache in one transaction at the end of
+        the chunk. If the cache database stays locked, they are kept for
+        the next chunk.
+    """
+
+    results = [_scorer.score_file(file_name) for file_name in file_names]
+    if _scorer.cache is not None:
+        try:
+            _scorer.cache.commit()
+        except sqlite3.OperationalError:
+            pass
+    return results
+
+
+class ParallelScorer():
+    """
+    Scores recorded sessions in a pool of worker processes.
+
+    Attributes
+    ----------
+    workers : int
+        Number of worker processes. By default the number of processors.
+        With 0 the sessions are scored in the current process.
+    chunk_size : int
+        Number of session files sent to a worker at a time.
+    ordered : bool
+        If True, the results are returned in the order of the files,
+        otherwise as soon as their chunk is scored.
+    sessions : int
+        Number of sessions scored by the last run.
+    errors : int
+        Number of invalid sessions found by the last run.
+    elapsed : float
+        Duration of the last run in seconds.
+    rules : ScoringRules
+        The normal ranges and the threshold applied to the sessions.
+    cache_name : str
+        The database file of the verdict cache shared by the workers, or
+        None.
+    cache_size : int
+        Maximum number of results kept in the cache.
+    cache_hits : int
+        Number of results of the last run taken from the cache.
+    cache_misses : int
+        Number of results of the last run looked up in the cache and not
+        found. Files that could not be read are not looked up.
+    """
+
+    def __init__(
+        self,
+        workers: int = None,
+        chunk_size: int = 64,
+        ordered: bool = True,
+        rules: ScoringRules = None,
+        cache_name: str = None,
+        cache_size: int = 1000000
+    ) -> None:
+        """
+        Parameters
+        ----------
+        workers : int
+            Number of worker processes. By default the number of
+            processors. With 0 the sessions are scored in the current
+            process.
+        chunk_size : int
+            Number of session files sent to a worker at a time.
+        ordered : bool
+            If True, the results are returned in the order of the files.
+        rules : ScoringRules
+            The normal ranges and the threshold. By default the rules of
+            VoightKampffTest.
+        cache_name : str
+            The database file of the verdict cache. By default the
+            results are not cached.
+        cache_size : int
+            Maximum number of results kept in the cache.
+        """
+
+        if chunk_size < 1:
+            raise ValueError('chunk_size must be positive')
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self.ordered = ordered
+        self.rules = rules
+        self.cache_name = cache_name
+        self.cache_size = cache_size
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.sessions = 0
+        self.errors = 0
+        self.elapsed = 0.0
+        self.start = 0.0
+
+    def score_files(self, file_names):
+        """Scores the session files in the worker processes.
+
+        Parameters
+        ----------
+        file_names : iterable
+            The names of the session files.
+
+        Yields
+        ------
+        SessionResult
+            The result of the next session.
+
+        Raises
+        ------
+        BrokenProcessPool
+            If a worker process died, for example killed by a signal or
+            for lack of memory. The message names the first file of the
+            chunk it was scoring. The statistics cover the results
+            returned before.
+        """
+
+        file_names = list(file_names)
+        chunks = [
+            file_names[i:i + self.chunk_size]
+            for i in range(0, len(file_names), self.chunk_size)
+        ]
+        self.sessions = 0
+        self.errors = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.start = time.perf_counter()
+        settings = (self.rules, self.cache_name, self.cache_size)
+        try:
+            if self.workers == 0:
+                start_worker(*settings)
+                try:
+                    for chunk in chunks:
+                        yield from self._count(score_chunk(chunk))
+                finally:
+                    stop_worker()
+            else:
+                yield from self._score_in_pool(chunks, settings)
+        finally:
+            self.elapsed = time.perf_counter() - self.start
+
+    def _score_in_pool(self, chunks: list, settings: tuple):
+        """Scores the chunks in a pool of worker processes."""
+
+        with ProcessPoolExecutor(
+            self.workers, initializer=start_worker, initargs=settings
+        ) as executor:
+            futures = {
+                executor.submit(score_chunk, chunk): chunk
+                for chunk in chunks
+            }
+            for future in futures if self.ordered else as_completed(futures):
+                try:
+                    results = future.result()
+                except BrokenProcessPool as error:
+                    raise BrokenProcessPool(
+                        f'A worker process died while scoring the chunk '
+                        f'starting with {futures[future][0]}'
+                    ) from error
+                yield from self._count(results)
+
+    def _count(self, results: list):
+        """Updates the statistics with the results of a chunk."""
+
+        for result in results:
+            self.sessions += 1
+            if result.error != CheckData.ErrorCheckData.NO_ERROR:
+                self.errors += 1
+            if result.cached:
+                self.cache_hits += 1
+            elif result.cached is not None:
+                self.cache_misses += 1
+            self.elapsed = time.perf_counter() - self.start
+            yield result
+
+    def throughput(self) -> float:
+        """Returns the number of sessions scored per second by the last
+        run."""
+
+        if self.elapsed == 0:
+            return 0.0
+        return self.sessions/self.elapsed
+
+    def report(self) -> str:
+        """Returns a one-line summary of the last run."""
+
+        report = (
+            f'Scored {self.sessions} sessions ({self.errors} invalid) '
+            f'in {self.elapsed:.3f} s, {self.throughput():.1f} sessions/s'
+        )
+        if self.cache_name is not None:
+            report += (
+                f', cache hits {self.cache_hits}, '
+                f'misses {self.cache_misses}'
+            )
+        return report
@@ -0,0 +1,168 @@
+import json
+import os
+import threading
+from collections import OrderedDict
+from metrics import metrics
+
+
+class QuestionBank():
+    """
+    A parsed question and answer file shared between the readers.
+
+    The file is parsed only once per process. Parsed banks are kept in
+    a cache keyed by the path, the modification time and the size of
+    the file, so a changed file is parsed again. The least recently
+    used banks are evicted when the cache is full. The cache is guarded
+    by a lock, so banks can be loaded from several threads. The questions
+    can be accessed by their number and sampled without walking the
+    bank.
+
+    Attributes
+    ----------
+    file_name : str
+        The name of the file containing the questions and answers.
+    questions : list
+        List of questions contained in the file.
+    answers : list
+        List of answer lists contained in the file.
+    cache_size : int
+        Maximum number of parsed files kept in the cache.
+    """
+
+    cache_size = 8
+    _cache = OrderedDict()
+    _lock = threading.Lock()
+
+    def __init__(self, file_name: str) -> None:
+        """
+        Parameters
+        ----------
+        file_name : str
+            The name of the file containing the questions and answers.
+        """
+
+        self.file_name = file_name
+        self.questions = list()
+        self.answers = list()
+        with metrics.phase('parse'):
+            with open(file_name, 'r', encoding='utf-8') as f:
+                try:
+                    tmp = json.load(f)
+                except (json.decoder.JSONDecodeError, UnicodeDecodeError):
+                    tmp = None
+        if metrics.enabled:
+            metrics.count('question_bank_parses')
+        if isinstance(tmp, dict):
+            self.questions = tmp.get('questions', None) or list()
+            self.answers = tmp.get('answers', None) or list()
+
+    def __len__(self) -> int:
+        return min(len(self.questions), len(self.answers))
+
+    def __getitem__(self, index: int) -> tuple:
+        """Returns one question with its answers.
+
+        Parameters
+        ----------
+        index : int
+            The number of the question.
+
+        Returns
+        -------
+        tuple
+            The question and the list of answers.
+        """
+
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('question index out of range')
+        return self.questions[index], self.answers[index]
+
+    @classmethod
+    def load(cls, file_name: str) -> 'QuestionBank':
+        """Returns the parsed bank for the file, parsing it only if it is
+        not in the cache or has changed since it was parsed. The file is
+        parsed outside the lock, so a large bank does not hold up the
+        threads loading other banks.
+
+        Parameters
+        ----------
+        file_name : str
+            The name of the file containing the questions and answers.
+
+        Returns
+        -------
+        QuestionBank
+            The parsed question bank.
+        """
+
+        stat = os.stat(file_name)
+        key = (os.path.abspath(file_name), stat.st_mtime_ns, stat.st_size)
+        with cls._lock:
+            bank = cls._cache.get(key, None)
+            if bank is not None:
+                cls._cache.move_to_end(key)
+                return bank
+        parsed = cls(file_name)
+        with cls._lock:
+            bank = cls._cache.setdefault(key, parsed)
+            cls._cache.move_to_end(key)
+            while len(cls._cache) > cls.cache_size:
+                cls._cache.popitem(last=False)
+        return bank
+
+    @classmethod
+    def clear_cache(cls) -> None:
+        """Removes all parsed banks from the cache."""
+
+        with cls._lock:
+            cls._cache.clear()
+
+    def pairs(self):
+        """Returns the questions together with their answers.
+
+        Returns
+        -------
+        iterator
+            Tuples of a question and the list of answers to it.
+        """
+
+        return zip(self.questions, self.answers)
+
+    def sample(self, k: int, seed=None) -> list:
+        """Returns randomly chosen questions. Only the chosen questions
+        are accessed, and the same seed gives the same questions.
+
+        Parameters
+        ----------
+        k : int
+            Number of questions. The whole bank is shuffled if it
+            contains fewer questions.
+        seed
+            Seed of the random choice. If None, the choice is not
+            reproducible.
+
+        Returns
+        -------
+        list
+            Tuples of a question and the list of answers to it.
+        """
+
+        import random
+
+        count = len(self)
+        indices = random.Random(seed).sample(range(count), min(k, count))
+        return [self[i] for i in indices]
+
+    def empty(self) -> bool:
+        """Checks whether the bank contains the required fields.
+
+        Returns
+        -------
+        bool
+            Returns True if the file does not contain any questions or
+            answers. False - otherwise.
+        """
+
+        return not self.questions and not self.answers
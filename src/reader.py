@@ -1,4 +1,9 @@
 import json
+import os
+from compiledbank import CompiledBank
+from jsonstream import JsonStream
+from metrics import metrics
+from questionbank import QuestionBank
 
 
 class Reader():
@@ -9,17 +14,113 @@ class Reader():
     ----------
     file_name : str
         The name of the file containing the questions and answers.
+    stream : bool
+        If True, the questions and answers are parsed incrementally
+        instead of loading the whole file. The memory is bounded, but in
+        a JSON file the answers are read by a second pass that first
+        skips the array stored before them, so the first question with
+        its answers takes time proportional to the size of the file. The
+        paired-record layout gives the first question in constant time.
+    chunk_size : int
+        Number of characters read at a time in the streaming mode.
     """
 
-    def __init__(self, file_name: str) -> None:
+    PAIRED_EXTENSIONS = set(['jsonl'])
+    _offsets = dict()
+
+    def __init__(
+        self,
+        file_name: str,
+        stream: bool = False,
+        chunk_size: int = 65536
+    ) -> None:
         """
         Parameters
         ----------
         file_name : str
             The name of the file containing the questions and answers.
+        stream : bool
+            If True, the questions and answers are parsed incrementally
+            instead of loading the whole file.
+        chunk_size : int
+            Number of characters read at a time in the streaming mode.
         """
 
         self.file_name = file_name
+        self.stream = stream
+        self.chunk_size = chunk_size
+
+    def paired(self) -> bool:
+        """ Checks whether the file uses the paired-record layout, with
+        one object containing a question and its answers per line.
+
+        Returns
+        -------
+        bool
+            Returns True for the newline-delimited layout. False - otherwise.
+        """
+
+        return '.' in self.file_name and \
+            self.file_name.rsplit('.', 1)[1].lower() in self.PAIRED_EXTENSIONS
+
+    def compiled(self) -> bool:
+        """ Checks whether the file is a compiled binary question bank.
+
+        Returns
+        -------
+        bool
+            Returns True for the compiled format. False - otherwise.
+        """
+
+        return '.' in self.file_name and \
+            self.file_name.rsplit('.', 1)[1].lower() ==\
+            CompiledBank.EXTENSION
+
+    def bank(self) -> QuestionBank:
+        """ Returns the parsed question bank.
+
+        Returns
+        -------
+        QuestionBank
+            The bank shared through the QuestionBank cache. Compiled
+            files are returned as a memory-mapped CompiledBank.
+        """
+
+        if self.compiled():
+            return CompiledBank.load(self.file_name)
+        return QuestionBank.load(self.file_name)
+
+    def count(self):
+        """ Returns the number of questions that have answers.
+
+        Returns
+        -------
+        int or None
+            The number of question/answer pairs, or None if the file is
+            read incrementally and the number is not known in advance.
+        """
+
+        if self.paired() or (self.stream and not self.compiled()):
+            return None
+        return len(self.bank())
+
+    def items(self):
+        """ Returns the questions together with their answers. A JSON
+        file in the streaming mode is read by two passes, one per array,
+        see the stream attribute.
+
+        Yields
+        ------
+        tuple
+            The next question and the list of answers to it.
+        """
+
+        if self.paired():
+            yield from self._paired_items()
+        elif self.stream and not self.compiled():
+            yield from zip(self.questions(), self.answers())
+        else:
+            yield from self.bank().pairs()
 
     def questions(self):
         """ Returns the question.
@@ -30,12 +131,15 @@ class Reader():
             The next line with a question that was contained in the file.
         """
 
-        with open(self.file_name, 'r') as f:
-            tmp: dict = json.load(f)
-            questions = tmp.get('questions', None)
-            if questions:
-                for i in range(len(questions)):
-                    yield questions[i]
+        if self.paired():
+            for question, _ in self._paired_items():
+                yield question
+        elif self.stream and not self.compiled():
+            yield from self._stream_array('questions')
+        else:
+            questions = self.bank().questions
+            for i in range(len(questions)):
+                yield questions[i]
 
     def answers(self):
         """ Returns the answers.
@@ -46,9 +150,85 @@ class Reader():
             Another list with the answers contained in the file.
         """
 
-        with open(self.file_name, 'r') as f:
-            tmp: dict = json.load(f)
-            answers = tmp.get('answers', None)
-            if answers:
-                for i in range(len(answers)):
-                    yield answers[i]
+        if self.paired():
+            for _, answers in self._paired_items():
+                yield answers
+        elif self.stream and not self.compiled():
+            yield from self._stream_array('answers')
+        else:
+            answers = self.bank().answers
+            for i in range(len(answers)):
+                yield answers[i]
+
+    def sample(self, k: int, seed=None) -> list:
+        """ Returns randomly chosen questions together with their answers.
+        Only the chosen questions are decoded; a file in the paired-record
+        layout is indexed by the offsets of its lines first.
+
+        Parameters
+        ----------
+        k : int
+            Number of questions.
+        seed
+            Seed of the random choice. The same seed gives the same
+            questions.
+
+        Returns
+        -------
+        list
+            Tuples of a question and the list of answers to it.
+        """
+
+        import random
+
+        if not self.paired():
+            return self.bank().sample(k, seed)
+        offsets = self._paired_offsets()
+        indices = random.Random(seed).sample(
+            range(len(offsets)), min(k, len(offsets))
+        )
+        items = []
+        with open(self.file_name, 'rb') as f:
+            for i in indices:
+                f.seek(offsets[i])
+                record: dict = json.loads(f.readline())
+                items.append((record['question'], record['answers']))
+        return items
+
+    def _paired_offsets(self) -> list:
+        """Returns the offsets of the non-empty lines of the paired-record
+        file. The index is kept until the file changes."""
+
+        stat = os.stat(self.file_name)
+        key = (os.path.abspath(self.file_name), stat.st_mtime_ns, stat.st_size)
+        offsets = self._offsets.get(key, None)
+        if offsets is None:
+            offsets = []
+            position = 0
+            with open(self.file_name, 'rb') as f:
+                for line in f:
+                    if line.strip():
+                        offsets.append(position)
+                    position += len(line)
+            self._offsets.clear()
+            self._offsets[key] = offsets
+        return offsets
+
+    def _stream_array(self, key: str):
+        """Parses the array stored under the key incrementally."""
+
+        if metrics.enabled:
+            metrics.count('stream_parses')
+        with open(self.file_name, 'r', encoding='utf-8') as f:
+            yield from JsonStream(f, self.chunk_size).array(key)
+
+    def _paired_items(self):
+        """Reads the newline-delimited question records."""
+
+        if metrics.enabled:
+            metrics.count('stream_parses')
+        with open(self.file_name, 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    record: dict = json.loads(line)
+                    yield record['question'], record['answers']
@@ -0,0 +1,180 @@
+from array import array
+
+
+class Reading():
+    """
+    Readings of the subject taken for one question.
+
+    Attributes
+    ----------
+    respiration : float
+        The value of respiration.
+    heart_rate : int
+        The value of heart rate.
+    blushing_level : int
+        The value of blushing level.
+    pupillary_dilation : int
+        The value of pupillary dilation.
+    """
+
+    __slots__ = (
+        'respiration',
+        'heart_rate',
+        'blushing_level',
+        'pupillary_dilation'
+    )
+
+    def __init__(
+        self,
+        respiration: float,
+        heart_rate: int,
+        blushing_level: int,
+        pupillary_dilation: int
+    ) -> None:
+        self.respiration = respiration
+        self.heart_rate = heart_rate
+        self.blushing_level = blushing_level
+        self.pupillary_dilation = pupillary_dilation
+
+    def __iter__(self):
+        yield self.respiration
+        yield self.heart_rate
+        yield self.blushing_level
+        yield self.pupillary_dilation
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Reading):
+            return NotImplemented
+        return tuple(self) == tuple(other)
+
+    def __repr__(self) -> str:
+        return f'Reading{tuple(self)}'
+
+
+class ReadingBuffer():
+    """
+    Columnar storage of readings backed by typed arrays.
+
+    Respiration is stored as double precision floats so that the values
+    and therefore the verdicts are exactly the same as for Python floats.
+    The other readings are small integers and take one byte each.
+
+    Attributes
+    ----------
+    respiration : array
+        Column of respiration values.
+    heart_rate : array
+        Column of heart rate values from 0 to 255.
+    blushing_level : array
+        Column of blushing level values from 0 to 255.
+    pupillary_dilation : array
+        Column of pupillary dilation values from 0 to 255.
+    """
+
+    __slots__ = (
+        'respiration',
+        'heart_rate',
+        'blushing_level',
+        'pupillary_dilation'
+    )
+
+    def __init__(self) -> None:
+        self.respiration = array('d')
+        self.heart_rate = array('B')
+        self.blushing_level = array('B')
+        self.pupillary_dilation = array('B')
+
+    def append(self, reading: Reading) -> None:
+        """Adds a reading to the end of every column.
+
+        Parameters
+        ----------
+        reading : Reading
+            Readings taken for one question.
+
+        Raises
+        ------
+        OverflowError
+            If an integer reading does not fit into one byte.
+        TypeError
+            If a reading is not a number or an integer reading is a
+            float.
+
+        The columns are left unchanged if a value is rejected.
+        """
+
+        appended = 0
+        try:
+            self.respiration.append(reading.respiration)
+            appended = 1
+            self.heart_rate.append(reading.heart_rate)
+            appended = 2
+            self.blushing_level.append(reading.blushing_level)
+            appended = 3
+            self.pupillary_dilation.append(reading.pupillary_dilation)
+        except (OverflowError, TypeError):
+            for column in (
+                self.respiration,
+                self.heart_rate,
+                self.blushing_level
+            )[:appended]:
+                column.pop()
+            raise
+
+    def __len__(self) -> int:
+        """Returns the number of complete readings."""
+
+        return min(
+            len(self.respiration),
+            len(self.heart_rate),
+            len(self.blushing_level),
+            len(self.pupillary_dilation)
+        )
+
+    def __getitem__(self, index: int) -> Reading:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('reading index out of range')
+        return Reading(
+            self.respiration[index],
+            self.heart_rate[index],
+            self.blushing_level[index],
+            self.pupillary_dilation[index]
+        )
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def columns(self) -> tuple:
+        """Returns the complete readings without copying them. The
+        columns cannot grow while the returned views are alive.
+
+        Returns
+        -------
+        tuple
+            Memory views of the respiration, heart rate, blushing level
+            and pupillary dilation columns.
+        """
+
+        size = len(self)
+        return (
+            memoryview(self.respiration)[:size],
+            memoryview(self.heart_rate)[:size],
+            memoryview(self.blushing_level)[:size],
+            memoryview(self.pupillary_dilation)[:size]
+        )
+
+    def nbytes(self) -> int:
+        """Returns the number of bytes taken by the stored values."""
+
+        return sum(
+            column.itemsize * len(column)
+            for column in (
+                self.respiration,
+                self.heart_rate,
+                self.blushing_level,
+                self.pupillary_dilation
+            )
+        )
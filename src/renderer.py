@@ -0,0 +1,125 @@
+import sys
+from collections import OrderedDict
+
+
+class Renderer():
+    """
+    Console output of the interview.
+
+    Every screen is composed into one string and written with a single
+    write and flush. Question screens are rendered once and kept in a
+    cache shared by all renderers, so repeated interviews reuse them.
+
+    Attributes
+    ----------
+    output : file object
+        Stream the screens are written to. If None, the current
+        sys.stdout is used.
+    compact : bool
+        If True, the questions are written without labels and
+        indentation.
+    cache_size : int
+        Maximum number of question screens kept in the cache.
+    """
+
+    cache_size = 1024
+    _cache = OrderedDict()
+
+    def __init__(self, output=None, compact: bool = False) -> None:
+        """
+        Parameters
+        ----------
+        output : file object
+            Stream the screens are written to. By default sys.stdout.
+        compact : bool
+            If True, the questions are written without formatting.
+        """
+
+        self.output = output
+        self.compact = compact
+
+    @staticmethod
+    def format_question(question: str, answers: list) -> str:
+        """Returns the text of the question with the numbered answers.
+
+        Parameters
+        ----------
+        question : str
+            The question.
+        answers : list
+            The answer options.
+
+        Returns
+        -------
+        str
+            The lines to display, separated by newlines.
+        """
+
+        lines = [f'Question: {question}', '\tAnswers:']
+        for num, answer in enumerate(answers):
+            lines.append(f'\t\t{num+1}. {answer}')
+        return '\n'.join(lines)
+
+    @staticmethod
+    def format_compact(question: str, answers: list) -> str:
+        """Returns the question and the numbered answers without labels
+        and indentation."""
+
+        lines = [str(question)]
+        for num, answer in enumerate(answers):
+            lines.append(f'{num+1}. {answer}')
+        return '\n'.join(lines)
+
+    def question_screen(self, question: str, answers: list) -> str:
+        """Returns the rendered screen of the question, rendering it only
+        if it is not in the cache.
+
+        Parameters
+        ----------
+        question : str
+            The question.
+        answers : list
+            The answer options.
+
+        Returns
+        -------
+        str
+            The screen ending with a newline.
+        """
+
+        key = (self.compact, question, tuple(answers))
+        screen = self._cache.get(key, None)
+        if screen is not None:
+            self._cache.move_to_end(key)
+        else:
+            if self.compact:
+                screen = self.format_compact(question, answers) + '\n'
+            else:
+                screen = self.format_question(question, answers) + '\n'
+            self._cache[key] = screen
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return screen
+
+    @classmethod
+    def clear_cache(cls) -> None:
+        """Removes all rendered screens from the cache."""
+
+        cls._cache.clear()
+
+    def question(self, question: str, answers: list) -> None:
+        """Writes the screen of the question."""
+
+        self.write(self.question_screen(question, answers))
+
+    def line(self, *lines: str) -> None:
+        """Writes the lines as one screen."""
+
+        self.write('\n'.join(lines) + '\n')
+
+    def write(self, screen: str) -> None:
+        """Writes the screen with a single write and flushes the stream."""
+
+        output = self.output if self.output is not None else sys.stdout
+        output.write(screen)
+        output.flush()
@@ -0,0 +1,273 @@
+import contextlib
+import io
+import time
+from typing import NamedTuple
+from checkdata import CheckData
+from viewer import Viewer
+
+
+class ReplayResult(NamedTuple):
+    """
+    The outcome of one replayed interview.
+
+    Attributes
+    ----------
+    script_name : str
+        The name of the keystroke script.
+    verdict : str
+        "human" or "replicant", or None if the interview was not
+        completed.
+    latency : float
+        Duration of the interview in seconds.
+    inputs : int
+        Number of values read from the script.
+    """
+
+    script_name: str
+    verdict: str
+    latency: float
+    inputs: int
+
+
+class _CountingInput(io.StringIO):
+    """In-memory script counting the lines read from it."""
+
+    def __init__(self, text: str) -> None:
+        super().__init__(text)
+        self.lines = 0
+
+    def readline(self, *args) -> str:
+        line = super().readline(*args)
+        self.lines += bool(line)
+        return line
+
+
+def replay_script(script_name: str, script: str) -> ReplayResult:
+    """Runs one interview fed by a keystroke script.
+
+    Parameters
+    ----------
+    script_name : str
+        The name of the script.
+    script : str
+        The entered values, one per line, starting with the name of the
+        question file, as a user would type them.
+
+    Returns
+    -------
+    ReplayResult
+        The verdict and the duration of the interview.
+    """
+
+    output = io.StringIO()
+    keys = _CountingInput(script)
+    viewer = Viewer(input_stream=keys, output=output)
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(output):
+        viewer.run()
+    latency = time.perf_counter() - start
+    verdict = None
+    if (
+        viewer.file_name and
+        viewer.error == CheckData.ErrorCheckData.NO_ERROR and
+        viewer.test.scored_count
+    ):
+        verdict = viewer.test.get_verdict()
+    return ReplayResult(script_name, verdict, latency, keys.lines)
+
+
+def replay_chunk(scripts: list) -> list:
+    """Replays a chunk of scripts in a worker process.
+
+    Parameters
+    ----------
+    scripts : list
+        Tuples of the name and the text of a script.
+
+    Returns
+    -------
+    list
+        ReplayResult objects in the order of the scripts.
+    """
+
+    return [replay_script(name, script) for name, script in scripts]
+
+
+def percentile(values: list, percent: float) -> float:
+    """Returns the nearest-rank percentile of sorted values, or 0.0 for
+    no values."""
+
+    if not values:
+        return 0.0
+    rank = max(1, -(-len(values) * percent // 100))
+    return values[int(rank) - 1]
+
+
+class ReplayDriver():
+    """
+    Load test of the interactive path.
+
+    Recorded keystroke scripts are fed through Viewer, with the same
+    prompts, checks and rendering as a console interview, as fast as
+    possible. The interviews run in a pool of worker processes, and the
+    driver reports the number of sessions per second and the percentiles
+    of the session latency.
+
+    Attributes
+    ----------
+    workers : int
+        Number of worker processes. By default the number of processors.
+        With 0 the interviews run in the current process.
+    chunk_size : int
+        Number of interviews sent to a worker at a time.
+    repeat : int
+        Number of times every script is replayed.
+    sessions : int
+        Number of interviews replayed by the last run.
+    completed : int
+        Number of interviews of the last run that gave a verdict.
+    latencies : list
+        Sorted durations of the interviews of the last run in seconds.
+    elapsed : float
+        Duration of the last run in seconds.
+    """
+
+    PERCENTILES = (50, 90, 99)
+
+    def __init__(
+        self,
+        workers: int = None,
+        chunk_size: int = 16,
+        repeat: int = 1
+    ) -> None:
+        """
+        Parameters
+        ----------
+        workers : int
+            Number of worker processes. By default the number of
+            processors. With 0 the interviews run in the current process.
+        chunk_size : int
+            Number of interviews sent to a worker at a time.
+        repeat : int
+            Number of times every script is replayed.
+        """
+
+        if chunk_size < 1:
+            raise ValueError('chunk_size must be positive')
+        if repeat < 1:
+            raise ValueError('repeat must be positive')
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self.repeat = repeat
+        self.sessions = 0
+        self.completed = 0
+        self.latencies = []
+        self.elapsed = 0.0
+
+    def run(self, script_names) -> list:
+        """Replays the scripts.
+
+        Parameters
+        ----------
+        script_names : iterable
+            The names of the keystroke script files.
+
+        Returns
+        -------
+        list
+            ReplayResult objects in the order of the scripts.
+        """
+
+        scripts = []
+        for script_name in script_names:
+            with open(script_name, 'r', encoding='utf-8') as f:
+                scripts.append((script_name, f.read()))
+        scripts *= self.repeat
+        chunks = [
+            scripts[i:i + self.chunk_size]
+            for i in range(0, len(scripts), self.chunk_size)
+        ]
+        start = time.perf_counter()
+        if self.workers == 0:
+            results = [
+                result for chunk in chunks for result in replay_chunk(chunk)
+            ]
+        else:
+            from concurrent.futures import ProcessPoolExecutor
+
+            with ProcessPoolExecutor(self.workers) as executor:
+                results = [
+                    result
+                    for chunk_results in executor.map(replay_chunk, chunks)
+                    for result in chunk_results
+                ]
+        self.elapsed = time.perf_counter() - start
+        self.sessions = len(results)
+        self.completed = sum(result.verdict is not None for result in results)
+        self.latencies = sorted(result.latency for result in results)
+        return results
+
+    def throughput(self) -> float:
+        """Returns the number of sessions replayed per second by the last
+        run."""
+
+        if self.elapsed == 0:
+            return 0.0
+        return self.sessions/self.elapsed
+
+    def percentiles(self) -> dict:
+        """Returns the latency percentiles of the last run in seconds by
+        their percent."""
+
+        return {
+            percent: percentile(self.latencies, percent)
+            for percent in self.PERCENTILES
+        }
+
+    def report(self) -> str:
+        """Returns a one-line summary of the last run."""
+
+        latency = ', '.join(
+            f'p{percent} {value * 1000:.2f} ms'
+            for percent, value in self.percentiles().items()
+        )
+        return (
+            f'Replayed {self.sessions} sessions ({self.completed} completed) '
+            f'in {self.elapsed:.3f} s, {self.throughput():.1f} sessions/s, '
+            f'latency {latency}'
+        )
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description='Replays keystroke scripts through the interview.'
+    )
+    parser.add_argument(
+        'scripts',
+        nargs='+',
+        help='files with one entered value per line'
+    )
+    parser.add_argument(
+        '-w', '--workers',
+        type=int,
+        default=None,
+        help='number of worker processes (0 replays in this process)'
+    )
+    parser.add_argument(
+        '-c', '--chunk-size',
+        type=int,
+        default=16,
+        help='number of sessions sent to a worker at a time'
+    )
+    parser.add_argument(
+        '-n', '--repeat',
+        type=int,
+        default=1,
+        help='number of times every script is replayed'
+    )
+    args = parser.parse_args()
+    driver = ReplayDriver(args.workers, args.chunk_size, args.repeat)
+    driver.run(args.scripts)
+    print(driver.report())
@@ -0,0 +1,298 @@
+import numbers
+
+
+class ScoringRules():
+    """
+    Normal ranges of the readings and the threshold of the human verdict.
+
+    The rules are compiled once when they are created: the integer
+    readings, which take one byte each, are checked with lookup tables
+    of 256 entries and the respiration with a range check. The flags of
+    one reading are combined into a four-bit mask whose popcount is the
+    number of normal values, and whole columns are counted with
+    bytes.translate.
+
+    A ruleset file is a JSON object such as::
+
+        {
+            "version": "2",
+            "threshold": 0.9,
+            "ranges": {
+                "respiration": [12.0, 16.0],
+                "heart_rate": [60, 100],
+                "blushing_level": [2, 4],
+                "pupillary_dilation": [2, 8]
+            }
+        }
+
+    Ranges missing from the file keep their default values.
+
+    Attributes
+    ----------
+    version : str
+        The version of the ruleset.
+    threshold : float
+        The smallest share of normal values giving the human verdict.
+    respiration : tuple
+        The normal range of respiration.
+    heart_rate : tuple
+        The normal range of heart rate.
+    blushing_level : tuple
+        The normal range of blushing level.
+    pupillary_dilation : tuple
+        The normal range of pupillary dilation.
+    tables : tuple
+        Lookup tables of the heart rate, blushing level and pupillary
+        dilation holding 1 for every normal value from 0 to 255.
+    masks : tuple
+        The same lookup tables holding the bit of the reading in the mask
+        for every normal value.
+    """
+
+    FIELDS = (
+        'respiration',
+        'heart_rate',
+        'blushing_level',
+        'pupillary_dilation'
+    )
+    RESPIRATION_BIT = 1
+    HEART_RATE_BIT = 2
+    BLUSHING_LEVEL_BIT = 4
+    PUPILLARY_DILATION_BIT = 8
+    POPCOUNT = bytes(bin(mask).count('1') for mask in range(16))
+
+    def __init__(
+        self,
+        version: str = '1',
+        threshold: float = 0.9,
+        respiration: tuple = (12.0, 16.0),
+        heart_rate: tuple = (60, 100),
+        blushing_level: tuple = (2, 4),
+        pupillary_dilation: tuple = (2, 8)
+    ) -> None:
+        """
+        Parameters
+        ----------
+        version : str
+            The version of the ruleset.
+        threshold : float
+            The smallest share of normal values from 0 to 1 giving the
+            human verdict.
+        respiration, heart_rate, blushing_level, pupillary_dilation : tuple
+            The lower and upper bounds of the normal values, inclusive.
+
+        Raises
+        ------
+        ValueError
+            If the threshold or a range is invalid.
+        """
+
+        self.version = str(version)
+        if (
+            not isinstance(threshold, numbers.Real) or
+            isinstance(threshold, bool) or
+            not 0 <= threshold <= 1
+        ):
+            raise ValueError('The threshold must be a number from 0 to 1')
+        self.threshold = threshold
+        self.respiration = self._range(respiration)
+        self.heart_rate = self._range(heart_rate)
+        self.blushing_level = self._range(blushing_level)
+        self.pupillary_dilation = self._range(pupillary_dilation)
+        self.tables = tuple(
+            bytes(low <= value <= high for value in range(256))
+            for low, high in (
+                self.heart_rate,
+                self.blushing_level,
+                self.pupillary_dilation
+            )
+        )
+        self.masks = tuple(
+            bytes(bit * flag for flag in table)
+            for bit, table in zip(
+                (
+                    self.HEART_RATE_BIT,
+                    self.BLUSHING_LEVEL_BIT,
+                    self.PUPILLARY_DILATION_BIT
+                ),
+                self.tables
+            )
+        )
+
+    @classmethod
+    def load(cls, file_name: str) -> 'ScoringRules':
+        """Reads the rules from a ruleset file.
+
+        Parameters
+        ----------
+        file_name : str
+            The name of the JSON ruleset file.
+
+        Returns
+        -------
+        ScoringRules
+            The compiled rules.
+
+        Raises
+        ------
+        ValueError
+            If the file is not a valid ruleset.
+        """
+
+        import json
+
+        with open(file_name, 'r', encoding='utf-8') as f:
+            ruleset = json.load(f)
+        if not isinstance(ruleset, dict):
+            raise ValueError('A ruleset must be a JSON object')
+        ranges = ruleset.get('ranges', dict())
+        if not isinstance(ranges, dict) or set(ranges) - set(cls.FIELDS):
+            raise ValueError('Unknown ranges in the ruleset')
+        return cls(
+            ruleset.get('version', '1'),
+            ruleset.get('threshold', 0.9),
+            **ranges
+        )
+
+    def is_normal(
+        self,
+        respiration: float,
+        heart_rate: int,
+        blushing_level: int,
+        pupillary_dilation: int
+    ) -> tuple:
+        """Checks every reading against its normal range.
+
+        Returns
+        -------
+        tuple
+            Four booleans, True for a normal value.
+        """
+
+        return (
+            self.respiration[0] <= respiration <= self.respiration[1],
+            self.heart_rate[0] <= heart_rate <= self.heart_rate[1],
+            self.blushing_level[0] <= blushing_level <=
+            self.blushing_level[1],
+            self.pupillary_dilation[0] <= pupillary_dilation <=
+            self.pupillary_dilation[1]
+        )
+
+    def mask(
+        self,
+        respiration: float,
+        heart_rate: int,
+        blushing_level: int,
+        pupillary_dilation: int
+    ) -> int:
+        """Returns the bits of the normal values of one reading. The
+        integer readings must be from 0 to 255.
+        """
+
+        heart_mask, blushing_mask, pupillary_mask = self.masks
+        return (
+            (self.respiration[0] <= respiration <= self.respiration[1]) |
+            heart_mask[heart_rate] |
+            blushing_mask[blushing_level] |
+            pupillary_mask[pupillary_dilation]
+        )
+
+    def count(
+        self,
+        respiration: float,
+        heart_rate: int,
+        blushing_level: int,
+        pupillary_dilation: int
+    ) -> int:
+        """Returns the number of normal values of one reading. The integer
+        readings must be from 0 to 255.
+        """
+
+        return self.POPCOUNT[self.mask(
+            respiration, heart_rate, blushing_level, pupillary_dilation
+        )]
+
+    def count_columns(
+        self,
+        respiration,
+        heart_rate,
+        blushing_level,
+        pupillary_dilation
+    ) -> int:
+        """Returns the number of normal values in whole columns of
+        readings. The integer readings must be from 0 to 255; byte
+        columns such as array('B') are translated without a Python loop.
+        """
+
+        low, high = self.respiration
+        return sum(low <= value <= high for value in respiration) + sum(
+            bytes(column).translate(table).count(1)
+            for column, table in zip(
+                (heart_rate, blushing_level, pupillary_dilation),
+                self.tables
+            )
+        )
+
+    def mask_columns(
+        self,
+        respiration,
+        heart_rate,
+        blushing_level,
+        pupillary_dilation
+    ) -> bytes:
+        """Returns the bits of the normal values of every reading in whole
+        columns. The byte columns are translated and combined as big
+        integers without a Python loop.
+        """
+
+        low, high = self.respiration
+        size = len(respiration)
+        bits = int.from_bytes(bytes(
+            low <= value <= high for value in respiration
+        ))
+        for column, table in zip(
+            (heart_rate, blushing_level, pupillary_dilation),
+            self.masks
+        ):
+            bits |= int.from_bytes(bytes(column).translate(table))
+        return bits.to_bytes(size)
+
+    def is_human(self, coefficient: float) -> bool:
+        """Checks whether the share of normal values gives the human
+        verdict."""
+
+        return coefficient >= self.threshold
+
+    def to_dict(self) -> dict:
+        """Returns the rules in the ruleset file format."""
+
+        return {
+            'version': self.version,
+            'threshold': self.threshold,
+            'ranges': {
+                field: list(getattr(self, field)) for field in self.FIELDS
+            },
+        }
+
+    @staticmethod
+    def _range(bounds) -> tuple:
+        """Checks the bounds of a range."""
+
+        try:
+            bounds = tuple(bounds)
+        except TypeError:
+            raise ValueError(f'Invalid range {bounds!r}') from None
+        if (
+            len(bounds) != 2 or
+            not all(
+                isinstance(bound, numbers.Real) and
+                not isinstance(bound, bool)
+                for bound in bounds
+            ) or
+            bounds[0] > bounds[1]
+        ):
+            raise ValueError(f'Invalid range {bounds!r}')
+        return bounds
+
+
+ScoringRules.DEFAULT = ScoringRules()
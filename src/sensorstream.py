@@ -0,0 +1,284 @@
+import math
+import sys
+from array import array
+from readings import Reading
+from voightkampfftest import VoightKampffTest
+
+
+class RingBuffer():
+    """
+    Fixed-size buffer of the latest timestamped samples of one signal.
+
+    When the buffer is full, every new sample replaces the oldest one, so
+    the memory does not depend on the length of the recording. The
+    samples must arrive in timestamp order, so a window is found by
+    walking back from the newest sample.
+
+    Attributes
+    ----------
+    capacity : int
+        Maximum number of samples kept.
+    times : array
+        Timestamps of the samples in seconds.
+    values : array
+        Values of the samples.
+    size : int
+        Number of samples kept.
+    """
+
+    __slots__ = ('capacity', 'times', 'values', 'size', 'next')
+
+    def __init__(self, capacity: int) -> None:
+        """
+        Parameters
+        ----------
+        capacity : int
+            Maximum number of samples kept.
+        """
+
+        if capacity < 1:
+            raise ValueError('capacity must be positive')
+        self.capacity = capacity
+        self.times = array('d', bytes(8 * capacity))
+        self.values = array('d', bytes(8 * capacity))
+        self.size = 0
+        self.next = 0
+
+    def __len__(self) -> int:
+        return self.size
+
+    def append(self, timestamp: float, value: float) -> None:
+        """Adds a sample, replacing the oldest one if the buffer is full.
+
+        Raises
+        ------
+        ValueError
+            If the sample is older than the newest sample kept.
+        """
+
+        if self.size and timestamp < self.times[self.next - 1]:
+            raise ValueError('samples must arrive in timestamp order')
+        self.times[self.next] = timestamp
+        self.values[self.next] = value
+        self.next = (self.next + 1) % self.capacity
+        if self.size < self.capacity:
+            self.size += 1
+
+    def window(self, start: float, end: float):
+        """Returns the values of the samples taken after start and not
+        later than end, newest first.
+
+        Parameters
+        ----------
+        start : float
+            The beginning of the window, exclusive.
+        end : float
+            The end of the window, inclusive.
+
+        Yields
+        ------
+        float
+            The next value.
+        """
+
+        times = self.times
+        values = self.values
+        index = self.next
+        for _ in range(self.size):
+            index = index - 1 if index else self.capacity - 1
+            timestamp = times[index]
+            if timestamp <= start:
+                break
+            if timestamp <= end:
+                yield values[index]
+
+    def mean(self, start: float, end: float) -> float:
+        """Returns the mean value of the samples in the window, or None if
+        there are none."""
+
+        total = 0.0
+        count = 0
+        for value in self.window(start, end):
+            total += value
+            count += 1
+        return total/count if count else None
+
+
+class SensorStream():
+    """
+    Scoring of continuously sampled readings.
+
+    The input consists of lines "<timestamp> <signal> <value>", where the
+    signal is one of respiration, heart_rate, blushing_level and
+    pupillary_dilation, and lines "<timestamp> mark" closing the window
+    of the current question. At every mark the mean of every signal over
+    the window is added to the test as the reading of the question. The
+    integer readings are rounded. A window in which a signal has no
+    samples gives no reading.
+
+    Attributes
+    ----------
+    test : VoightKampffTest
+        The test fed with the readings of the windows.
+    buffers : dict
+        Ring buffers of the signals by their names.
+    window_start : float
+        The timestamp of the last mark.
+    samples : int
+        Number of samples read.
+    errors : int
+        Number of lines that could not be parsed, and of samples older
+        than the latest sample of their signal, which are dropped.
+    incomplete : int
+        Number of windows without samples of some signal.
+    """
+
+    SIGNALS = (
+        'respiration',
+        'heart_rate',
+        'blushing_level',
+        'pupillary_dilation'
+    )
+    MARK = 'mark'
+
+    def __init__(
+        self,
+        test: VoightKampffTest = None,
+        capacity: int = 65536
+    ) -> None:
+        """
+        Parameters
+        ----------
+        test : VoightKampffTest
+            The test fed with the readings. By default a new one.
+        capacity : int
+            Number of samples kept per signal. Windows longer than the
+            buffer are averaged over the latest samples.
+        """
+
+        self.test = test if test is not None else VoightKampffTest()
+        self.buffers = {
+            signal: RingBuffer(capacity) for signal in self.SIGNALS
+        }
+        self.window_start = -math.inf
+        self.samples = 0
+        self.errors = 0
+        self.incomplete = 0
+
+    def feed(self, lines) -> int:
+        """Reads sample and mark lines.
+
+        Parameters
+        ----------
+        lines : iterable
+            The lines, for example an open file, a pipe or a socket file.
+
+        Returns
+        -------
+        int
+            Number of readings added to the test.
+        """
+
+        buffers = self.buffers
+        added = 0
+        for line in lines:
+            fields = line.split()
+            try:
+                if len(fields) == 3:
+                    timestamp = float(fields[0])
+                    value = float(fields[2])
+                    if not math.isfinite(timestamp + value):
+                        raise ValueError(line)
+                    buffers[fields[1]].append(timestamp, value)
+                    self.samples += 1
+                elif len(fields) == 2 and fields[1] == self.MARK:
+                    added += self.mark(float(fields[0])) is not None
+                elif fields:
+                    raise ValueError(line)
+            except (KeyError, ValueError):
+                self.errors += 1
+        return added
+
+    def mark(self, timestamp: float) -> Reading:
+        """Closes the window of the current question.
+
+        Parameters
+        ----------
+        timestamp : float
+            The end of the window.
+
+        Returns
+        -------
+        Reading
+            The reading added to the test, or None if some signal has no
+            samples in the window.
+        """
+
+        means = [
+            self.buffers[signal].mean(self.window_start, timestamp)
+            for signal in self.SIGNALS
+        ]
+        self.window_start = timestamp
+        if None in means:
+            self.incomplete += 1
+            return None
+        reading = Reading(
+            means[0],
+            *(min(max(round(mean), 0), 255) for mean in means[1:])
+        )
+        self.test.add_reading(reading)
+        return reading
+
+
+def open_source(source: str):
+    """Opens a sample stream.
+
+    Parameters
+    ----------
+    source : str
+        "-" for the standard input, "unix:<path>" for a local socket, or
+        the name of a file or a named pipe.
+
+    Returns
+    -------
+    file object
+        The lines of the stream.
+    """
+
+    if source == '-':
+        return sys.stdin
+    if source.startswith('unix:'):
+        import socket
+
+        connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        connection.connect(source[len('unix:'):])
+        lines = connection.makefile('r', encoding='utf-8')
+        connection.close()
+        return lines
+    return open(source, 'r', encoding='utf-8')
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description='Scores a stream of timestamped sensor samples.'
+    )
+    parser.add_argument(
+        'source',
+        help='file, named pipe, "-" for standard input or unix:<path>'
+    )
+    parser.add_argument(
+        '-c', '--capacity',
+        type=int,
+        default=65536,
+        help='number of samples kept per signal'
+    )
+    args = parser.parse_args()
+    stream = SensorStream(capacity=args.capacity)
+    with open_source(args.source) as lines:
+        stream.feed(lines)
+    if stream.test.scored_count:
+        print(f"test subject's is {stream.test.get_verdict()}".upper())
+    else:
+        print('No complete readings')
@@ -0,0 +1,215 @@
+import os
+import struct
+import sys
+from array import array
+from typing import NamedTuple
+from readings import Reading
+from scoringrules import ScoringRules
+from voightkampfftest import VoightKampffTest
+
+
+class SessionLog():
+    """
+    Append-only binary log of the answers and readings of one interview.
+
+    The file starts with a header holding the name of the question file,
+    followed by fixed-size records of the answer number and the four
+    readings. Every record is handed to the operating system as soon as
+    it is validated, so a crash of the process loses nothing, and the
+    records are synced to disk in batches, so a crash of the system loses
+    at most one batch. A partly written last record is dropped when the
+    log is opened again. A completed interview ends with a record with
+    the answer 0, which tells it apart from an interrupted one.
+
+    Attributes
+    ----------
+    file_name : str
+        The name of the log file.
+    bank_name : str
+        The name of the question file of the interview.
+    sync_every : int
+        Number of records written between the syncs to disk.
+    count : int
+        Number of records in the log.
+    """
+
+    MAGIC = b'VKSL'
+    VERSION = 1
+    HEADER = struct.Struct('<4sBH')
+    RECORD = struct.Struct('<BdBBB')
+    FINISHED = 0
+
+    class Replay(NamedTuple):
+        """The interview restored from a log."""
+
+        bank_name: str
+        answers: array
+        test: VoightKampffTest
+        finished: bool = False
+
+    def __init__(
+        self,
+        file_name: str,
+        bank_name: str = '',
+        sync_every: int = 64,
+        append: bool = True
+    ) -> None:
+        """
+        Parameters
+        ----------
+        file_name : str
+            The name of the log file.
+        bank_name : str
+            The name of the question file, written to a new log.
+        sync_every : int
+            Number of records written between the syncs to disk.
+        append : bool
+            If True, an existing log is continued, otherwise it is
+            replaced with a new one.
+
+        Raises
+        ------
+        ValueError
+            If an existing file is not a session log.
+        """
+
+        self.file_name = file_name
+        self.sync_every = sync_every
+        self.pending = 0
+        self.file = open(file_name, 'ab+')
+        if not append:
+            self.file.truncate(0)
+        self.file.seek(0)
+        head = self.file.read(self.HEADER.size)
+        if head:
+            self.bank_name, start = self.read_header(self.file, head)
+            size = self.file.seek(0, os.SEEK_END) - start
+            self.count = size // self.RECORD.size
+            self.file.truncate(start + self.count * self.RECORD.size)
+        else:
+            self.bank_name = bank_name
+            name = bank_name.encode('utf-8')
+            self.file.write(
+                self.HEADER.pack(self.MAGIC, self.VERSION, len(name)) + name
+            )
+            self.count = 0
+            self.sync()
+
+    def __enter__(self) -> 'SessionLog':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def append(self, answer: int, reading: Reading) -> None:
+        """Writes the answer and the readings taken for one question.
+
+        Parameters
+        ----------
+        answer : int
+            The number of the chosen answer.
+        reading : Reading
+            Readings taken for the question.
+        """
+
+        self.file.write(self.RECORD.pack(answer, *reading))
+        self.file.flush()
+        self.count += 1
+        self.pending += 1
+        if self.pending >= self.sync_every:
+            self.sync()
+
+    def finish(self) -> None:
+        """Marks the interview as completed, syncs and closes the log."""
+
+        self.file.write(self.RECORD.pack(self.FINISHED, 0.0, 0, 0, 0))
+        self.close()
+
+    def sync(self) -> None:
+        """Writes the buffered records to disk."""
+
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.pending = 0
+
+    def close(self) -> None:
+        """Syncs the records and closes the file."""
+
+        if not self.file.closed:
+            self.sync()
+            self.file.close()
+
+    @classmethod
+    def read_header(cls, f, head: bytes) -> tuple:
+        """Checks the header read from the file and reads the name of the
+        question file following it.
+
+        Returns
+        -------
+        tuple
+            The name of the question file and the offset of the records.
+
+        Raises
+        ------
+        ValueError
+            If the file is not a session log.
+        """
+
+        if len(head) < cls.HEADER.size:
+            raise ValueError('Not a session log')
+        magic, version, name_size = cls.HEADER.unpack(head)
+        if magic != cls.MAGIC or version != cls.VERSION:
+            raise ValueError('Not a session log')
+        name = f.read(name_size)
+        return name.decode('utf-8'), cls.HEADER.size + name_size
+
+    @classmethod
+    def replay(
+        cls,
+        file_name: str,
+        rules: ScoringRules = None
+    ) -> 'SessionLog.Replay':
+        """Restores the interview from the log. The columns are cut out of
+        the records with strided slices instead of decoding the records
+        one by one.
+
+        Parameters
+        ----------
+        file_name : str
+            The name of the log file.
+        rules : ScoringRules
+            The rules the readings are scored with. By default the rules
+            of VoightKampffTest.
+
+        Returns
+        -------
+        SessionLog.Replay
+            The question file, the answers and the test with all
+            readings of the log, and whether the interview was
+            completed.
+        """
+
+        with open(file_name, 'rb') as f:
+            bank_name, _ = cls.read_header(f, f.read(cls.HEADER.size))
+            data = f.read()
+        size = cls.RECORD.size
+        data = data[:len(data) - len(data) % size]
+        finished = len(data) > 0 and data[-size] == cls.FINISHED
+        if finished:
+            data = data[:-size]
+        respiration = bytearray(len(data) // size * 8)
+        for i in range(8):
+            respiration[i::8] = data[1 + i::size]
+        respiration = array('d', bytes(respiration))
+        if sys.byteorder == 'big':
+            respiration.byteswap()
+        test = VoightKampffTest(rules)
+        test.add_columns(
+            respiration,
+            array('B', data[9::size]),
+            array('B', data[10::size]),
+            array('B', data[11::size])
+        )
+        return cls.Replay(
+            bank_name, array('B', data[0::size]), test, finished
+        )
@@ -0,0 +1,315 @@
+import itertools
+import time
+import tracemalloc
+from collections import OrderedDict
+from checkdata import CheckData
+from reader import Reader
+from readings import Reading
+from viewer import Viewer
+from voightkampfftest import VoightKampffTest
+
+
+class SessionState():
+    """
+    State of one interview hosted by a SessionManager.
+
+    Attributes
+    ----------
+    session_id : str
+        The identifier of the session.
+    position : int
+        The number of the current question.
+    step : int
+        The current value of the question: 0 for the answer, 1 to 4 for
+        the readings.
+    values : list
+        The values entered for the current question.
+    test : VoightKampffTest
+        The test of the subject.
+    last_active : float
+        The time of the last entered value.
+    """
+
+    __slots__ = (
+        'session_id',
+        'position',
+        'step',
+        'values',
+        'test',
+        'last_active'
+    )
+
+    def __init__(self, session_id: str) -> None:
+        self.session_id = session_id
+        self.position = 0
+        self.step = 0
+        self.values = []
+        self.test = VoightKampffTest()
+        self.last_active = time.monotonic()
+
+
+class SessionManager():
+    """
+    Hosts many interviews in one process.
+
+    All sessions share the question bank and the validator. A session is
+    driven by the values submitted to it and is evicted as soon as its
+    result is written to the results file or the subject enters "exit".
+
+    Attributes
+    ----------
+    file_name : str
+        File name containing the question/answers of all sessions.
+    results_name : str
+        File the "session_id<TAB>verdict" lines are appended to. If None,
+        the results are only kept in the results attribute.
+    max_sessions : int
+        Maximum number of live sessions.
+    check_data : CheckData
+        The validator shared by all sessions.
+    bank : QuestionBank
+        The question bank shared by all sessions.
+    sessions : dict
+        The live sessions by their identifiers.
+    results : OrderedDict
+        The verdicts of the latest completed sessions by their
+        identifiers, kept only if no results file is set. The oldest
+        verdicts are dropped once max_results are kept, and pop_result
+        removes a verdict once it has been read.
+    max_results : int
+        Maximum number of verdicts kept in results.
+    completed : int
+        Number of completed sessions.
+    exporter : ColumnarWriter
+        The export the completed sessions are added to, or None.
+    """
+
+    STEPS = (
+        (Viewer.ANSWER_PROMPT, 'validate_answer'),
+        (Viewer.RESPIRATION_PROMPT, 'validate_respiration'),
+        (Viewer.HEART_RATE_PROMPT, 'validate_heart_rate'),
+        (Viewer.BLUSHING_LEVEL_PROMPT, 'validate_blushing_level'),
+        (Viewer.PUPILLARY_DILATION_PROMPT, 'validate_pupillary_dilation'),
+    )
+
+    def __init__(
+        self,
+        file_name: str,
+        results_name: str = None,
+        max_sessions: int = 1000,
+        exporter=None,
+        max_results: int = 1000
+    ) -> None:
+        """
+        Parameters
+        ----------
+        file_name : str
+            File name containing the question/answers of all sessions.
+        results_name : str
+            File the verdict lines are appended to.
+        max_sessions : int
+            Maximum number of live sessions.
+        exporter : ColumnarWriter
+            The export the readings and verdicts of the completed sessions
+            are added to. By default the sessions are not exported.
+        max_results : int
+            Maximum number of verdicts kept without a results file.
+
+        Raises
+        ------
+        ValueError
+            If the limit is not positive or the question bank is empty.
+        """
+
+        if max_sessions < 1:
+            raise ValueError('max_sessions must be positive')
+        if max_results < 1:
+            raise ValueError('max_results must be positive')
+        self.file_name = file_name
+        self.results_name = results_name
+        self.max_sessions = max_sessions
+        self.check_data = CheckData()
+        self.bank = Reader(file_name).bank()
+        if len(self.bank) == 0:
+            raise ValueError('The question bank is empty')
+        self.sessions = dict()
+        self.results = OrderedDict()
+        self.max_results = max_results
+        self.completed = 0
+        self.exporter = exporter
+        self._ids = itertools.count(1)
+
+    def open(self, session_id: str = None) -> str:
+        """Starts a new session.
+
+        Parameters
+        ----------
+        session_id : str
+            The identifier of the session. By default a new number.
+
+        Returns
+        -------
+        str
+            The first message of the session.
+
+        Raises
+        ------
+        RuntimeError
+            If the number of live sessions has reached the limit.
+        ValueError
+            If the session identifier is in use.
+        """
+
+        if len(self.sessions) >= self.max_sessions:
+            raise RuntimeError('Too many live sessions')
+        if session_id is None:
+            session_id = str(next(self._ids))
+        if session_id in self.sessions:
+            raise ValueError(f'Session {session_id} is already open')
+        self.sessions[session_id] = SessionState(session_id)
+        return '\n'.join((Viewer.BEGIN_BANNER, self.prompt(session_id)))
+
+    def prompt(self, session_id: str) -> str:
+        """Returns the message asking for the next value of the session."""
+
+        state = self.sessions[session_id]
+        message = self.STEPS[state.step][0]
+        if state.step == 0:
+            question, answers = self.bank[state.position]
+            return '\n'.join(
+                (Viewer.format_question(question, answers), message)
+            )
+        return message
+
+    def submit(self, session_id: str, value: str) -> str:
+        """Checks the value entered in the session and moves it on.
+
+        Parameters
+        ----------
+        session_id : str
+            The identifier of the session.
+        value : str
+            The entered value.
+
+        Returns
+        -------
+        str
+            The next message of the session. The last message contains the
+            result, after which the session is closed.
+
+        Raises
+        ------
+        KeyError
+            If the session is not open.
+        """
+
+        state = self.sessions[session_id]
+        state.last_active = time.monotonic()
+        result = getattr(self.check_data, self.STEPS[state.step][1])(value)
+        if result.code == CheckData.ErrorCheckData.EXIT:
+            self.close(session_id)
+            return Viewer.END_BANNER
+        if result.code != CheckData.ErrorCheckData.NO_ERROR:
+            return '\n'.join(
+                (Viewer.error_message(result.code), self.prompt(session_id))
+            )
+        state.values.append(result.value)
+        state.step += 1
+        if state.step < len(self.STEPS):
+            return self.prompt(session_id)
+        state.test.add_reading(Reading(*state.values[1:]))
+        state.values.clear()
+        state.step = 0
+        state.position += 1
+        if state.position < len(self.bank):
+            return self.prompt(session_id)
+        verdict = self._finish(state)
+        del self.sessions[session_id]
+        return '\n'.join((
+            Viewer.END_BANNER,
+            f"test subject's is {verdict}".upper()
+        ))
+
+    def close(self, session_id: str) -> None:
+        """Evicts the session without a result."""
+
+        self.sessions.pop(session_id, None)
+
+    def pop_result(self, session_id: str) -> str:
+        """Returns the verdict of the completed session and forgets it.
+
+        Returns
+        -------
+        str
+            "human" or "replicant", or None if the verdict is not kept.
+        """
+
+        return self.results.pop(session_id, None)
+
+    def idle(self, seconds: float) -> list:
+        """Returns the identifiers of the sessions without input for the
+        given time."""
+
+        deadline = time.monotonic() - seconds
+        return [
+            session_id
+            for session_id, state in self.sessions.items()
+            if state.last_active < deadline
+        ]
+
+    def _finish(self, state: SessionState) -> str:
+        """Persists the result of the completed session."""
+
+        verdict = state.test.get_verdict()
+        self.completed += 1
+        if self.exporter is not None:
+            self.exporter.add(state.session_id, state.test)
+        if self.results_name is None:
+            self.results[state.session_id] = verdict
+            self.results.move_to_end(state.session_id)
+            while len(self.results) > self.max_results:
+                self.results.popitem(last=False)
+        else:
+            with open(self.results_name, 'a', encoding='utf-8') as f:
+                f.write(f'{state.session_id}\t{verdict}\n')
+        return verdict
+
+    def memory_per_session(self, count: int = 100) -> float:
+        """Measures the memory taken by an idle session.
+
+        Parameters
+        ----------
+        count : int
+            Number of sessions created for the measurement.
+
+        Returns
+        -------
+        float
+            The average number of bytes allocated per session, including
+            its entry in the sessions dictionary.
+        """
+
+        started = not tracemalloc.is_tracing()
+        if started:
+            tracemalloc.start()
+        try:
+            before = tracemalloc.get_traced_memory()[0]
+            sessions = {
+                f'measure-{i}': SessionState(f'measure-{i}')
+                for i in range(count)
+            }
+            after = tracemalloc.get_traced_memory()[0]
+            sessions.clear()
+        finally:
+            if started:
+                tracemalloc.stop()
+        return (after - before)/count
+
+    def report(self) -> str:
+        """Returns a one-line summary of the sessions."""
+
+        return (
+            f'{len(self.sessions)} live sessions (limit '
+            f'{self.max_sessions}), {self.completed} completed, '
+            f'{self.memory_per_session():.0f} bytes per idle session'
+        )
@@ -0,0 +1,287 @@
+import glob
+import json
+import os
+import sqlite3
+from typing import NamedTuple
+from checkdata import CheckData
+from scoringrules import ScoringRules
+from verdictcache import VerdictCache
+from voightkampfftest import VoightKampffTest
+
+
+class SessionResult(NamedTuple):
+    """
+    The result of scoring one recorded session.
+
+    Attributes
+    ----------
+    file_name : str
+        The name of the session file.
+    verdict : str
+        "human" or "replicant", or None if the session is invalid.
+    error : CheckData.ErrorCheckData
+        The first error found in the session, or NO_ERROR.
+    cached : bool
+        True if the result was taken from the verdict cache, False if it
+        was looked up there and not found, or None if the cache was not
+        looked up.
+    """
+
+    file_name: str
+    verdict: str
+    error: CheckData.ErrorCheckData
+    cached: bool = None
+
+    def line(self) -> str:
+        """Returns the verdict line written for the session."""
+
+        if self.error == CheckData.ErrorCheckData.NO_ERROR:
+            return f'{self.file_name}\t{self.verdict}'
+        return f'{self.file_name}\terror\t{self.error.name}'
+
+
+class SessionScorer():
+    """
+    Scores recorded sessions without user interaction.
+
+    A session file is a JSON object with the lists "answers",
+    "respiration", "heart_rate", "blushing_level" and
+    "pupillary_dilation" holding one value per question. The values are
+    validated with the same rules as the interactive input.
+
+    Attributes
+    ----------
+    check_data : CheckData
+        An object of the CheckData class that validates the values.
+    rules : ScoringRules
+        The normal ranges and the threshold applied to the sessions.
+    cache : VerdictCache
+        The cache of the results, or None.
+    exporter : ColumnarWriter
+        The export the scored sessions are added to, or None.
+    """
+
+    FIELDS = (
+        'answers',
+        'respiration',
+        'heart_rate',
+        'blushing_level',
+        'pupillary_dilation'
+    )
+
+    def __init__(
+        self,
+        rules: ScoringRules = None,
+        cache: VerdictCache = None,
+        exporter=None
+    ) -> None:
+        """
+        Parameters
+        ----------
+        rules : ScoringRules
+            The normal ranges and the threshold. By default the rules of
+            VoightKampffTest.
+        cache : VerdictCache
+            The cache of the results. If set, a session file whose content
+            was scored under the same rules is not parsed again.
+        exporter : ColumnarWriter
+            The export the readings and verdicts of the valid sessions are
+            added to. While it is set, the cache is not looked up, so
+            every session is scored and exported, but the results are
+            still written to the cache.
+        """
+
+        self.check_data = CheckData()
+        self.rules = rules
+        self.cache = cache
+        self.exporter = exporter
+
+    @staticmethod
+    def expand(paths) -> list:
+        """Turns directories and glob patterns into session file names.
+
+        Parameters
+        ----------
+        paths : iterable
+            Session files, directories containing session files or glob
+            patterns.
+
+        Returns
+        -------
+        list
+            The names of the session files.
+        """
+
+        file_names = []
+        for path in paths:
+            if os.path.isdir(path):
+                file_names.extend(sorted(
+                    glob.glob(os.path.join(path, '*.json'))
+                ))
+            elif glob.has_magic(path):
+                file_names.extend(sorted(glob.glob(path)))
+            else:
+                file_names.append(path)
+        return file_names
+
+    def score_files(self, file_names):
+        """Scores the session files one by one.
+
+        Parameters
+        ----------
+        file_names : iterable
+            The names of the session files.
+
+        Yields
+        ------
+        SessionResult
+            The result of the next session.
+        """
+
+        for file_name in file_names:
+            yield self.score_file(file_name)
+
+    def score_file(self, file_name: str) -> SessionResult:
+        """Validates and scores one session file.
+
+        Parameters
+        ----------
+        file_name : str
+            The name of the session file.
+
+        Returns
+        -------
+        SessionResult
+            The verdict or the first error found in the session. A file
+            that cannot be read or processed gets INVALID_FILE. A file of
+            an unsupported format is rejected before the cache is looked
+            up, since the key holds only the content. If the cache
+            database is locked for too long, the session is scored
+            without it. With an exporter the cache is only written to.
+        """
+
+        if (
+            self.cache is None or
+            not os.path.isfile(file_name) or
+            not self.check_data.allowed_file(file_name)
+        ):
+            return self._score_file(file_name)
+        try:
+            with open(file_name, 'rb') as f:
+                data = f.read()
+        except OSError:
+            return self._score_file(file_name)
+        key = self.cache.key(data, self.rules)
+        cached = looked_up = None
+        if self.exporter is None:
+            try:
+                cached = self.cache.get(key)
+                looked_up = False
+            except sqlite3.OperationalError:
+                pass
+        if cached is not None:
+            return SessionResult(
+                file_name,
+                cached[0],
+                CheckData.ErrorCheckData[cached[1]],
+                True
+            )
+        result = self._score_file(file_name, data)._replace(
+            cached=looked_up
+        )
+        try:
+            self.cache.put(key, result.verdict, result.error.name)
+        except sqlite3.OperationalError:
+            pass
+        return result
+
+    def _score_file(self, file_name: str, data: bytes = None):
+        """Validates and scores one session file without the cache."""
+
+        try:
+            session, error = self.load(file_name, data)
+            if error != CheckData.ErrorCheckData.NO_ERROR:
+                return SessionResult(file_name, None, error)
+            return self.score_session(file_name, session)
+        except (
+            OSError,
+            ValueError,
+            TypeError,
+            OverflowError,
+            RecursionError
+        ):
+            return SessionResult(
+                file_name, None, CheckData.ErrorCheckData.INVALID_FILE
+            )
+
+    def load(self, file_name: str, data: bytes = None) -> tuple:
+        """Reads a session file and checks its structure.
+
+        Parameters
+        ----------
+        file_name : str
+            The name of the session file.
+        data : bytes
+            The content of the file if it has already been read.
+
+        Returns
+        -------
+        tuple
+            The session and NO_ERROR, or None and the error.
+        """
+
+        if data is None and not os.path.isfile(file_name):
+            return None, CheckData.ErrorCheckData.FILE_DOES_NOT_EXIST
+        try:
+            if data is None:
+                with open(file_name, 'r', encoding='utf-8') as f:
+                    session = json.load(f)
+            else:
+                session = json.loads(data.decode('utf-8'))
+        except (json.decoder.JSONDecodeError, UnicodeDecodeError):
+            return None, CheckData.ErrorCheckData.INVALID_FILE
+        if (
+            not self.check_data.allowed_file(file_name) or
+            not isinstance(session, dict) or
+            not all(
+                isinstance(session.get(field, None), list)
+                for field in self.FIELDS
+            ) or
+            len(set(len(session[field]) for field in self.FIELDS)) != 1 or
+            not session['answers']
+        ):
+            return None, CheckData.ErrorCheckData.INVALID_FILE
+        return session, CheckData.ErrorCheckData.NO_ERROR
+
+    def score_session(self, file_name: str, session: dict) -> SessionResult:
+        """Validates the values of a loaded session and scores it.
+
+        Parameters
+        ----------
+        file_name : str
+            The name of the session file.
+        session : dict
+            The session returned by load.
+
+        Returns
+        -------
+        SessionResult
+            The verdict or the first invalid value found in the session.
+        """
+
+        errors, parsed = self.check_data.check_columns(*(
+            [str(value) for value in session[field]]
+            for field in self.FIELDS
+        ))
+        for code in errors:
+            if code != CheckData.ErrorCheckData.NO_ERROR.value:
+                return SessionResult(
+                    file_name, None, CheckData.ErrorCheckData(code)
+                )
+        test = VoightKampffTest(self.rules)
+        test.add_columns(*parsed[1:])
+        if self.exporter is not None:
+            self.exporter.add(file_name, test)
+        return SessionResult(
+            file_name, test.get_verdict(), CheckData.ErrorCheckData.NO_ERROR
+        )
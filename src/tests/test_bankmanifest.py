@@ -0,0 +1,80 @@
+import json
+import os
+import pytest
+from bankmanifest import BankManifest
+from checkdata import CheckData
+from metrics import metrics
+
+
+def write_bank(file_name, bank):
+    with open(file_name, 'w', encoding='utf-8') as f:
+        json.dump(bank, f)
+
+
+def test_bank_manifest_build_and_trust(tmp_path):
+    bank_name = str(tmp_path / 'bank.json')
+    write_bank(bank_name, {
+        'questions': ['q1', 'q2'],
+        'answers': [['a1', 'a2'], ['a1', 'a2', 'a3', 'a4']]
+    })
+    manifest_name = BankManifest.build(bank_name).save()
+    assert manifest_name == bank_name + '.manifest.json'
+    with open(manifest_name) as f:
+        data = json.load(f)
+    assert data['schema_version'] == BankManifest.SCHEMA_VERSION
+    assert data['questions'] == 2
+    assert data['answer_counts'] == '24'
+    manifest = BankManifest.load(bank_name)
+    assert manifest.matches()
+    metrics.reset()
+    metrics.enable()
+    try:
+        assert CheckData().validate_file(bank_name).code ==\
+            CheckData.ErrorCheckData.NO_ERROR
+        assert metrics.counters[('manifest_hits', None)] == 1
+    finally:
+        metrics.disable()
+        metrics.reset()
+
+
+def test_bank_manifest_changed_bank(tmp_path):
+    bank_name = str(tmp_path / 'bank.json')
+    write_bank(bank_name, {'questions': ['q1'], 'answers': [['a1']]})
+    BankManifest.build(bank_name).save()
+    stat = os.stat(bank_name)
+    os.utime(bank_name, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert BankManifest.load(bank_name).matches()
+    write_bank(bank_name, {'questions': ['q1', 'q2'], 'answers': [['a1']]})
+    assert not BankManifest.load(bank_name).matches()
+    assert CheckData().validate_file(bank_name).code ==\
+        CheckData.ErrorCheckData.INVALID_FILE
+
+
+def test_bank_manifest_invalid(tmp_path):
+    bank_name = str(tmp_path / 'bank.json')
+    write_bank(bank_name, {'questions': ['q1'], 'answers': [[]]})
+    with pytest.raises(ValueError, match='0 answers'):
+        BankManifest.build(bank_name)
+    assert BankManifest.load(bank_name) is None
+    with open(BankManifest.manifest_name(bank_name), 'w') as f:
+        json.dump({'schema_version': 0}, f)
+    assert BankManifest.load(bank_name) is None
+    with pytest.raises(ValueError):
+        BankManifest.build(str(tmp_path / 'bank.txt'))
+
+
+def test_bank_manifest_written_by_check(tmp_path):
+    bank_name = str(tmp_path / 'bank.json')
+    write_bank(bank_name, {'questions': ['q1'], 'answers': [['a1', 'a2']]})
+    assert CheckData().validate_file(bank_name).code ==\
+        CheckData.ErrorCheckData.NO_ERROR
+    assert BankManifest.load(bank_name) is None
+    assert CheckData(write_manifest=True).validate_file(bank_name).code ==\
+        CheckData.ErrorCheckData.NO_ERROR
+    manifest = BankManifest.load(bank_name)
+    assert manifest.matches()
+    assert manifest.answer_counts == '2'
+    stat = os.stat(bank_name)
+    os.utime(bank_name, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert BankManifest.load(bank_name).matches()
+    assert BankManifest.load(bank_name).mtime_ns == stat.st_mtime_ns + 10**9
@@ -0,0 +1,105 @@
+import pytest
+from scoringrules import ScoringRules
+from voightkampfftest import VoightKampffTest
+
+np = pytest.importorskip('numpy')
+from batchscorer import BatchScorer  # noqa: E402
+
+
+def scalar_score(respiration, heart_rate, blushing_level, pupillary_dilation):
+    test = VoightKampffTest()
+    answers = []
+    for reading in zip(
+        respiration, heart_rate, blushing_level, pupillary_dilation
+    ):
+        answers.extend(test.is_human_value(*reading))
+    return sum(answers) / len(answers), test
+
+
+def random_readings(rng, shape):
+    return (
+        rng.choice([11.5, 12.0, 14.25, 16.0, 16.5], size=shape),
+        rng.integers(30, 201, size=shape),
+        rng.integers(0, 6, size=shape),
+        rng.integers(1, 16, size=shape),
+    )
+
+
+def test_batchscorer_matches_scalar(capsys):
+    rng = np.random.default_rng(21)
+    readings = random_readings(rng, (200, 10))
+    readings[1][:100] = 70
+    readings[2][:100] = 3
+    lengths = rng.integers(1, 11, size=200)
+    coefficients, verdicts = BatchScorer().score(*readings, lengths=lengths)
+    for i in range(200):
+        columns = [column[i, :lengths[i]].tolist() for column in readings]
+        coefficient, test = scalar_score(*columns)
+        for resp, heart, blush, pup in zip(*columns):
+            test.add_respiration(resp)
+            test.add_heart_rate(heart)
+            test.add_blushing_level(blush)
+            test.add_pupillary_dilation(pup)
+        assert coefficients[i] == coefficient
+        assert verdicts[i] == test.get_result()
+
+
+def test_batchscorer_score_flat():
+    rng = np.random.default_rng(7)
+    readings = random_readings(rng, 50)
+    offsets = [0, 10, 10, 35, 50]
+    coefficients, verdicts = BatchScorer().score_flat(*readings, offsets)
+    for i in (0, 2, 3):
+        start, end = offsets[i], offsets[i + 1]
+        coefficient, _ = scalar_score(
+            *[column[start:end].tolist() for column in readings]
+        )
+        assert coefficients[i] == coefficient
+    assert np.isnan(coefficients[1])
+    assert verdicts[1] == 'replicant'
+
+
+def test_batchscorer_requires_rows():
+    with pytest.raises(ValueError):
+        BatchScorer().score([14.0], [70], [3], [4])
+
+
+@pytest.mark.parametrize('lengths', [[3], [-1], [1, 1]])
+def test_batchscorer_rejects_bad_lengths(lengths):
+    with pytest.raises(ValueError):
+        BatchScorer().score([[14.0]], [[70]], [[3]], [[4]], lengths=lengths)
+
+
+@pytest.mark.parametrize('offsets', [[0, 2, 1], [-1, 1], [0, 4], [], [[0, 1]]])
+def test_batchscorer_rejects_bad_offsets(offsets):
+    with pytest.raises(ValueError):
+        BatchScorer().score_flat(
+            [14.0, 15.0, 16.0], [70] * 3, [3] * 3, [4] * 3, offsets
+        )
+
+
+def test_batchscorer_score_buffers():
+    tests = [VoightKampffTest() for _ in range(3)]
+    for i, test in enumerate(tests):
+        for j in range(5 * i):
+            test.add_respiration(11.0 + j)
+            test.add_heart_rate(70)
+            test.add_blushing_level(3)
+            test.add_pupillary_dilation(4)
+    coefficients, verdicts = BatchScorer().score_buffers(
+        test.readings for test in tests
+    )
+    assert np.isnan(coefficients[0])
+    assert coefficients[1] == 19 / 20
+    assert coefficients[2] == 35 / 40
+    assert list(verdicts) == ['replicant', 'human', 'replicant']
+
+
+def test_batch_scorer_rules():
+    readings = ([[20.0, 14.0]], [[70, 80]], [[3, 3]], [[4, 4]])
+    _, verdicts = BatchScorer().score(*readings)
+    assert list(verdicts) == ['replicant']
+    _, verdicts = BatchScorer(rules=ScoringRules(threshold=0.8)).score(
+        *readings
+    )
+    assert list(verdicts) == ['human']
@@ -0,0 +1,68 @@
+import json
+import benchmark
+
+
+def test_benchmark_run():
+    results = benchmark.run([5], repeat=1)
+    assert [(result['name'], result['size'])
+            for result in results['results']] == [
+        ('read', 5), ('validate', 5), ('score', 5), ('session', 5)
+    ]
+    assert all(result['seconds'] > 0 for result in results['results'])
+
+
+def test_benchmark_compare():
+    baseline = {'results': [
+        {'name': 'read', 'size': 10, 'seconds': 1.0},
+        {'name': 'score', 'size': 10, 'seconds': 1.0},
+    ]}
+    current = {'results': [
+        {'name': 'read', 'size': 10, 'seconds': 1.1},
+        {'name': 'score', 'size': 10, 'seconds': 1.5},
+        {'name': 'session', 'size': 10, 'seconds': 9.0},
+    ]}
+    regressions = benchmark.compare(current, baseline, 0.2)
+    assert len(regressions) == 1
+    assert regressions[0].startswith('score[10]')
+
+
+def test_benchmark_main(tmp_path, capsys):
+    output = tmp_path / 'results.json'
+    assert benchmark.main([
+        '-s', '3', '-b', 'validate', '-r', '1', '-o', str(output),
+        '--startup-budget', '10'
+    ]) == 0
+    baseline = json.loads(output.read_text())
+    baseline['results'][0]['seconds'] = 0.0
+    with open(tmp_path / 'baseline.json', 'w') as f:
+        json.dump(baseline, f)
+    assert benchmark.main([
+        '-s', '3', '-b', 'validate', '-r', '1', '-o', str(output),
+        '--compare', str(tmp_path / 'baseline.json')
+    ]) == 1
+    assert 'REGRESSION validate[3]' in capsys.readouterr().out
+
+
+def test_benchmark_startup(capsys, tmp_path):
+    assert 0 < benchmark.startup_time(repeat=1) < 10
+    assert benchmark.main([
+        '-s', '3', '-b', 'validate', '-r', '1',
+        '-o', str(tmp_path / 'results.json'), '--startup-budget', '0'
+    ]) == 1
+    assert 'STARTUP OVER BUDGET' in capsys.readouterr().out
+
+
+def test_benchmark_lazy_imports():
+    interactive = benchmark.loaded_modules(
+        'import builtins\n'
+        'builtins.input = lambda _: "exit"\n'
+        'import main\n'
+        'main.main()'
+    )
+    assert 'viewer' in interactive
+    assert not interactive & set(benchmark.HEAVY_MODULES)
+    assert 'argparse' not in interactive
+    assert 'reader' not in interactive
+    batch = benchmark.loaded_modules('import main\nmain.batch(["none.json"])')
+    assert 'concurrent.futures' in batch
+    assert 'viewer' not in batch
@@ -1,5 +1,7 @@
+import json
 import pytest
 from checkdata import CheckData
+from questionbank import QuestionBank
 
 
 @pytest.mark.parametrize('args, result', [
@@ -95,3 +97,143 @@ def test_check_data_check_pupillary_dilation(args, result):
     check = CheckData()
     check.check_pupillary_dilation(args)
     assert check.error == result
+
+
+@pytest.mark.parametrize('lines, result', [
+    (['{"question": "q1", "answers": ["a", "b"]}'],
+     CheckData.ErrorCheckData.NO_ERROR),
+    ([''], CheckData.ErrorCheckData.INVALID_FILE),
+    (['{"question": "q1"}'], CheckData.ErrorCheckData.INVALID_FILE),
+    (['not json'], CheckData.ErrorCheckData.INVALID_FILE),
+])
+def test_check_data_check_file_paired(tmp_path, lines, result):
+    file_name = str(tmp_path / 'questions.jsonl')
+    with open(file_name, 'w') as f:
+        f.write('\n'.join(lines))
+    check = CheckData()
+    check.check_file(file_name)
+    assert check.error == result
+
+
+def test_check_data_check_columns():
+    check = CheckData()
+    errors, parsed = check.check_columns(
+        ['1', '5', '2', '3', '4', 'exit'],
+        ['14', '14', 'x', '14', '14', '14'],
+        ['70', '70', '70', '300', '70', '70'],
+        ['3', '9', '3', '3', '-1', '3'],
+        ['4', '4', '4', '4', '4', '4'],
+    )
+    assert [CheckData.ErrorCheckData(code) for code in errors] == [
+        CheckData.ErrorCheckData.NO_ERROR,
+        CheckData.ErrorCheckData.INVALID_INPUT,
+        CheckData.ErrorCheckData.INVALID_RESPIRATION,
+        CheckData.ErrorCheckData.INVALID_HEART_RATE,
+        CheckData.ErrorCheckData.INVALID_BLUSHING_LEVEL,
+        CheckData.ErrorCheckData.EXIT,
+    ]
+    assert [column[0] for column in parsed] == [1, 14.0, 70, 3, 4]
+    assert check.error == CheckData.ErrorCheckData.NO_ERROR
+
+
+def test_check_data_check_columns_length():
+    with pytest.raises(ValueError):
+        CheckData().check_columns(['1'], [], ['70'], ['3'], ['4'])
+
+
+@pytest.mark.parametrize('method, args, result', [
+    ('validate_answer', '3', (CheckData.ErrorCheckData.NO_ERROR, 3)),
+    ('validate_answer', '5', (CheckData.ErrorCheckData.INVALID_INPUT, None)),
+    ('validate_respiration', '10.5',
+     (CheckData.ErrorCheckData.NO_ERROR, 10.5)),
+    ('validate_heart_rate', 'exit', (CheckData.ErrorCheckData.EXIT, None)),
+    ('validate_blushing_level', '6',
+     (CheckData.ErrorCheckData.INVALID_BLUSHING_LEVEL, None)),
+    ('validate_pupillary_dilation', '15',
+     (CheckData.ErrorCheckData.NO_ERROR, 15)),
+    ('validate_file', 'questions.json',
+     (CheckData.ErrorCheckData.NO_ERROR, 'questions.json')),
+    ('validate_file', 'asdf',
+     (CheckData.ErrorCheckData.FILE_DOES_NOT_EXIST, None)),
+])
+def test_check_data_validate(method, args, result):
+    check = CheckData()
+    check_result = getattr(check, method)(args)
+    assert (check_result.code, check_result.value) == result
+    assert check_result.raw == args
+    assert check.error == CheckData.ErrorCheckData.NO_ERROR
+
+
+def test_check_data_shared_between_threads():
+    from concurrent.futures import ThreadPoolExecutor
+
+    check = CheckData()
+    values = [str(value) for value in range(0, 300)]
+    with ThreadPoolExecutor(8) as executor:
+        results = list(executor.map(check.validate_heart_rate, values))
+    for value, result in zip(range(0, 300), results):
+        if 30 <= value <= 200:
+            assert result == (CheckData.ErrorCheckData.NO_ERROR, value,
+                              str(value))
+        else:
+            assert result.code == CheckData.ErrorCheckData.INVALID_HEART_RATE
+
+
+def test_check_data_check_returns_result():
+    check = CheckData()
+    result = check.check_respiration('14.5')
+    assert result.value == 14.5
+    assert check.error == result.code == CheckData.ErrorCheckData.NO_ERROR
+
+
+@pytest.mark.parametrize('bank, problem', [
+    ({'questions': ['q1', 'q2'], 'answers': [['a']]},
+     '2 questions and 1 answer lists'),
+    ({'questions': ['q1'], 'answers': [['a', 'b', 'c', 'd', 'e']]},
+     'question 1: 5 answers instead of 1 to 4'),
+    ({'questions': ['q1'], 'answers': [[]]},
+     'question 1: 0 answers instead of 1 to 4'),
+    ({'questions': [''], 'answers': [['a']]},
+     'question 1: the question is not a non-empty string'),
+    ({'questions': ['q1'], 'answers': ['a']},
+     'question 1: the answers are not a list'),
+    ({'questions': ['q1'], 'answers': [['a', 2]]},
+     'question 1: an answer is not a string'),
+    ({'questions': 'q1', 'answers': [['a']]},
+     'the questions or answers are not lists'),
+])
+def test_check_data_bank_problems(tmp_path, bank, problem):
+    file_name = str(tmp_path / 'bank.json')
+    with open(file_name, 'w') as f:
+        json.dump(bank, f)
+    check = CheckData()
+    assert check.bank_problems(file_name) == [problem]
+    check.check_file(file_name)
+    assert check.error == CheckData.ErrorCheckData.INVALID_FILE
+
+
+def test_check_data_bank_problems_paired(tmp_path):
+    file_name = str(tmp_path / 'bank.jsonl')
+    with open(file_name, 'w') as f:
+        f.write('{"question": "q1", "answers": ["a"]}\n')
+        f.write('{"question": "q2", "answers": []}\n')
+    assert CheckData().bank_problems(file_name) ==\
+        ['question 2: 0 answers instead of 1 to 4']
+    assert CheckData().bank_problems('questions.json') == []
+
+
+def test_check_data_stream_does_not_parse_whole_bank(tmp_path):
+    file_name = str(tmp_path / 'bank.json')
+    with open(file_name, 'w') as f:
+        json.dump({'questions': ['q1'], 'answers': [['a']]}, f)
+    QuestionBank.clear_cache()
+    check = CheckData(stream=True)
+    check.check_file(file_name)
+    assert check.error == CheckData.ErrorCheckData.NO_ERROR
+    assert not check.empty_bank(file_name)
+    assert not QuestionBank._cache
+    with open(file_name, 'w') as f:
+        json.dump({'questions': ['q1', 'q2'], 'answers': [['a']]}, f)
+    assert check.bank_problems(file_name) ==\
+        ['the numbers of questions and answer lists differ']
+    assert not QuestionBank._cache
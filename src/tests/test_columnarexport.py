@@ -0,0 +1,118 @@
+import json
+import math
+import pytest
+from columnarexport import ColumnarReader, ColumnarWriter
+from readings import Reading
+from scoringrules import ScoringRules
+from sessionmanager import SessionManager
+from sessionscorer import SessionScorer
+from verdictcache import VerdictCache
+from voightkampfftest import VoightKampffTest
+
+
+def make_test(*readings, rules=None):
+    test = VoightKampffTest(rules)
+    for reading in readings:
+        test.add_reading(Reading(*reading))
+    return test
+
+
+def test_columnar_export_round_trip(tmp_path):
+    file_name = str(tmp_path / 'export.vkcx')
+    human = make_test((14.0, 80, 3, 5), (13.5, 70, 2, 4))
+    replicant = make_test((30.0, 30, 0, 1))
+    with ColumnarWriter(file_name, chunk_sessions=2) as exporter:
+        exporter.add('a', human)
+        exporter.add('b', replicant)
+        exporter.add('c', VoightKampffTest())
+        assert exporter.sessions == 3
+    with ColumnarReader(file_name) as reader:
+        chunks = list(reader.chunks())
+        assert [len(chunk) for chunk in chunks] == [2, 1]
+        first = chunks[0]
+        assert first.session_id(1) == 'b'
+        assert list(first.offsets) == [0, 2, 3]
+        assert list(first.respiration) == [14.0, 13.5, 30.0]
+        assert list(first.heart_rate) == [80, 70, 30]
+        assert list(first.blushing_level) == [3, 2, 0]
+        assert list(first.pupillary_dilation) == [5, 4, 1]
+        assert list(first.flags) == [15, 15, 0]
+        assert list(first.coefficients) == [1.0, 0.0]
+        assert list(first.verdicts) == [1, 0]
+        assert first.respiration.format == 'd'
+        assert math.isnan(chunks[1].coefficients[0])
+        del chunks, first
+        sessions = list(reader.sessions())
+    assert sessions[:2] == [('a', 1.0, 'human'), ('b', 0.0, 'replicant')]
+    assert sessions[2][0] == 'c'
+
+
+def test_columnar_export_appends_and_uses_test_rules(tmp_path):
+    file_name = str(tmp_path / 'export.vkcx')
+    rules = ScoringRules(threshold=0.5, heart_rate=(20, 40))
+    with ColumnarWriter(file_name) as exporter:
+        exporter.add('a', make_test((30.0, 30, 3, 5), rules=rules))
+    with ColumnarWriter(file_name) as exporter:
+        exporter.add('b', make_test((30.0, 30, 3, 5)))
+    with ColumnarReader(file_name) as reader:
+        assert reader.summary() == {
+            'sessions': 2, 'readings': 2, 'human': 1, 'replicant': 1
+        }
+        flags = [list(chunk.flags) for chunk in reader.chunks()]
+    assert flags == [[14], [12]]
+
+
+def test_columnar_export_errors(tmp_path):
+    with pytest.raises(ValueError):
+        ColumnarWriter(str(tmp_path / 'export.vkcx'), chunk_sessions=0)
+    other = tmp_path / 'other.vkcx'
+    other.write_bytes(b'not an export')
+    with pytest.raises(ValueError):
+        ColumnarReader(str(other))
+    file_name = tmp_path / 'export.vkcx'
+    with ColumnarWriter(str(file_name)) as exporter:
+        exporter.add('a', make_test((14.0, 80, 3, 5)))
+    file_name.write_bytes(file_name.read_bytes()[:-3])
+    with ColumnarReader(str(file_name)) as reader:
+        with pytest.raises(ValueError):
+            list(reader.chunks())
+    with ColumnarWriter(str(file_name)) as exporter:
+        exporter.add('b', make_test((30.0, 30, 0, 1)))
+    with ColumnarReader(str(file_name)) as reader:
+        assert [session[0] for session in reader.sessions()] == ['b']
+    with pytest.raises(ValueError):
+        ColumnarWriter(str(other))
+
+
+def test_columnar_export_from_scorers(tmp_path):
+    file_name = str(tmp_path / 'export.vkcx')
+    session = tmp_path / 'session.json'
+    session.write_text(json.dumps({
+        'answers': ['1'],
+        'respiration': ['14'],
+        'heart_rate': ['80'],
+        'blushing_level': ['3'],
+        'pupillary_dilation': ['5'],
+    }))
+    with ColumnarWriter(file_name) as exporter:
+        SessionScorer(exporter=exporter).score_file(str(session))
+        manager = SessionManager('questions.json', exporter=exporter)
+        manager.open('a')
+        for _ in range(len(manager.bank)):
+            for value in ('1', '30', '30', '0', '1'):
+                manager.submit('a', value)
+    with ColumnarReader(file_name) as reader:
+        sessions = list(reader.sessions())
+    assert sessions == [
+        (str(session), 1.0, 'human'),
+        ('a', 0.0, 'replicant'),
+    ]
+    cache = VerdictCache()
+    SessionScorer(cache=cache).score_file(str(session))
+    with ColumnarWriter(file_name) as exporter:
+        result = SessionScorer(cache=cache, exporter=exporter).score_file(
+            str(session)
+        )
+    assert result.verdict == 'human' and not result.cached
+    with ColumnarReader(file_name) as reader:
+        assert reader.summary()['sessions'] == 3
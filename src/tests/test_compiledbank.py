@@ -0,0 +1,91 @@
+import json
+import os
+import pytest
+from checkdata import CheckData
+from compiledbank import CompiledBank, compile_bank
+from reader import Reader
+
+
+def test_compiled_bank_round_trip(tmp_path):
+    file_name = compile_bank('questions.json', str(tmp_path / 'bank.vkqb'))
+    with open('questions.json', 'r', encoding='utf-8') as f:
+        dict_from_json = json.load(f)
+    bank = CompiledBank(file_name)
+    assert len(bank) == len(dict_from_json.get('questions'))
+    assert list(bank.pairs()) == list(zip(
+        dict_from_json.get('questions'),
+        dict_from_json.get('answers')
+    ))
+    assert bank[-1] == (
+        dict_from_json.get('questions')[-1],
+        dict_from_json.get('answers')[-1]
+    )
+    assert not bank.stale()
+    with pytest.raises(IndexError):
+        bank[len(bank)]
+
+
+def test_compiled_bank_reader(tmp_path):
+    file_name = compile_bank('questions.json', str(tmp_path / 'bank.vkqb'))
+    reader = Reader(file_name)
+    assert reader.compiled()
+    assert reader.count() == len(list(reader.items()))
+    assert list(reader.questions()) == list(
+        Reader('questions.json').questions()
+    )
+    assert list(Reader(file_name, stream=True).items()) ==\
+        list(Reader('questions.json').items())
+
+
+def test_compiled_bank_stale(tmp_path):
+    source = str(tmp_path / 'bank.json')
+    with open(source, 'w', encoding='utf-8') as f:
+        json.dump({'questions': ['q1'], 'answers': [['a1', 'a2']]}, f)
+    file_name = compile_bank(source)
+    assert file_name == str(tmp_path / 'bank.vkqb')
+    assert CheckData().validate_file(file_name).code ==\
+        CheckData.ErrorCheckData.NO_ERROR
+    with open(source, 'w', encoding='utf-8') as f:
+        json.dump({'questions': ['q2'], 'answers': [['a1', 'a2']]}, f)
+    stat = os.stat(source)
+    os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert CompiledBank(file_name).stale()
+    assert CheckData().validate_file(file_name).code ==\
+        CheckData.ErrorCheckData.INVALID_FILE
+
+
+@pytest.mark.parametrize('data', [b'', b'JSON' + bytes(100)])
+def test_compiled_bank_invalid(tmp_path, data):
+    file_name = str(tmp_path / 'bank.vkqb')
+    with open(file_name, 'wb') as f:
+        f.write(data)
+    assert CheckData().validate_file(file_name).code ==\
+        CheckData.ErrorCheckData.INVALID_FILE
+
+
+def test_compiled_bank_truncated(tmp_path):
+    file_name = compile_bank('questions.json', str(tmp_path / 'bank.vkqb'))
+    with open(file_name, 'rb') as f:
+        data = f.read()
+    with open(file_name, 'wb') as f:
+        f.write(data[:-10])
+    bank = CompiledBank(file_name)
+    assert bank[0] == next(Reader('questions.json').items())
+    with pytest.raises(ValueError, match='Corrupt'):
+        list(bank.pairs())
+    del bank
+    assert CheckData().validate_file(file_name).code ==\
+        CheckData.ErrorCheckData.INVALID_FILE
+    with open(file_name, 'wb') as f:
+        f.write(data[:CompiledBank.HEADER.size + 20])
+    with pytest.raises(ValueError):
+        CompiledBank(file_name)
+
+
+def test_compiled_bank_rejects_misaligned_source(tmp_path):
+    source = str(tmp_path / 'bank.json')
+    with open(source, 'w', encoding='utf-8') as f:
+        json.dump({'questions': ['q1', 'q2'], 'answers': [['a1']]}, f)
+    with pytest.raises(ValueError):
+        compile_bank(source)
+    assert not os.path.exists(str(tmp_path / 'bank.vkqb'))
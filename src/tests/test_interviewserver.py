@@ -0,0 +1,105 @@
+import asyncio
+import pytest
+from interviewserver import InterviewServer
+from viewer import Viewer
+
+
+HUMAN_INPUTS = ['questions.json'] + [
+    value
+    for _ in range(10)
+    for value in ('1', '14', '70', '3', '4')
+]
+
+
+async def interview(port, inputs):
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    for value in inputs:
+        writer.write(value.encode('utf-8') + b'\n')
+    await writer.drain()
+    output = (await reader.read()).decode('utf-8')
+    writer.close()
+    return output.splitlines()
+
+
+def run_interviews(inputs_list, file_name=None):
+    async def scenario():
+        server = InterviewServer(file_name)
+        listening = await server.start()
+        port = listening.sockets[0].getsockname()[1]
+        try:
+            return await asyncio.gather(
+                *(interview(port, inputs) for inputs in inputs_list)
+            )
+        finally:
+            await server.close()
+
+    return asyncio.run(scenario())
+
+
+def test_interview_server_human():
+    lines = run_interviews([HUMAN_INPUTS])[0]
+    assert lines[-1] == "TEST SUBJECT'S IS HUMAN"
+    assert sum(line.startswith('Question: ') for line in lines) == 10
+
+
+@pytest.mark.parametrize('inputs, result', [
+    (['asdf', 'exit'], 'File does not exist. Try again.'),
+    (['questions.json', '5', 'exit'], '\tInvalid input. Try again.'),
+    (['questions.json', '1', '14', '300', 'exit'], (
+        '\tIncorrect heartbeat readings. The value must be a positive '
+        'number between 30 and 200. Try again.'
+    )),
+])
+def test_interview_server_errors(inputs, result):
+    lines = run_interviews([inputs])[0]
+    assert result in lines
+    assert not lines[-1].startswith("TEST SUBJECT'S IS")
+
+
+def test_interview_server_concurrent_sessions():
+    replicant = HUMAN_INPUTS[:1] + ['1', '20', '30', '0', '1'] * 10
+    results = run_interviews(
+        [HUMAN_INPUTS[1:], replicant[1:]] * 50, 'questions.json'
+    )
+    verdicts = [lines[-1] for lines in results]
+    assert verdicts == [
+        "TEST SUBJECT'S IS HUMAN",
+        "TEST SUBJECT'S IS REPLICANT"
+    ] * 50
+
+
+def test_interview_server_invalid_file():
+    with pytest.raises(ValueError):
+        run_interviews([], 'asdf')
+
+
+def test_interview_server_bad_lines():
+    errors = []
+
+    async def send(port, data):
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        writer.write(data)
+        await writer.drain()
+        output = (await reader.read()).decode('utf-8')
+        writer.close()
+        return output.splitlines()
+
+    async def scenario():
+        asyncio.get_running_loop().set_exception_handler(
+            lambda loop, context: errors.append(context)
+        )
+        server = InterviewServer()
+        listening = await server.start()
+        port = listening.sockets[0].getsockname()[1]
+        try:
+            return await asyncio.gather(
+                send(port, b'\xff\xfe.json\nexit\n'),
+                send(port, b'x' * 100000 + b'\n')
+            )
+        finally:
+            await server.close()
+
+    undecodable, overlong = asyncio.run(scenario())
+    assert 'File does not exist. Try again.' in undecodable
+    assert overlong == [Viewer.FILE_PROMPT]
+    assert errors == []
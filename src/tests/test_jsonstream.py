@@ -0,0 +1,35 @@
+import io
+import json
+import pytest
+from jsonstream import JsonStream
+
+
+DOCUMENT = {
+    'title': 'bank',
+    'meta': {'nested': [1, 2, {'deep': [3.5, 'x]}']}], 'empty': {}},
+    'answers': [['a', 'b'], [], ['c']],
+    'numbers': [],
+    'questions': ['q1', 'qé2', 'q3 \\"quoted\\"'],
+    'count': 12345,
+}
+
+
+@pytest.mark.parametrize('chunk_size', [1, 2, 7, 65536])
+@pytest.mark.parametrize('key', ['questions', 'answers', 'numbers', 'count'])
+def test_jsonstream_array(chunk_size, key):
+    stream = JsonStream(io.StringIO(json.dumps(DOCUMENT)), chunk_size)
+    value = DOCUMENT[key]
+    expected = value if isinstance(value, list) else []
+    assert list(stream.array(key)) == expected
+
+
+def test_jsonstream_missing_key():
+    stream = JsonStream(io.StringIO(json.dumps(DOCUMENT)), 3)
+    assert list(stream.array('missing')) == []
+
+
+@pytest.mark.parametrize('text', ['', '{"questions": [1, 2', '[1, 2]'])
+def test_jsonstream_invalid(text):
+    stream = JsonStream(io.StringIO(text), 4)
+    with pytest.raises(json.decoder.JSONDecodeError):
+        list(stream.array('questions'))
@@ -1,5 +1,7 @@
+import json
 import pytest
-from main import main
+from main import batch, main
+from viewer import Viewer
 
 
 def gen_str(inputs):
@@ -7,6 +9,18 @@ def gen_str(inputs):
         yield input
 
 
+def typed(gen):
+    """Returns an input() replacement echoing the entered values like a
+    terminal."""
+
+    def read(prompt):
+        value = next(gen)
+        print(value)
+        return value
+
+    return read
+
+
 @pytest.mark.parametrize('inputs, result', [
     ([
         'questions.json',
@@ -36,7 +50,7 @@ def gen_str(inputs):
 ])
 def test_main(monkeypatch, inputs, result, capsys):
     gen = gen_str(inputs)
-    monkeypatch.setattr('builtins.input', lambda _: next(gen))
+    monkeypatch.setattr('builtins.input', typed(gen))
     main()
     captured = capsys.readouterr()
     assert captured.out.rsplit('\n', 2)[1] ==\
@@ -65,10 +79,10 @@ def test_main(monkeypatch, inputs, result, capsys):
 ])
 def test_main_viewer_print_error(monkeypatch, inputs, result, capsys):
     gen = gen_str(inputs)
-    monkeypatch.setattr('builtins.input', lambda _: next(gen))
+    monkeypatch.setattr('builtins.input', typed(gen))
     main()
     captured = capsys.readouterr()
-    assert captured.out.rsplit('\n', 3)[1] == result
+    assert captured.out.rsplit('\n', 4)[1] == result
 
 
 @pytest.mark.parametrize('inputs, result', [
@@ -80,7 +94,51 @@ def test_main_viewer_print_error(monkeypatch, inputs, result, capsys):
 ])
 def test_main_viewer_print_error_2(monkeypatch, inputs, result, capsys):
     gen = gen_str(inputs)
-    monkeypatch.setattr('builtins.input', lambda _: next(gen))
+    monkeypatch.setattr('builtins.input', typed(gen))
     main()
     captured = capsys.readouterr()
-    assert captured.out == result
+    assert captured.out == (
+        f'{Viewer.FILE_PROMPT}{inputs[0]}\n{result}'
+        f'{Viewer.FILE_PROMPT}exit\n'
+    )
+
+
+def test_main_batch(tmp_path):
+    sessions = tmp_path / 'sessions'
+    sessions.mkdir()
+    with open(sessions / 'human.json', 'w') as f:
+        json.dump({
+            'answers': ['1'],
+            'respiration': ['14'],
+            'heart_rate': ['70'],
+            'blushing_level': ['3'],
+            'pupillary_dilation': ['4'],
+        }, f)
+    with open(sessions / 'broken.json', 'w') as f:
+        f.write('{')
+    output = tmp_path / 'verdicts.txt'
+    batch([str(sessions), '-o', str(output)])
+    assert output.read_text().splitlines() == [
+        f'{sessions / "broken.json"}\terror\tINVALID_FILE',
+        f'{sessions / "human.json"}\thuman',
+    ]
+
+
+def test_main_batch_rules(tmp_path):
+    session = tmp_path / 'session.json'
+    with open(session, 'w') as f:
+        json.dump({
+            'answers': ['1'],
+            'respiration': ['20'],
+            'heart_rate': ['70'],
+            'blushing_level': ['3'],
+            'pupillary_dilation': ['4'],
+        }, f)
+    rules = tmp_path / 'rules.json'
+    with open(rules, 'w') as f:
+        json.dump({'threshold': 0.75}, f)
+    output = tmp_path / 'verdicts.txt'
+    batch([str(session), '-o', str(output)])
+    assert output.read_text() == f'{session}\treplicant\n'
+    batch([str(session), '-o', str(output), '--rules', str(rules)])
+    assert output.read_text() == f'{session}\thuman\n'
@@ -0,0 +1,59 @@
+import json
+import pytest
+from main import main
+from metrics import Metrics, metrics
+from questionbank import QuestionBank
+
+
+@pytest.fixture
+def enabled_metrics(tmp_path, monkeypatch):
+    metrics.reset()
+    metrics.enable()
+    monkeypatch.setattr(metrics, 'file_name', str(tmp_path / 'metrics.json'))
+    yield metrics
+    metrics.disable()
+    metrics.reset()
+
+
+def test_metrics_disabled():
+    local = Metrics()
+    with local.phase('parse'):
+        pass
+    assert local.phase('parse') is local.phase('scoring')
+    assert local.phases == {}
+    local.write('unused.json')
+
+
+def test_metrics_session(enabled_metrics, monkeypatch, capsys):
+    QuestionBank.clear_cache()
+    inputs = iter(
+        ['questions.json', 'asdf', '1', '14', '300', '70', '3', '4'] +
+        ['1', '14', '70', '3', '4'] * 9
+    )
+    monkeypatch.setattr('builtins.input', lambda _: next(inputs))
+    main()
+    snapshot = json.loads(open(enabled_metrics.file_name).read())
+    assert snapshot['counters']['question_bank_parses'] == 1
+    assert snapshot['counters']['readings'] == 10
+    assert snapshot['counters']['validation_failures'] == {
+        'INVALID_INPUT': 1,
+        'INVALID_HEART_RATE': 1,
+    }
+    for phase in ('parse', 'file_check', 'input_wait', 'validation',
+                  'interview', 'scoring'):
+        assert snapshot['phases'][phase]['calls'] >= 1
+    assert snapshot['readings_per_second'] > 0
+
+
+def test_metrics_prometheus():
+    local = Metrics()
+    local.enable()
+    local.add_time('interview', 2.0)
+    local.count('readings', amount=10)
+    local.count('validation_failures', 'INVALID_INPUT')
+    text = local.to_prometheus()
+    assert 'voight_kampff_phase_calls_total{phase="interview"} 1\n' in text
+    assert 'voight_kampff_readings_total 10\n' in text
+    assert ('voight_kampff_validation_failures_total{code="INVALID_INPUT"} 1'
+            in text)
+    assert 'voight_kampff_readings_per_second 5.0\n' in text
@@ -0,0 +1,77 @@
+import json
+import multiprocessing
+import os
+import pytest
+from concurrent.futures.process import BrokenProcessPool
+from checkdata import CheckData
+from parallelscorer import ParallelScorer
+from sessionscorer import SessionScorer
+
+
+def write_sessions(tmp_path, count):
+    file_names = []
+    for i in range(count):
+        file_name = str(tmp_path / f'session{i:02}.json')
+        with open(file_name, 'w') as f:
+            if i % 5 == 4:
+                f.write('{"answers": ')
+            else:
+                json.dump({
+                    'answers': ['1'],
+                    'respiration': [str(10 + i % 4)],
+                    'heart_rate': ['70'],
+                    'blushing_level': ['3'],
+                    'pupillary_dilation': ['4'],
+                }, f)
+        file_names.append(file_name)
+    return file_names
+
+
+@pytest.mark.parametrize('workers, ordered', [
+    (0, True), (2, True), (2, False)
+])
+def test_parallel_scorer(tmp_path, workers, ordered):
+    file_names = write_sessions(tmp_path, 20)
+    scorer = ParallelScorer(workers, chunk_size=3, ordered=ordered)
+    results = list(scorer.score_files(file_names))
+    if ordered:
+        assert [result.file_name for result in results] == file_names
+    results.sort()
+    for i, result in enumerate(results):
+        if i % 5 == 4:
+            assert result.error == CheckData.ErrorCheckData.INVALID_FILE
+        else:
+            assert result.verdict == ('human' if i % 4 >= 2 else 'replicant')
+    assert scorer.sessions == 20
+    assert scorer.errors == 4
+    assert scorer.throughput() > 0
+    assert 'Scored 20 sessions (4 invalid)' in scorer.report()
+
+
+def test_parallel_scorer_chunk_size():
+    with pytest.raises(ValueError):
+        ParallelScorer(chunk_size=0)
+
+
+@pytest.mark.skipif(
+    multiprocessing.get_start_method() != 'fork',
+    reason='the workers must inherit the patched scorer'
+)
+def test_parallel_scorer_worker_died(tmp_path, monkeypatch):
+    file_names = write_sessions(tmp_path, 4)
+    poison = str(tmp_path / 'poison.json')
+    score_file = SessionScorer.score_file
+
+    def dying_score_file(scorer, file_name):
+        if file_name == poison:
+            os._exit(1)
+        return score_file(scorer, file_name)
+
+    monkeypatch.setattr(SessionScorer, 'score_file', dying_score_file)
+    scorer = ParallelScorer(1, chunk_size=2)
+    results = []
+    with pytest.raises(BrokenProcessPool, match='poison.json'):
+        for result in scorer.score_files(file_names + [poison]):
+            results.append(result)
+    assert scorer.sessions == len(results) == 4
+    assert scorer.elapsed > 0
@@ -0,0 +1,77 @@
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from questionbank import QuestionBank
+
+
+def write_bank(path, questions, answers):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'questions': questions, 'answers': answers}, f)
+
+
+def test_questionbank_parsed_once():
+    QuestionBank.clear_cache()
+    bank = QuestionBank.load('questions.json')
+    assert QuestionBank.load('questions.json') is bank
+    with open('questions.json', 'r', encoding='utf-8') as f:
+        dict_from_json = json.load(f)
+    assert bank.questions == dict_from_json.get('questions')
+    assert bank.answers == dict_from_json.get('answers')
+
+
+def test_questionbank_reload_changed_file(tmp_path):
+    file_name = str(tmp_path / 'bank.json')
+    write_bank(file_name, ['q1'], [['a1']])
+    bank = QuestionBank.load(file_name)
+    write_bank(file_name, ['q1', 'q2'], [['a1'], ['a2']])
+    stat = os.stat(file_name)
+    os.utime(file_name, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    changed = QuestionBank.load(file_name)
+    assert changed is not bank
+    assert changed.questions == ['q1', 'q2']
+
+
+def test_questionbank_lru_eviction(tmp_path, monkeypatch):
+    QuestionBank.clear_cache()
+    monkeypatch.setattr(QuestionBank, 'cache_size', 2)
+    names = []
+    for i in range(3):
+        names.append(str(tmp_path / f'bank{i}.json'))
+        write_bank(names[i], [f'q{i}'], [[f'a{i}']])
+    first = QuestionBank.load(names[0])
+    QuestionBank.load(names[1])
+    assert QuestionBank.load(names[0]) is first
+    QuestionBank.load(names[2])
+    assert QuestionBank.load(names[0]) is first
+    assert len(QuestionBank._cache) == 2
+
+
+def test_questionbank_threads(tmp_path, monkeypatch):
+    QuestionBank.clear_cache()
+    monkeypatch.setattr(QuestionBank, 'cache_size', 2)
+    names = []
+    for i in range(4):
+        names.append(str(tmp_path / f'bank{i}.json'))
+        write_bank(names[i], [f'q{i}'], [[f'a{i}']])
+    with ThreadPoolExecutor(8) as executor:
+        banks = list(executor.map(QuestionBank.load, names * 50))
+    assert [bank.questions for bank in banks] ==\
+        [[f'q{i}'] for i in range(4)] * 50
+    assert len(QuestionBank._cache) == 2
+
+
+def test_questionbank_empty():
+    assert QuestionBank.load('questionstest.json').empty()
+    assert not QuestionBank.load('questions.json').empty()
+
+
+def test_questionbank_index_and_sample():
+    bank = QuestionBank.load('questions.json')
+    assert len(bank) == len(bank.questions)
+    assert bank[0] == (bank.questions[0], bank.answers[0])
+    assert bank[-1] == (bank.questions[-1], bank.answers[-1])
+    sample = bank.sample(3, seed=1)
+    assert len(sample) == 3
+    assert sample == bank.sample(3, seed=1)
+    assert all(item in list(bank.pairs()) for item in sample)
+    assert sorted(bank.sample(100, seed=2)) == sorted(bank.pairs())
@@ -26,3 +26,40 @@ def test_reader_answers():
         questions_from_json
     ):
         assert question_from_reader == question_from_json
+
+
+def test_reader_stream_items():
+    file_name = 'questions.json'
+    with open(file_name, 'r') as f:
+        dict_from_json = json.load(f)
+    reader = Reader(file_name, stream=True, chunk_size=64)
+    assert list(reader.items()) == list(zip(
+        dict_from_json.get('questions'),
+        dict_from_json.get('answers')
+    ))
+
+
+def test_reader_paired_items(tmp_path):
+    file_name = str(tmp_path / 'questions.jsonl')
+    with open(file_name, 'w', encoding='utf-8') as f:
+        f.write(json.dumps({'question': 'q1', 'answers': ['a', 'b']}) + '\n')
+        f.write('\n')
+        f.write(json.dumps({'question': 'q2', 'answers': ['c', 'd']}) + '\n')
+    reader = Reader(file_name)
+    assert reader.paired()
+    assert list(reader.items()) == [('q1', ['a', 'b']), ('q2', ['c', 'd'])]
+    assert list(reader.questions()) == ['q1', 'q2']
+
+
+def test_reader_sample_paired(tmp_path):
+    file_name = str(tmp_path / 'bank.jsonl')
+    with open(file_name, 'w', encoding='utf-8') as f:
+        for i in range(20):
+            f.write(json.dumps({'question': f'q{i}', 'answers': [str(i)]}))
+            f.write('\n\n')
+    reader = Reader(file_name)
+    sample = reader.sample(5, seed=3)
+    assert sample == reader.sample(5, seed=3)
+    assert len(set(question for question, _ in sample)) == 5
+    assert all(answers == [question[1:]] for question, answers in sample)
+    assert sorted(reader.sample(50, seed=0)) == sorted(reader.items())
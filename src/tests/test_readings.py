@@ -0,0 +1,67 @@
+import pytest
+from readings import Reading, ReadingBuffer
+from voightkampfftest import VoightKampffTest
+
+
+def test_reading_slots():
+    reading = Reading(14.5, 70, 3, 4)
+    assert tuple(reading) == (14.5, 70, 3, 4)
+    with pytest.raises(AttributeError):
+        reading.extra = 1
+
+
+def test_reading_buffer_columns():
+    buffer = ReadingBuffer()
+    for i in range(100):
+        buffer.append(Reading(12.0 + i / 10, 60 + i, i % 6, 1 + i % 15))
+    buffer.respiration.append(13.0)
+    assert len(buffer) == 100
+    assert buffer[-1] == Reading(12.0 + 99 / 10, 159, 99 % 6, 1 + 99 % 15)
+    respiration, heart_rate, blushing_level, pupillary = buffer.columns()
+    assert respiration.format == 'd' and len(respiration) == 100
+    assert heart_rate.tolist() == list(range(60, 160))
+    assert buffer.nbytes() == 101 * 8 + 3 * 100
+
+
+def test_reading_buffer_overflow():
+    with pytest.raises(OverflowError):
+        ReadingBuffer().append(Reading(12.0, 300, 3, 4))
+
+
+@pytest.mark.parametrize('reading', [
+    Reading(14.0, 300, 3, 4),
+    Reading(14.0, 70, 3, 4.0),
+    Reading('14', 70, 3, 4),
+])
+def test_reading_buffer_rejected_reading(reading):
+    buffer = ReadingBuffer()
+    buffer.append(Reading(13.0, 80, 2, 5))
+    with pytest.raises((OverflowError, TypeError)):
+        buffer.append(reading)
+    buffer.append(Reading(20.0, 70, 3, 4))
+    assert list(buffer) == [Reading(13.0, 80, 2, 5), Reading(20.0, 70, 3, 4)]
+    assert buffer.nbytes() == 2 * 8 + 3 * 2
+
+
+def test_voightkampfftest_add_columns_rejected():
+    test = VoightKampffTest()
+    test.add_columns([14.0], [70], [3], [4])
+    with pytest.raises(OverflowError):
+        test.add_columns([14.0, 15.0], [70, 80], [3, 3], [4, 400])
+    assert list(test.readings) == [Reading(14.0, 70, 3, 4)]
+    assert test.get_coefficient() == 1.0
+
+
+def test_voightkampfftest_add_on_buffer():
+    test = VoightKampffTest()
+    test.add_respiration(14.0)
+    test.add_heart_rate(70)
+    test.add_blushing_level(3)
+    assert len(test.readings) == 0
+    test.add_pupillary_dilation(4)
+    test.add_reading(Reading(13.0, 80, 2, 5))
+    assert list(test.readings) == [
+        Reading(14.0, 70, 3, 4),
+        Reading(13.0, 80, 2, 5)
+    ]
+    assert test.get_result() == 'human'
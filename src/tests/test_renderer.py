@@ -0,0 +1,61 @@
+import io
+from renderer import Renderer
+from viewer import Viewer
+
+
+class CountingStream(io.StringIO):
+    def __init__(self):
+        super().__init__()
+        self.writes = 0
+        self.flushes = 0
+
+    def write(self, text):
+        self.writes += 1
+        return super().write(text)
+
+    def flush(self):
+        self.flushes += 1
+        super().flush()
+
+
+def test_renderer_single_write():
+    output = CountingStream()
+    renderer = Renderer(output)
+    renderer.question('Why?', ['Because', 'No reason', 'Maybe', 'Later'])
+    assert output.writes == 1
+    assert output.flushes == 1
+    assert output.getvalue() == Viewer.format_question(
+        'Why?', ['Because', 'No reason', 'Maybe', 'Later']
+    ) + '\n'
+    renderer.line('first', 'second')
+    assert output.writes == 2
+    assert output.getvalue().endswith('first\nsecond\n')
+
+
+def test_renderer_cache():
+    Renderer.clear_cache()
+    screen = Renderer().question_screen('Why?', ['Yes', 'No'])
+    assert Renderer().question_screen('Why?', ['Yes', 'No']) is screen
+    compact = Renderer(compact=True).question_screen('Why?', ['Yes', 'No'])
+    assert compact == 'Why?\n1. Yes\n2. No\n'
+    assert len(Renderer._cache) == 2
+
+
+def test_renderer_cache_size(monkeypatch):
+    Renderer.clear_cache()
+    monkeypatch.setattr(Renderer, 'cache_size', 2)
+    renderer = Renderer()
+    for question in ('q1', 'q2', 'q3'):
+        renderer.question_screen(question, ['a'])
+    assert [key[1] for key in Renderer._cache] == ['q2', 'q3']
+
+
+def test_viewer_compact(monkeypatch, capsys):
+    inputs = iter(['questions.json', 'exit'])
+    monkeypatch.setattr('builtins.input', lambda _: next(inputs))
+    viewer = Viewer(compact=True)
+    viewer.ask_file_name()
+    viewer.testing()
+    captured = capsys.readouterr()
+    assert not captured.out.startswith('Question: ')
+    assert '\n1. ' in captured.out
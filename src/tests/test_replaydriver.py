@@ -0,0 +1,53 @@
+import pytest
+from replaydriver import ReplayDriver, percentile, replay_script
+
+
+HUMAN = '\n'.join(
+    ['questions.json'] + ['1', '14', '70', '2', '4'] * 10
+) + '\n'
+REPLICANT = '\n'.join(
+    ['questions.json'] + ['1', '30', '30', '0', '1'] * 10
+) + '\n'
+
+
+def test_replay_script():
+    result = replay_script('human', HUMAN)
+    assert result.verdict == 'human'
+    assert result.inputs == 51
+    assert result.latency > 0
+    result = replay_script('exit', 'questions.json\n1\nexit\n')
+    assert result.verdict is None
+    assert result.inputs == 3
+
+
+def test_percentile():
+    values = list(range(1, 101))
+    assert percentile(values, 50) == 50
+    assert percentile(values, 99) == 99
+    assert percentile([7], 90) == 7
+    assert percentile([], 50) == 0.0
+
+
+@pytest.mark.parametrize('workers', [0, 2])
+def test_replay_driver(tmp_path, workers):
+    scripts = []
+    for name, script in (('human', HUMAN), ('replicant', REPLICANT)):
+        file_name = tmp_path / f'{name}.txt'
+        file_name.write_text(script)
+        scripts.append(str(file_name))
+    driver = ReplayDriver(workers, chunk_size=3, repeat=4)
+    results = driver.run(scripts)
+    assert [result.verdict for result in results] ==\
+        ['human', 'replicant'] * 4
+    assert driver.sessions == driver.completed == 8
+    assert driver.latencies == sorted(driver.latencies)
+    assert driver.throughput() > 0
+    assert set(driver.percentiles()) == {50, 90, 99}
+    assert driver.report().startswith('Replayed 8 sessions (8 completed)')
+
+
+def test_replay_driver_invalid():
+    with pytest.raises(ValueError):
+        ReplayDriver(chunk_size=0)
+    with pytest.raises(ValueError):
+        ReplayDriver(repeat=0)
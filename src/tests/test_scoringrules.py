@@ -0,0 +1,118 @@
+import json
+import pytest
+from array import array
+from readings import Reading
+from scoringrules import ScoringRules
+from sessionscorer import SessionScorer
+from voightkampfftest import VoightKampffTest
+
+
+def write_rules(path, ruleset):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(ruleset, f)
+    return str(path)
+
+
+def test_scoring_rules_default_file():
+    rules = ScoringRules.load('rules.json')
+    assert rules.to_dict() == ScoringRules.DEFAULT.to_dict()
+    assert rules.tables == ScoringRules.DEFAULT.tables
+
+
+@pytest.mark.parametrize('reading', [
+    (12.0, 60, 2, 2),
+    (16.0, 100, 4, 8),
+    (11.9, 59, 1, 1),
+    (16.1, 101, 5, 9),
+    (14.0, 0, 255, 5),
+])
+def test_scoring_rules_count(reading):
+    rules = ScoringRules.DEFAULT
+    assert rules.count(*reading) == sum(rules.is_normal(*reading))
+    assert rules.count_columns(*([value] for value in reading)) ==\
+        rules.count(*reading)
+
+
+def test_scoring_rules_load(tmp_path):
+    rules = ScoringRules.load(write_rules(tmp_path / 'rules.json', {
+        'version': '2',
+        'threshold': 0.5,
+        'ranges': {'heart_rate': [50, 120]},
+    }))
+    assert rules.version == '2'
+    assert rules.heart_rate == (50, 120)
+    assert rules.respiration == ScoringRules.DEFAULT.respiration
+    test = VoightKampffTest(rules)
+    test.add_reading(Reading(20.0, 110, 3, 9))
+    assert test.get_coefficient() == 0.5
+    assert test.get_verdict() == 'human'
+    assert VoightKampffTest().is_human_value(20.0, 110, 3, 9) ==\
+        (False, False, True, False)
+
+
+@pytest.mark.parametrize('ruleset', [
+    [],
+    {'threshold': 2},
+    {'threshold': True},
+    {'ranges': {'heart_rate': [100, 60]}},
+    {'ranges': {'heart_rate': 60}},
+    {'ranges': {'heart_rate': ['60', '100']}},
+    {'ranges': {'temperature': [36, 37]}},
+])
+def test_scoring_rules_invalid(tmp_path, ruleset):
+    with pytest.raises(ValueError):
+        ScoringRules.load(write_rules(tmp_path / 'rules.json', ruleset))
+
+
+def test_scoring_rules_ab(tmp_path):
+    session = tmp_path / 'session.json'
+    with open(session, 'w') as f:
+        json.dump({
+            'answers': ['1', '2'],
+            'respiration': ['20', '14'],
+            'heart_rate': ['70', '80'],
+            'blushing_level': ['3', '3'],
+            'pupillary_dilation': ['4', '4'],
+        }, f)
+    loose = ScoringRules(threshold=0.8)
+    assert SessionScorer().score_file(str(session)).verdict == 'replicant'
+    assert SessionScorer(loose).score_file(str(session)).verdict == 'human'
+
+
+def test_scoring_rules_masks():
+    rules = ScoringRules.DEFAULT
+    for heart in range(30, 201):
+        for blushing in range(6):
+            for pupillary in range(1, 16):
+                reading = (14.0, heart, blushing, pupillary)
+                flags = rules.is_normal(*reading)
+                mask = rules.mask(*reading)
+                assert flags == tuple(
+                    bool(mask & bit) for bit in (
+                        rules.RESPIRATION_BIT,
+                        rules.HEART_RATE_BIT,
+                        rules.BLUSHING_LEVEL_BIT,
+                        rules.PUPILLARY_DILATION_BIT
+                    )
+                )
+                assert rules.count(*reading) == sum(flags)
+
+
+def test_scoring_rules_count_columns_matches_rows():
+    columns = (
+        array('d', [11.0, 12.0, 14.5, 16.0, 17.0]),
+        array('B', [30, 60, 80, 100, 200]),
+        array('B', [0, 2, 3, 4, 5]),
+        array('B', [1, 2, 5, 8, 15]),
+    )
+    rules = ScoringRules(respiration=(11.0, 14.5), pupillary_dilation=(5, 15))
+    test = VoightKampffTest(rules)
+    for reading in zip(*columns):
+        test.add_reading(Reading(*reading))
+    assert rules.count_columns(*columns) == test.normal_count
+    assert rules.count_columns(*(list(column) for column in columns)) ==\
+        test.normal_count
+    assert list(rules.mask_columns(*columns)) == [
+        rules.mask(*reading) for reading in zip(*columns)
+    ]
+    assert rules.mask_columns(*(array('B') for _ in range(4))) == b''
@@ -0,0 +1,121 @@
+import io
+import socket
+import threading
+import pytest
+from readings import Reading
+from sensorstream import RingBuffer, SensorStream, open_source
+
+
+def samples(start, end, respiration, heart_rate, blushing, pupillary):
+    lines = []
+    for i in range(start, end):
+        t = i / 1000
+        lines.append(f'{t:.3f} respiration {respiration}')
+        lines.append(f'{t:.3f} heart_rate {heart_rate}')
+        lines.append(f'{t:.3f} blushing_level {blushing}')
+        lines.append(f'{t:.3f} pupillary_dilation {pupillary}')
+    return lines
+
+
+def test_ring_buffer_window():
+    buffer = RingBuffer(4)
+    for i in range(10):
+        buffer.append(float(i), float(i * 10))
+    assert len(buffer) == 4
+    assert list(buffer.window(5.0, 8.0)) == [80.0, 70.0, 60.0]
+    assert list(buffer.window(-1.0, 100.0)) == [90.0, 80.0, 70.0, 60.0]
+    assert buffer.mean(7.0, 9.0) == 85.0
+    assert buffer.mean(9.0, 10.0) is None
+    with pytest.raises(ValueError):
+        RingBuffer(0)
+
+
+def test_sensor_stream_windows():
+    stream = SensorStream(capacity=1024)
+    lines = samples(0, 500, 14.0, 80, 3, 5) + ['0.499 mark']
+    lines += samples(500, 1000, 30.0, 30, 0, 1) + ['0.999 mark']
+    assert stream.feed(lines) == 2
+    assert list(stream.test.readings) == [
+        Reading(14.0, 80, 3, 5), Reading(30.0, 30, 0, 1)
+    ]
+    assert stream.samples == 4000
+    assert stream.test.get_verdict() == 'replicant'
+
+
+def test_sensor_stream_aggregates_and_errors():
+    stream = SensorStream()
+    added = stream.feed(io.StringIO('\n'.join([
+        '0.1 respiration 13.0',
+        '0.2 respiration 15.0',
+        '0.1 heart_rate 70',
+        '0.2 heart_rate 75',
+        '0.1 blushing_level 2',
+        '0.1 pupillary_dilation 4',
+        '0.2 temperature 36.6',
+        '0.2 heart_rate nan',
+        'garbage',
+        '',
+        '0.3 mark',
+        '0.4 respiration 14.0',
+        '0.5 mark',
+    ])))
+    assert added == 1
+    assert list(stream.test.readings) == [Reading(14.0, 72, 2, 4)]
+    assert stream.errors == 3
+    assert stream.incomplete == 1
+
+
+def test_sensor_stream_late_sample():
+    stream = SensorStream()
+    stream.feed([
+        '0.1 respiration 13.0',
+        '0.3 respiration 15.0',
+        '0.2 respiration 90.0',
+        '0.4 respiration 17.0',
+        '0.4 heart_rate 70',
+        '0.4 blushing_level 2',
+        '0.4 pupillary_dilation 4',
+        '0.5 mark',
+    ])
+    assert list(stream.test.readings) == [Reading(15.0, 70, 2, 4)]
+    assert stream.errors == 1
+    assert stream.samples == 6
+    buffer = RingBuffer(2)
+    buffer.append(1.0, 1.0)
+    with pytest.raises(ValueError):
+        buffer.append(0.5, 2.0)
+    assert list(buffer.window(0.0, 2.0)) == [1.0]
+
+
+def test_sensor_stream_constant_memory():
+    stream = SensorStream(capacity=256)
+    for second in range(5):
+        stream.feed(samples(second * 1000, (second + 1) * 1000, 14, 80, 3, 5))
+        stream.feed([f'{second + 0.999:.3f} mark'])
+    assert all(len(buffer) == 256 for buffer in stream.buffers.values())
+    assert all(
+        len(buffer.values) == 256 for buffer in stream.buffers.values()
+    )
+    assert stream.test.scored_count == 5
+
+
+def test_sensor_stream_unix_socket(tmp_path):
+    path = str(tmp_path / 'sensors.sock')
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(path)
+    server.listen(1)
+
+    def send():
+        connection, _ = server.accept()
+        with connection:
+            data = samples(0, 10, 14.0, 80, 3, 5) + ['0.009 mark']
+            connection.sendall(('\n'.join(data) + '\n').encode('utf-8'))
+
+    thread = threading.Thread(target=send)
+    thread.start()
+    stream = SensorStream()
+    with open_source('unix:' + path) as lines:
+        assert stream.feed(lines) == 1
+    thread.join()
+    server.close()
+    assert stream.test.get_verdict() == 'human'
@@ -0,0 +1,124 @@
+import pytest
+from main import main
+from reader import Reader
+from readings import Reading
+from sessionlog import SessionLog
+from viewer import Viewer
+from voightkampfftest import VoightKampffTest
+
+
+def gen_str(inputs):
+    for input in inputs:
+        yield input
+
+
+def test_session_log_replay(tmp_path):
+    file_name = str(tmp_path / 'session.vksl')
+    readings = [
+        Reading(14.5, 80, 3, 5),
+        Reading(30.0, 30, 0, 1),
+        Reading(12.0, 100, 4, 2),
+    ]
+    with SessionLog(file_name, 'questions.json', sync_every=2) as log:
+        for answer, reading in enumerate(readings, 1):
+            log.append(answer, reading)
+    replay = SessionLog.replay(file_name)
+    assert replay.bank_name == 'questions.json'
+    assert list(replay.answers) == [1, 2, 3]
+    assert list(replay.test.readings) == readings
+    expected = VoightKampffTest()
+    for reading in readings:
+        expected.add_reading(reading)
+    assert replay.test.get_coefficient() == expected.get_coefficient()
+
+
+def test_session_log_partial_record(tmp_path):
+    file_name = str(tmp_path / 'session.vksl')
+    with SessionLog(file_name, 'questions.json') as log:
+        log.append(1, Reading(14.5, 80, 3, 5))
+    with open(file_name, 'ab') as f:
+        f.write(b'\x02\x00\x00')
+    assert len(SessionLog.replay(file_name).answers) == 1
+    with SessionLog(file_name) as log:
+        assert log.bank_name == 'questions.json'
+        assert log.count == 1
+        log.append(2, Reading(13.0, 70, 2, 4))
+    assert list(SessionLog.replay(file_name).answers) == [1, 2]
+
+
+def test_session_log_invalid(tmp_path):
+    file_name = str(tmp_path / 'session.vksl')
+    with open(file_name, 'wb') as f:
+        f.write(b'JSON' + bytes(10))
+    with pytest.raises(ValueError):
+        SessionLog.replay(file_name)
+
+
+def test_viewer_resume(monkeypatch, capsys, tmp_path):
+    log_name = str(tmp_path / 'session.vksl')
+    gen = gen_str(['questions.json', '1', '14', '80', '3', '5', '2', 'exit'])
+    monkeypatch.setattr('builtins.input', lambda _: next(gen))
+    viewer = Viewer(log_name=log_name)
+    assert not viewer.resume()
+    viewer.ask_file_name()
+    viewer.testing()
+    count = viewer.reader.count()
+    gen = gen_str(['1', '14', '80', '3', '5'] * (count - 1))
+    capsys.readouterr()
+    resumed = Viewer(log_name=log_name)
+    assert resumed.resume()
+    assert resumed.file_name == 'questions.json'
+    resumed.testing()
+    resumed.print_result_test()
+    captured = capsys.readouterr()
+    assert captured.out.count('Question: ') == count - 1
+    assert captured.out.rsplit('\n', 2)[1] == "TEST SUBJECT'S IS HUMAN"
+    assert len(SessionLog.replay(log_name).answers) == count
+    assert SessionLog.replay(log_name).finished
+    assert not Viewer(log_name=log_name).resume()
+
+
+def test_main_resume(monkeypatch, capsys, tmp_path):
+    log_name = str(tmp_path / 'session.vksl')
+    gen = gen_str(['questions.json', '1', '14', '80', '3', '5', 'exit'])
+    monkeypatch.setattr('builtins.input', lambda _: next(gen))
+    main(log_name)
+    assert len(SessionLog.replay(log_name).answers) == 1
+    count = Reader('questions.json').count()
+    gen = gen_str(['1', '14', '80', '3', '5'] * (count - 1))
+    capsys.readouterr()
+    main(log_name)
+    captured = capsys.readouterr()
+    assert captured.out.count('Question: ') == count - 1
+    assert captured.out.rsplit('\n', 2)[1] == "TEST SUBJECT'S IS HUMAN"
+    assert SessionLog.replay(log_name).finished
+
+
+def test_session_log_written_before_close(tmp_path):
+    file_name = str(tmp_path / 'session.vksl')
+    log = SessionLog(file_name, 'questions.json')
+    for answer in range(1, 11):
+        log.append(answer % 4 + 1, Reading(14.5, 80, 3, 5))
+    assert len(SessionLog.replay(file_name).answers) == 10
+    assert not SessionLog.replay(file_name).finished
+    log.finish()
+    replay = SessionLog.replay(file_name)
+    assert replay.finished
+    assert len(replay.answers) == 10
+    with SessionLog(file_name, 'other.json', append=False) as log:
+        assert log.count == 0
+    assert SessionLog.replay(file_name).bank_name == 'other.json'
+
+
+def test_viewer_new_log(monkeypatch, tmp_path):
+    log_name = str(tmp_path / 'session.vksl')
+    with SessionLog(log_name, 'questions.json') as log:
+        log.append(1, Reading(30.0, 30, 0, 1))
+    gen = gen_str(['questions.json', '1', '14', '80', '3', '5', '2', 'exit'])
+    monkeypatch.setattr('builtins.input', lambda _: next(gen))
+    viewer = Viewer(log_name=log_name)
+    viewer.ask_file_name()
+    viewer.testing()
+    replay = SessionLog.replay(log_name)
+    assert list(replay.test.readings) == [Reading(14.0, 80, 3, 5)]
+    assert not replay.finished
@@ -0,0 +1,74 @@
+import pytest
+from reader import Reader
+from sessionmanager import SessionManager, SessionState
+from viewer import Viewer
+
+
+HUMAN_READING = ['1', '14', '80', '3', '5']
+REPLICANT_READING = ['1', '30', '30', '0', '1']
+
+
+def run_session(manager, session_id, reading):
+    message = manager.open(session_id)
+    for _ in range(len(manager.bank)):
+        for value in reading:
+            message = manager.submit(session_id, value)
+    return message
+
+
+def test_session_manager_interleaved(tmp_path):
+    results = tmp_path / 'results.txt'
+    manager = SessionManager('questions.json', str(results), max_sessions=2)
+    manager.open('a')
+    manager.open('b')
+    with pytest.raises(RuntimeError):
+        manager.open('c')
+    count = Reader('questions.json').count()
+    for _ in range(count):
+        for human, replicant in zip(HUMAN_READING, REPLICANT_READING):
+            last_a = manager.submit('a', human)
+            last_b = manager.submit('b', replicant)
+    assert last_a.endswith("TEST SUBJECT'S IS HUMAN")
+    assert last_b.endswith("TEST SUBJECT'S IS REPLICANT")
+    assert manager.sessions == {}
+    assert manager.completed == 2
+    assert results.read_text() == 'a\thuman\nb\treplicant\n'
+
+
+def test_session_manager_errors_and_exit():
+    manager = SessionManager('questions.json')
+    message = manager.open()
+    assert message.startswith(Viewer.BEGIN_BANNER)
+    session_id = next(iter(manager.sessions))
+    assert manager.submit(session_id, '7').startswith(
+        '\tInvalid input. Try again.'
+    )
+    assert manager.sessions[session_id].step == 0
+    manager.submit(session_id, '2')
+    assert manager.sessions[session_id].step == 1
+    manager.submit(session_id, 'exit')
+    assert session_id not in manager.sessions
+    assert manager.results == {}
+    assert run_session(manager, 'x', HUMAN_READING).endswith('HUMAN')
+    assert manager.results == {'x': 'human'}
+
+
+def test_session_manager_bounded_results():
+    manager = SessionManager('questions.json', max_results=2)
+    for session_id in ('a', 'b', 'c'):
+        run_session(manager, session_id, HUMAN_READING)
+    assert list(manager.results) == ['b', 'c']
+    assert manager.pop_result('b') == 'human'
+    assert manager.pop_result('b') is None
+    assert list(manager.results) == ['c']
+    with pytest.raises(ValueError):
+        SessionManager('questions.json', max_results=0)
+
+
+def test_session_manager_shared_bank_and_memory():
+    first = SessionManager('questions.json')
+    second = SessionManager('questions.json')
+    assert first.bank is second.bank
+    assert not hasattr(SessionState('a'), '__dict__')
+    assert 0 < first.memory_per_session(50) < 4096
+    assert 'bytes per idle session' in first.report()
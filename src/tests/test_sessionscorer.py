@@ -0,0 +1,71 @@
+import json
+import pytest
+from checkdata import CheckData
+from sessionscorer import SessionScorer
+
+
+HUMAN_SESSION = {
+    'answers': ['1', '2', '3'],
+    'respiration': ['14', '15.5', 13],
+    'heart_rate': ['70', 80, '90'],
+    'blushing_level': ['2', '3', '4'],
+    'pupillary_dilation': ['4', '5', '6'],
+}
+
+
+def write_session(path, session):
+    with open(path, 'w', encoding='utf-8') as f:
+        if isinstance(session, str):
+            f.write(session)
+        else:
+            json.dump(session, f)
+    return str(path)
+
+
+@pytest.mark.parametrize('changes, verdict, error', [
+    ({}, 'human', CheckData.ErrorCheckData.NO_ERROR),
+    ({'respiration': ['20', '20', '20']}, 'replicant',
+     CheckData.ErrorCheckData.NO_ERROR),
+    ({'answers': ['1', '5', '1']}, None,
+     CheckData.ErrorCheckData.INVALID_INPUT),
+    ({'heart_rate': ['70', '300', '90']}, None,
+     CheckData.ErrorCheckData.INVALID_HEART_RATE),
+    ({'pupillary_dilation': ['4', '5', 'exit']}, None,
+     CheckData.ErrorCheckData.EXIT),
+    ({'answers': ['1', '2']}, None, CheckData.ErrorCheckData.INVALID_FILE),
+    ({'blushing_level': None}, None, CheckData.ErrorCheckData.INVALID_FILE),
+])
+def test_session_scorer_score_file(tmp_path, changes, verdict, error):
+    session = dict(HUMAN_SESSION, **changes)
+    file_name = write_session(tmp_path / 'session.json', session)
+    result = SessionScorer().score_file(file_name)
+    assert result.verdict == verdict
+    assert result.error == error
+
+
+def test_session_scorer_invalid_files(tmp_path):
+    scorer = SessionScorer()
+    broken = write_session(tmp_path / 'broken.json', '{"answers": [')
+    assert scorer.score_file(broken).error ==\
+        CheckData.ErrorCheckData.INVALID_FILE
+    assert scorer.score_file(str(tmp_path / 'missing.json')).error ==\
+        CheckData.ErrorCheckData.FILE_DOES_NOT_EXIST
+
+
+def test_session_scorer_expand(tmp_path):
+    for name in ('b.json', 'a.json', 'c.txt'):
+        write_session(tmp_path / name, HUMAN_SESSION)
+    assert SessionScorer.expand([str(tmp_path)]) == [
+        str(tmp_path / 'a.json'), str(tmp_path / 'b.json')
+    ]
+    assert SessionScorer.expand([str(tmp_path / '*.txt'), 'x.json']) == [
+        str(tmp_path / 'c.txt'), 'x.json'
+    ]
+
+
+def test_session_scorer_deeply_nested_file(tmp_path):
+    file_name = str(tmp_path / 'nested.json')
+    with open(file_name, 'w') as f:
+        f.write('[' * 200000)
+    result = SessionScorer().score_file(file_name)
+    assert result.error == CheckData.ErrorCheckData.INVALID_FILE
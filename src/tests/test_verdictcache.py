@@ -0,0 +1,182 @@
+import json
+import pytest
+import sqlite3
+from checkdata import CheckData
+from main import batch
+from parallelscorer import ParallelScorer
+from scoringrules import ScoringRules
+from sessionscorer import SessionScorer
+from verdictcache import VerdictCache
+
+
+def write_sessions(directory, count):
+    for i in range(count):
+        with open(directory / f'session{i}.json', 'w') as f:
+            json.dump({
+                'answers': ['1'],
+                'respiration': [str(10 + i)],
+                'heart_rate': ['70'],
+                'blushing_level': ['3'],
+                'pupillary_dilation': ['4'],
+            }, f)
+    with open(directory / 'broken.json', 'w') as f:
+        f.write('{')
+
+
+def test_verdict_cache_get_put(tmp_path):
+    file_name = str(tmp_path / 'cache.sqlite')
+    key = VerdictCache.key(b'session')
+    with VerdictCache(file_name) as cache:
+        assert cache.get(key) is None
+        cache.put(key, 'human', 'NO_ERROR')
+        cache.put(key, 'human', 'NO_ERROR')
+        assert cache.get(key) == ('human', 'NO_ERROR')
+        assert cache.stats() == {
+            'hits': 1, 'misses': 1, 'hit_rate': 0.5, 'entries': 1
+        }
+    with VerdictCache(file_name) as cache:
+        assert cache.entries == 1
+        assert cache.get(key) == ('human', 'NO_ERROR')
+    assert VerdictCache.key(b'session', ScoringRules(threshold=0.5)) != key
+    assert VerdictCache.key(b'session', ScoringRules()) == key
+
+
+def test_verdict_cache_eviction():
+    with VerdictCache(max_entries=2) as cache:
+        keys = [VerdictCache.key(bytes([i])) for i in range(3)]
+        cache.put(keys[0], 'human', 'NO_ERROR')
+        cache.put(keys[1], 'replicant', 'NO_ERROR')
+        cache.get(keys[0])
+        cache.put(keys[2], None, 'INVALID_INPUT')
+        assert cache.entries == 2
+        assert cache.get(keys[1]) is None
+        assert cache.get(keys[0]) == ('human', 'NO_ERROR')
+        assert cache.get(keys[2]) == (None, 'INVALID_INPUT')
+
+
+def test_verdict_cache_session_scorer(tmp_path):
+    write_sessions(tmp_path, 8)
+    file_names = SessionScorer.expand([str(tmp_path)])
+    with VerdictCache() as cache:
+        scorer = SessionScorer(cache=cache)
+        first = list(scorer.score_files(file_names))
+        second = list(scorer.score_files(file_names))
+        assert not any(result.cached for result in first)
+        assert all(result.cached for result in second)
+        assert [result.line() for result in first] ==\
+            [result.line() for result in second]
+        assert second[0].error == CheckData.ErrorCheckData.INVALID_FILE
+        assert cache.stats()['hits'] == 9
+        loose = SessionScorer(ScoringRules(threshold=0.5), cache)
+        assert not any(
+            result.cached for result in loose.score_files(file_names)
+        )
+
+
+def test_verdict_cache_checks_file_format(tmp_path):
+    write_sessions(tmp_path, 1)
+    session = tmp_path / 'session0.json'
+    other = tmp_path / 'session0.txt'
+    other.write_bytes(session.read_bytes())
+    with VerdictCache() as cache:
+        scorer = SessionScorer(cache=cache)
+        assert scorer.score_file(str(session)).verdict == 'replicant'
+        result = scorer.score_file(str(other))
+        assert result.error == CheckData.ErrorCheckData.INVALID_FILE
+        assert not result.cached
+
+
+def test_verdict_cache_parallel(tmp_path):
+    sessions = tmp_path / 'sessions'
+    sessions.mkdir()
+    write_sessions(sessions, 6)
+    cache_name = str(tmp_path / 'cache.sqlite')
+    scorer = ParallelScorer(2, chunk_size=2, cache_name=cache_name)
+    first = list(scorer.score_files(
+        SessionScorer.expand([str(sessions)]) + [str(sessions / 'missing')]
+    ))
+    assert scorer.cache_hits == 0
+    assert scorer.cache_misses == 7
+    assert first[-1].cached is None
+    second = list(scorer.score_files(
+        SessionScorer.expand([str(sessions)]) + [str(sessions / 'missing')]
+    ))
+    assert scorer.cache_hits == 7
+    assert 'cache hits 7, misses 0' in scorer.report()
+    assert [result.line() for result in first] ==\
+        [result.line() for result in second]
+
+
+def test_verdict_cache_opened_once_per_worker(tmp_path, monkeypatch):
+    write_sessions(tmp_path, 6)
+    opened = []
+
+    class CountingCache(VerdictCache):
+        def __init__(self, *args, **kwargs):
+            opened.append(args)
+            super().__init__(*args, **kwargs)
+
+    monkeypatch.setattr('parallelscorer.VerdictCache', CountingCache)
+    cache_name = str(tmp_path / 'cache.sqlite')
+    scorer = ParallelScorer(0, chunk_size=2, cache_name=cache_name)
+    list(scorer.score_files(SessionScorer.expand([str(tmp_path)])))
+    assert len(opened) == 1
+    with VerdictCache(cache_name, max_entries=5) as cache:
+        assert cache.entries == 7
+        cache.put(VerdictCache.key(b'new'), 'human', 'NO_ERROR')
+        cache.commit()
+        assert cache.entries == 5
+    with VerdictCache(cache_name) as cache:
+        assert cache.entries == 5
+
+
+def test_verdict_cache_batch(tmp_path, capsys):
+    sessions = tmp_path / 'sessions'
+    sessions.mkdir()
+    write_sessions(sessions, 3)
+    cache_name = str(tmp_path / 'cache.sqlite')
+    output = tmp_path / 'verdicts.txt'
+    batch([str(sessions), '-o', str(output), '--cache', cache_name])
+    verdicts = output.read_text()
+    batch([
+        str(sessions), '-o', str(output), '--cache', cache_name, '--stats'
+    ])
+    assert output.read_text() == verdicts
+    assert 'cache hits 4, misses 0' in capsys.readouterr().err
+
+
+def test_verdict_cache_shared_file(tmp_path):
+    file_name = str(tmp_path / 'cache.sqlite')
+    keys = [VerdictCache.key(bytes([i])) for i in range(2)]
+    with VerdictCache(file_name, timeout=0.1) as first:
+        first.put(keys[0], 'human', 'NO_ERROR')
+        first.commit()
+        with VerdictCache(file_name, timeout=0.1) as second:
+            assert second.get(keys[0]) == ('human', 'NO_ERROR')
+            assert not second.connection.in_transaction
+            first.put(keys[1], 'replicant', 'NO_ERROR')
+            second.put(keys[1], 'replicant', 'NO_ERROR')
+            assert second.get(keys[1]) == ('replicant', 'NO_ERROR')
+            second.commit()
+        first.commit()
+    with VerdictCache(file_name) as cache:
+        assert cache.entries == 2
+
+
+def test_verdict_cache_locked(tmp_path):
+    file_name = str(tmp_path / 'cache.sqlite')
+    write_sessions(tmp_path, 1)
+    cache = VerdictCache(file_name, timeout=0.1)
+    cache.COMMIT_EVERY = 1
+    lock = sqlite3.connect(file_name)
+    lock.execute('BEGIN IMMEDIATE')
+    try:
+        result = SessionScorer(cache=cache).score_file(
+            str(tmp_path / 'session0.json')
+        )
+        assert result.verdict == 'replicant'
+        with pytest.raises(sqlite3.OperationalError):
+            cache.close()
+    finally:
+        lock.rollback()
+        lock.close()
@@ -0,0 +1,104 @@
+import io
+from checkdata import CheckData
+from viewer import Viewer
+
+
+def gen_str(inputs):
+    for input in inputs:
+        yield input
+
+
+def typed(gen):
+    """Returns an input() replacement echoing the entered values like a
+    terminal."""
+
+    def read(prompt):
+        value = next(gen)
+        print(value)
+        return value
+
+    return read
+
+
+def test_viewer_early_verdict(monkeypatch, capsys):
+    gen = gen_str([
+        'questions.json',
+        '1', '30', '30', '0', '1',
+        '2', '30', '30', '0', '1'
+    ])
+    monkeypatch.setattr('builtins.input', typed(gen))
+    viewer = Viewer(early_verdict=True)
+    viewer.ask_file_name()
+    viewer.testing()
+    viewer.print_result_test()
+    captured = capsys.readouterr()
+    assert captured.out.count('Question: ') == 2
+    assert captured.out.rsplit('\n', 2)[1] == "TEST SUBJECT'S IS REPLICANT"
+
+
+def test_viewer_sample(monkeypatch, capsys):
+    gen = gen_str([
+        'questions.json',
+        '1', '14', '80', '3', '5',
+        '1', '14', '80', '3', '5'
+    ])
+    monkeypatch.setattr('builtins.input', typed(gen))
+    viewer = Viewer(sample=2, seed=7)
+    viewer.ask_file_name()
+    viewer.testing()
+    viewer.print_result_test()
+    captured = capsys.readouterr()
+    expected = [question for question, _ in viewer.reader.sample(2, 7)]
+    assert [
+        line[len('Question: '):]
+        for line in captured.out.splitlines()
+        if line.startswith('Question: ')
+    ] == expected
+    assert captured.out.rsplit('\n', 2)[1] == "TEST SUBJECT'S IS HUMAN"
+
+
+def test_viewer_streams(capsys):
+    keys = io.StringIO('\n'.join([
+        'questions.json',
+        '5', '1', '30', '30', '0', '1',
+    ]) + '\n')
+    output = io.StringIO()
+    viewer = Viewer(sample=1, input_stream=keys, output=output)
+    viewer.run()
+    screen = output.getvalue()
+    assert capsys.readouterr().out == '4\n'
+    assert screen.startswith(Viewer.FILE_PROMPT + Viewer.BEGIN_BANNER)
+    assert Viewer.ERROR_MESSAGES[CheckData.ErrorCheckData.INVALID_INPUT] in\
+        screen
+    assert screen.endswith("TEST SUBJECT'S IS REPLICANT\n")
+    assert keys.read() == ''
+
+
+def test_viewer_streams_end_is_exit():
+    viewer = Viewer(
+        input_stream=io.StringIO('questions.json\n1\n'),
+        output=io.StringIO()
+    )
+    viewer.run()
+    assert viewer.error == CheckData.ErrorCheckData.EXIT
+    assert viewer.test.scored_count == 0
+
+
+def test_viewer_question_and_prompt_in_one_write(monkeypatch):
+    class Output(io.StringIO):
+        def __init__(self):
+            super().__init__()
+            self.writes = []
+
+        def write(self, text):
+            self.writes.append(text)
+            return super().write(text)
+
+    gen = gen_str(['questions.json', '1', '14', '80', '3', 'exit'])
+    monkeypatch.setattr('builtins.input', lambda prompt: next(gen))
+    output = Output()
+    Viewer(output=output).run()
+    questions = [text for text in output.writes if 'Question: ' in text]
+    assert len(questions) == 1
+    assert questions[0].startswith('Question: ')
+    assert questions[0].endswith(Viewer.ANSWER_PROMPT)
@@ -39,3 +39,37 @@ def test_testvoightkampff_get_result(
         test.add_pupillary_dilation(pup)
     answer = test.get_result()
     assert answer == result
+
+
+def test_testvoightkampff_running_coefficient():
+    test = VoightKampffTest()
+    test.add_respiration(14)
+    test.add_heart_rate(70)
+    test.add_blushing_level(3)
+    assert test.scored_count == 0
+    test.add_pupillary_dilation(4)
+    assert test.get_coefficient() == 1.0
+    test.add_respiration(20)
+    test.add_heart_rate(70)
+    test.add_blushing_level(3)
+    test.add_pupillary_dilation(9)
+    assert test.get_coefficient() == 6 / 8
+
+
+@pytest.mark.parametrize('readings, remaining, result', [
+    ([], 3, False),
+    ([(20, 30, 0, 1)], 0, True),
+    ([(20, 30, 0, 1)], 3, True),
+    ([(20, 70, 3, 4)], 1, True),
+    ([(20, 70, 3, 4)], 2, False),
+    ([(14, 70, 3, 4)] * 9, 1, True),
+    ([(14, 70, 3, 4)] * 2, 10, False),
+])
+def test_testvoightkampff_verdict_is_final(readings, remaining, result):
+    test = VoightKampffTest()
+    for resp, heart, blush, pup in readings:
+        test.add_respiration(resp)
+        test.add_heart_rate(heart)
+        test.add_blushing_level(blush)
+        test.add_pupillary_dilation(pup)
+    assert test.verdict_is_final(remaining) == result
@@ -0,0 +1,245 @@
+import hashlib
+import json
+import sqlite3
+from scoringrules import ScoringRules
+
+
+class VerdictCache():
+    """
+    Persistent cache of the results of scored sessions.
+
+    The results are stored in an SQLite database under the SHA-256 hash
+    of the session content and of the scoring rules, so a session is
+    scored again only if its readings or the rules have changed. When
+    the cache is full, the least recently used results are evicted.
+
+    Lookups only read the database. New results and uses of cached
+    results are kept in memory and written in one short transaction by
+    commit, so processes sharing the file hold its write lock only
+    briefly.
+
+    Attributes
+    ----------
+    file_name : str
+        The name of the database file, or ":memory:".
+    max_entries : int
+        Maximum number of results kept.
+    hits : int
+        Number of results found in the cache.
+    misses : int
+        Number of results not found in the cache.
+    entries : int
+        Number of results in the cache. It is counted when the database
+        is opened and then updated from the rows this object inserts and
+        evicts, so results added by other processes are only counted
+        when the database is opened again.
+    committed : int
+        Number of results in the database after the last commit.
+    """
+
+    COMMIT_EVERY = 1000
+
+    def __init__(
+        self,
+        file_name: str = ':memory:',
+        max_entries: int = 1000000,
+        timeout: float = 30.0
+    ) -> None:
+        """
+        Parameters
+        ----------
+        file_name : str
+            The name of the database file. By default the cache is kept
+            in memory.
+        max_entries : int
+            Maximum number of results kept.
+        timeout : float
+            Seconds to wait for a lock held by another process.
+        """
+
+        if max_entries < 1:
+            raise ValueError('max_entries must be positive')
+        self.file_name = file_name
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.pending = dict()
+        self.touched = dict()
+        self.connection = sqlite3.connect(file_name, timeout=timeout)
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute('PRAGMA synchronous=NORMAL')
+        self.connection.execute(
+            'CREATE TABLE IF NOT EXISTS verdicts ('
+            'key BLOB PRIMARY KEY, '
+            'verdict TEXT, '
+            'error TEXT NOT NULL, '
+            'used INTEGER NOT NULL)'
+        )
+        self.connection.execute(
+            'CREATE INDEX IF NOT EXISTS verdicts_used ON verdicts (used)'
+        )
+        self.entries, used = self.connection.execute(
+            'SELECT COUNT(*), MAX(used) FROM verdicts'
+        ).fetchone()
+        self.committed = self.entries
+        self.used = used or 0
+
+    def __enter__(self) -> 'VerdictCache':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    @staticmethod
+    def key(data: bytes, rules: ScoringRules = None) -> bytes:
+        """Returns the key of the session under the rules.
+
+        Parameters
+        ----------
+        data : bytes
+            The content of the session, for example the session file or
+            the columns of the readings.
+        rules : ScoringRules
+            The rules the session is scored with. By default the rules of
+            VoightKampffTest.
+
+        Returns
+        -------
+        bytes
+            The SHA-256 hash of the rules and the session.
+        """
+
+        rules = rules if rules is not None else ScoringRules.DEFAULT
+        digest = hashlib.sha256(
+            json.dumps(rules.to_dict(), sort_keys=True).encode('utf-8')
+        )
+        digest.update(b'\0')
+        digest.update(data)
+        return digest.digest()
+
+    def get(self, key: bytes):
+        """Returns the cached result. The lookup does not write to the
+        database: the use of the result is recorded in memory and written
+        by the next commit.
+
+        Parameters
+        ----------
+        key : bytes
+            The key returned by key().
+
+        Returns
+        -------
+        tuple or None
+            The verdict (None for an invalid session) and the name of the
+            error, or None if the result is not in the cache.
+        """
+
+        row = self.pending.get(key, None)
+        if row is None:
+            row = self.connection.execute(
+                'SELECT verdict, error FROM verdicts WHERE key = ?', (key,)
+            ).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.used += 1
+        self.touched[key] = self.used
+        self._written()
+        return row[:2]
+
+    def put(self, key: bytes, verdict: str, error: str) -> None:
+        """Stores the result until the next commit. If the cache becomes
+        full, the results are committed at once and the least recently
+        used ones are evicted.
+
+        Parameters
+        ----------
+        key : bytes
+            The key returned by key().
+        verdict : str
+            The verdict, or None for an invalid session.
+        error : str
+            The name of the error found in the session.
+        """
+
+        self.used += 1
+        if key not in self.pending and self.connection.execute(
+            'SELECT 1 FROM verdicts WHERE key = ?', (key,)
+        ).fetchone() is None:
+            self.entries += 1
+        self.pending[key] = (verdict, error, self.used)
+        self.touched.pop(key, None)
+        if self.entries > self.max_entries:
+            self.commit()
+        else:
+            self._written()
+
+    def stats(self) -> dict:
+        """Returns the numbers of hits, misses and cached results."""
+
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits/lookups if lookups else 0.0,
+            'entries': self.entries,
+        }
+
+    def commit(self) -> None:
+        """Writes the stored results and the recorded uses to the database
+        in one short transaction and evicts the least recently used
+        results if the cache is full.
+
+        Raises
+        ------
+        sqlite3.OperationalError
+            If the database stays locked by another process for longer
+            than the timeout. The changes are kept for the next commit.
+        """
+
+        if not self.pending and not self.touched:
+            return
+        with self.connection:
+            entries = self.committed + self.connection.executemany(
+                'INSERT OR IGNORE INTO verdicts VALUES (?, ?, ?, ?)',
+                (
+                    (key, verdict, error, used)
+                    for key, (verdict, error, used) in self.pending.items()
+                )
+            ).rowcount
+            self.connection.executemany(
+                'UPDATE verdicts SET verdict = ?, error = ?, '
+                'used = MAX(used, ?) WHERE key = ?',
+                (
+                    (verdict, error, used, key)
+                    for key, (verdict, error, used) in self.pending.items()
+                )
+            )
+            self.connection.executemany(
+                'UPDATE verdicts SET used = MAX(used, ?) WHERE key = ?',
+                ((used, key) for key, used in self.touched.items())
+            )
+            if entries > self.max_entries:
+                entries -= self.connection.execute(
+                    'DELETE FROM verdicts WHERE key IN ('
+                    'SELECT key FROM verdicts ORDER BY used LIMIT ?)',
+                    (entries - self.max_entries,)
+                ).rowcount
+        self.committed = self.entries = entries
+        self.pending.clear()
+        self.touched.clear()
+
+    def close(self) -> None:
+        """Commits the changes and closes the database."""
+
+        try:
+            self.commit()
+        finally:
+            self.connection.close()
+
+    def _written(self) -> None:
+        """Commits the changes once COMMIT_EVERY of them are stored."""
+
+        if len(self.pending) + len(self.touched) >= self.COMMIT_EVERY:
+            self.commit()
@@ -1,5 +1,9 @@
+import itertools
+import os
 from checkdata import CheckData
-from reader import Reader
+from metrics import metrics
+from readings import Reading
+from renderer import Renderer
 from voightkampfftest import VoightKampffTest
 
 
@@ -11,104 +15,292 @@ class Viewer():
     file_name : str
         File name containing the question/answers.
     check_data : CheckData
-        An object of the CheckData class that validates user input.
+        An object of the CheckData class that validates user input. It is
+        not changed by the viewer and can be shared.
+    error : CheckData.ErrorCheckData
+        The result of the last check of user input.
     test: VoightKampffTest
         An object of the class VoightKampffTest which produces the test result.
     reader : Reader
         An object of the class Reader that reads questions and answers
         from a file.
+    stream : bool
+        If True, the question file is parsed incrementally.
+    early_verdict : bool
+        If True, the test stops as soon as the remaining questions can no
+        longer change the result.
+    sample : int
+        If set, only this number of randomly chosen questions is asked.
+    seed
+        Seed of the choice of the sampled questions.
+    log_name : str
+        If set, every validated reading is appended to this session log
+        and an interrupted interview can be resumed from it.
+    answered : int
+        Number of questions answered before the interview was resumed.
+    resumed : bool
+        True if the interview was restored from the session log.
+    renderer : Renderer
+        Writes every screen of the interview with a single write. The
+        prompts are still shown by input() unless an input stream is set.
+    input_stream : file object
+        If set, the values are read from this stream one line at a time
+        and the prompts are written by the renderer. The end of the
+        stream is read as "exit". If None, input() is used.
     """
 
-    def __init__(self) -> None:
+    FILE_PROMPT = (
+        'Enter the name of the questions and answers file '
+        '(to exit, enter "exit"): '
+    )
+    ANSWER_PROMPT = '\tEnter response number(to exit, enter "exit"): '
+    RESPIRATION_PROMPT = (
+        "Enter the subject's breathing readings(to exit, enter 'exit'): "
+    )
+    HEART_RATE_PROMPT = (
+        "Enter the subject's heart rate readings"
+        "(to exit, enter 'exit'): "
+    )
+    BLUSHING_LEVEL_PROMPT = (
+        "Enter the test subject's redness level(from 0 to 5) "
+        "reading(to exit, enter 'exit'): "
+    )
+    PUPILLARY_DILATION_PROMPT = (
+        "Enter the subject's pupil dilation reading(to exit, "
+        "enter 'exit'): "
+    )
+    BEGIN_BANNER = (
+        '========================'
+        'Test has begun'
+        '========================'
+    )
+    END_BANNER = (
+        '========================'
+        'Test completed'
+        '========================'
+    )
+    ERROR_MESSAGES = {
+        CheckData.ErrorCheckData.FILE_DOES_NOT_EXIST:
+            'File does not exist. Try again.',
+        CheckData.ErrorCheckData.INVALID_FILE:
+            'Invalid file format specified or empty file. Try again.',
+        CheckData.ErrorCheckData.INVALID_INPUT:
+            '\tInvalid input. Try again.',
+        CheckData.ErrorCheckData.INVALID_RESPIRATION: (
+            '\tIncorrect breathing readings. The value must be '
+            'a positive floating point number not greater than 120. '
+            'Try again.'
+        ),
+        CheckData.ErrorCheckData.INVALID_HEART_RATE: (
+            '\tIncorrect heartbeat readings. The value must be a positive '
+            'number between 30 and 200. Try again.'
+        ),
+        CheckData.ErrorCheckData.INVALID_BLUSHING_LEVEL: (
+            '\tIncorrect redness readings. The value must be between '
+            '0 and 5. Try again.'
+        ),
+        CheckData.ErrorCheckData.INVALID_PUPILLARY_DILATION: (
+            '\tIncorrect pupil readings. The value must be integer between'
+            ' 1 and 15. Try again.'
+        ),
+    }
+
+    def __init__(
+        self,
+        stream: bool = False,
+        early_verdict: bool = False,
+        check_data: CheckData = None,
+        sample: int = None,
+        seed=None,
+        log_name: str = None,
+        compact: bool = False,
+        input_stream=None,
+        output=None
+    ) -> None:
         self.file_name: str = None
-        self.check_data = CheckData()
+        self.stream = stream
+        self.early_verdict = early_verdict
+        self.sample = sample
+        self.seed = seed
+        self.log_name = log_name
+        self.log = None
+        self.answer: CheckData.CheckResult = None
+        self.answered = 0
+        self.resumed = False
+        self.renderer = Renderer(output, compact)
+        self.input_stream = input_stream
+        self.check_data = check_data if check_data is not None else\
+            CheckData(stream)
+        self.error = CheckData.ErrorCheckData.NO_ERROR
         self.test = VoightKampffTest()
-        self.reader = Reader(self.file_name)
+        self.reader = None
+
+    def run(self) -> None:
+        """Runs the whole interview: asks for the question file, asks the
+        questions and displays the result. An interview restored by
+        resume continues with its remaining questions."""
+
+        if not self.resumed:
+            self.ask_file_name()
+        if (self.file_name):
+            self.test_begin()
+            self.testing()
+            self.test_end()
+            self.print_result_test()
 
     def ask_file_name(self) -> str:
         """Asks the user for the name of the question and answer file."""
 
-        file_name = self.repeatable_message(
-            (
-                'Enter the name of the questions and answers file '
-                '(to exit, enter "exit"): '
-            ),
-            self.check_data.check_file
-        )
-        if self.check_data.error == CheckData.ErrorCheckData.NO_ERROR:
-            self.file_name = file_name
+        result = self.ask(self.FILE_PROMPT, self.check_data.validate_file)
+        if self.error == CheckData.ErrorCheckData.NO_ERROR:
+            self.file_name = result.value
+
+    def resume(self) -> bool:
+        """Restores the interview recorded in the session log.
+
+        Returns
+        -------
+        bool
+            Returns True if the log of an interrupted interview exists, its
+            question file is still valid and the interview was restored.
+            False - otherwise.
+        """
+
+        if not self.log_name or not os.path.exists(self.log_name):
+            return False
+        from sessionlog import SessionLog
+
+        replay = SessionLog.replay(self.log_name)
+        if replay.finished or self.check_data.validate_file(
+            replay.bank_name
+        ).code != CheckData.ErrorCheckData.NO_ERROR:
+            return False
+        self.file_name = replay.bank_name
+        self.test = replay.test
+        self.answered = len(replay.answers)
+        self.resumed = True
+        return True
 
     def test_begin(self) -> None:
         """Prints a message indicating the start of the test."""
 
-        print((
-            '========================'
-            'Test has begun'
-            '========================'
-        ))
+        self.renderer.line(self.BEGIN_BANNER)
 
     def testing(self) -> None:
         """Displays a list of questions and answers and receives an answer
-        option from the user.
+        option from the user. With the early verdict enabled the remaining
+        questions are skipped once they can no longer change the result.
+        With a sample size set, only the sampled questions are asked.
+        The questions answered before the interview was resumed are
+        skipped. The session log is started anew unless the interview was
+        resumed, and is marked as finished once the interview is
+        completed.
         """
 
-        self.reader = Reader(self.file_name)
-        for question, answers in zip(
-            self.reader.questions(),
-            self.reader.answers()
-        ):
-            print(f'Question: {question}')
-            print('\tAnswers:')
-            for num, answer in enumerate(answers):
-                print(f'\t\t{num+1}. {answer}')
-            answer = self.repeatable_message(
-                '\tEnter response number(to exit, enter "exit"): ',
-                self.check_data.check_answer
+        if self.log_name:
+            from sessionlog import SessionLog
+
+            self.log = SessionLog(
+                self.log_name, self.file_name, append=self.resumed
             )
-            if self.check_data.error == CheckData.ErrorCheckData.EXIT:
-                break
-            self.input_data_for_test()
-            if self.check_data.error == CheckData.ErrorCheckData.EXIT:
-                break
+        completed = False
+        try:
+            self._ask_questions()
+            completed = self.error != CheckData.ErrorCheckData.EXIT
+        finally:
+            if self.log is not None:
+                if completed:
+                    self.log.finish()
+                else:
+                    self.log.close()
+                self.log = None
+
+    def _ask_questions(self) -> None:
+        """Asks the questions of the interview."""
+
+        from reader import Reader
+
+        with metrics.phase('interview'):
+            self.reader = Reader(self.file_name, self.stream)
+            if self.sample is not None:
+                items = self.reader.sample(self.sample, self.seed)
+                count = len(items) if self.early_verdict else None
+            else:
+                items = self.reader.items()
+                count = self.reader.count() if self.early_verdict else None
+            items = itertools.islice(items, self.answered, None)
+            for asked, (question, answers) in enumerate(
+                items, self.answered + 1
+            ):
+                self.answer = self.ask(
+                    self.ANSWER_PROMPT,
+                    self.check_data.validate_answer,
+                    self.renderer.question_screen(question, answers)
+                )
+                if self.error == CheckData.ErrorCheckData.EXIT:
+                    break
+                self.input_data_for_test()
+                if self.error == CheckData.ErrorCheckData.EXIT:
+                    break
+                if (
+                    count is not None and
+                    self.test.verdict_is_final(count - asked)
+                ):
+                    break
+
+    @staticmethod
+    def format_question(question: str, answers: list) -> str:
+        """Returns the text of the question with the numbered answers.
+
+        Parameters
+        ----------
+        question : str
+            The question.
+        answers : list
+            The answer options.
+
+        Returns
+        -------
+        str
+            The lines to display, separated by newlines.
+        """
+
+        return Renderer.format_question(question, answers)
 
     def input_data_for_test(self):
         """Receives data on breathing, heart rate, redness and pupil dilation
         from the user.
         """
 
-        respiration = self.repeatable_message(
-            "Enter the subject's breathing readings(to exit, enter 'exit'): ",
-            self.check_data.check_respiration
+        respiration = self.ask(
+            self.RESPIRATION_PROMPT,
+            self.check_data.validate_respiration
         )
-        if self.check_data.error != CheckData.ErrorCheckData.EXIT:
-            heart_rate = self.repeatable_message(
-                (
-                    "Enter the subject's heart rate readings"
-                    "(to exit, enter 'exit'): "
-                ),
-                self.check_data.check_heart_rate
+        if self.error != CheckData.ErrorCheckData.EXIT:
+            heart_rate = self.ask(
+                self.HEART_RATE_PROMPT,
+                self.check_data.validate_heart_rate
+            )
+        if self.error != CheckData.ErrorCheckData.EXIT:
+            blushing_level = self.ask(
+                self.BLUSHING_LEVEL_PROMPT,
+                self.check_data.validate_blushing_level
             )
-        if self.check_data.error != CheckData.ErrorCheckData.EXIT:
-            blushing_level = self.repeatable_message(
-                (
-                    "Enter the test subject's redness level(from 0 to 5) "
-                    "reading(to exit, enter 'exit'): "
-                ),
-                self.check_data.check_blushing_level
+        if self.error != CheckData.ErrorCheckData.EXIT:
+            pupillary_dilation = self.ask(
+                self.PUPILLARY_DILATION_PROMPT,
+                self.check_data.validate_pupillary_dilation
             )
-        if self.check_data.error != CheckData.ErrorCheckData.EXIT:
-            pupillary_dilation = self.repeatable_message(
-                (
-                    "Enter the subject's pupil dilation reading(to exit, "
-                    "enter 'exit'): "
-                ),
-                self.check_data.check_pupillary_dilation
+        if self.error != CheckData.ErrorCheckData.EXIT:
+            reading = Reading(
+                respiration.value,
+                heart_rate.value,
+                blushing_level.value,
+                pupillary_dilation.value
             )
-        if self.check_data.error != CheckData.ErrorCheckData.EXIT:
-            self.test.add_respiration(float(respiration))
-            self.test.add_heart_rate(int(heart_rate))
-            self.test.add_blushing_level(int(blushing_level))
-            self.test.add_pupillary_dilation(int(pupillary_dilation))
+            self.test.add_reading(reading)
+            if self.log is not None:
+                self.log.append(self.answer.value, reading)
 
     def repeatable_message(self, message: str, check) -> str:
         """Repeatable message. Prompts the user for some data and verifies it.
@@ -127,69 +319,103 @@ class Viewer():
             The value entered by the user.
 
         """
+        return self.ask(message, check).raw
+
+    def ask(
+        self,
+        message: str,
+        check,
+        screen: str = ''
+    ) -> CheckData.CheckResult:
+        """Prompts the user for some data until it passes the check or
+        "exit" is entered.
+
+        Parameters
+        ----------
+        message : str
+            Message displayed on the screen.
+        check
+            Function returning the CheckData.CheckResult of the entered
+            value.
+        screen : str
+            Screen displayed before the first prompt in the same write,
+            for example the question.
+
+        Returns
+        -------
+        CheckData.CheckResult
+            The result of the check with the parsed value.
+        """
+
         exit = False
         while not exit:
-            answer = input(message)
-            check(answer)
+            with metrics.phase('input_wait'):
+                answer = self.read(screen + message)
+            screen = ''
+            with metrics.phase('validation'):
+                result = check(answer)
+            self.error = result.code
             if (
-                self.check_data.error == CheckData.ErrorCheckData.NO_ERROR or
-                self.check_data.error == CheckData.ErrorCheckData.EXIT
+                self.error == CheckData.ErrorCheckData.NO_ERROR or
+                self.error == CheckData.ErrorCheckData.EXIT
             ):
                 exit = True
             else:
                 self.print_error()
-        return answer
+        return result
+
+    def read(self, message: str) -> str:
+        """Shows the prompt with a single write and reads one value.
+
+        Parameters
+        ----------
+        message : str
+            Message displayed on the screen.
+
+        Returns
+        -------
+        str
+            The entered value without the line break.
+        """
+
+        self.renderer.write(message)
+        if self.input_stream is None:
+            return input('')
+        line = self.input_stream.readline()
+        if not line:
+            return 'exit'
+        return line.rstrip('\r\n')
 
     def print_error(self):
         """Displays a description of the error."""
 
-        if self.check_data.error ==\
-                CheckData.ErrorCheckData.FILE_DOES_NOT_EXIST:
-            print('File does not exist. Try again.')
-        elif self.check_data.error == CheckData.ErrorCheckData.INVALID_FILE:
-            print('Invalid file format specified or empty file. Try again.')
-        elif self.check_data.error == CheckData.ErrorCheckData.INVALID_INPUT:
-            print('\tInvalid input. Try again.')
-        elif self.check_data.error ==\
-                CheckData.ErrorCheckData.INVALID_RESPIRATION:
-            print((
-                '\tIncorrect breathing readings. The value must be '
-                'a positive floating point number not greater than 120. '
-                'Try again.'
-            ))
-        elif self.check_data.error ==\
-                CheckData.ErrorCheckData.INVALID_HEART_RATE:
-            print((
-                '\tIncorrect heartbeat readings. The value must be a positive '
-                'number between 30 and 200. Try again.'
-            ))
-        elif self.check_data.error ==\
-                CheckData.ErrorCheckData.INVALID_BLUSHING_LEVEL:
-            print((
-                '\tIncorrect redness readings. The value must be between '
-                '0 and 5. Try again.'
-            ))
-        elif self.check_data.error ==\
-                CheckData.ErrorCheckData.INVALID_PUPILLARY_DILATION:
-            print((
-                '\tIncorrect pupil readings. The value must be integer between'
-                ' 1 and 15. Try again.'
-            ))
-        else:
-            print('UNKNOWN ERROR')
+        self.renderer.line(self.error_message(self.error))
+
+    @classmethod
+    def error_message(cls, error: CheckData.ErrorCheckData) -> str:
+        """Returns the description of the error.
+
+        Parameters
+        ----------
+        error : CheckData.ErrorCheckData
+            The error found by the check.
+
+        Returns
+        -------
+        str
+            The message displayed to the user.
+        """
+
+        return cls.ERROR_MESSAGES.get(error, 'UNKNOWN ERROR')
 
     def test_end(self) -> None:
         """Prints a message indicating the completed of the test."""
 
-        print((
-            '========================'
-            'Test completed'
-            '========================'
-        ))
+        self.renderer.line(self.END_BANNER)
 
     def print_result_test(self) -> None:
         """Displays the test result."""
 
-        if self.check_data.error == CheckData.ErrorCheckData.NO_ERROR:
+        if self.error == CheckData.ErrorCheckData.NO_ERROR:
             test_subjects = self.test.get_result()
-            print(f"test subject's is {test_subjects}".upper())
+            self.renderer.line(f"test subject's is {test_subjects}".upper())
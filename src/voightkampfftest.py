@@ -1,22 +1,45 @@
+from array import array
 from enum import Enum
+from metrics import metrics
+from readings import Reading, ReadingBuffer
+from scoringrules import ScoringRules
 
 
 class VoightKampffTest():
     """
     Voight-Kampff Test`s.
 
+    The readings are stored in typed columns: the respiration is a
+    number, the heart rate, blushing level and pupillary dilation must
+    be integers from 0 to 255. Other values are rejected with
+    OverflowError or TypeError, and a rejected reading is not added.
+
     Attributes
     ----------
-    respiration : list
-        List of respiration value.
-    heart_rate : list
-        List of heart rate value.
-    blushing_level : list
-        List of blushing level value.
-    pupillary_dilation : list
-        List of pupillary dilation value.
+    rules : ScoringRules
+        The normal ranges and the threshold applied by the test.
+    readings : ReadingBuffer
+        Columnar storage of the readings.
+    normal_count : int
+        Running number of values within the normal ranges.
+    scored_count : int
+        Number of complete readings already counted.
+    respiration : array
+        Column of respiration value.
+    heart_rate : array
+        Column of heart rate value.
+    blushing_level : array
+        Column of blushing level value.
+    pupillary_dilation : array
+        Column of pupillary dilation value.
     """
 
+    RESPIRATION_RANGE = ScoringRules.DEFAULT.respiration
+    HEART_RATE_RANGE = ScoringRules.DEFAULT.heart_rate
+    BLUSHING_LEVEL_RANGE = ScoringRules.DEFAULT.blushing_level
+    PUPILLARY_DILATION_RANGE = ScoringRules.DEFAULT.pupillary_dilation
+    HUMAN_THRESHOLD = ScoringRules.DEFAULT.threshold
+
     class Blushing(Enum):
         """The enumeration class is used to identify blushing."""
 
@@ -27,14 +50,38 @@ class VoightKampffTest():
         ABOVE_MEDIUM_BLUSHING = 4
         HIGH_BLUSHING = 5
 
-    def __init__(self) -> None:
-        self.respiration = list()
-        self.heart_rate = list()
-        self.blushing_level = list()
-        self.pupillary_dilation = list()
+    def __init__(self, rules: ScoringRules = None) -> None:
+        """
+        Parameters
+        ----------
+        rules : ScoringRules
+            The normal ranges and the threshold. By default the rules
+            given by the class constants.
+        """
+
+        self.rules = rules if rules is not None else ScoringRules.DEFAULT
+        self.readings = ReadingBuffer()
+        self.normal_count = 0
+        self.scored_count = 0
+
+    @property
+    def respiration(self):
+        return self.readings.respiration
+
+    @property
+    def heart_rate(self):
+        return self.readings.heart_rate
+
+    @property
+    def blushing_level(self):
+        return self.readings.blushing_level
+
+    @property
+    def pupillary_dilation(self):
+        return self.readings.pupillary_dilation
 
     def add_respiration(self, respiration: float) -> None:
-        """Adds a respiration value to the list.
+        """Adds a respiration value to the column.
 
         Parameters
         ----------
@@ -43,39 +90,170 @@ class VoightKampffTest():
         """
 
         self.respiration.append(respiration)
+        self._update_score()
 
     def add_heart_rate(self, heart_rate: int) -> None:
-        """Adds a heart rate value to the list.
+        """Adds a heart rate value to the column.
 
         Parameters
         ----------
         heart_rate : str
             The value of heart rate.
+
+        Raises
+        ------
+        OverflowError
+            If the value is not from 0 to 255.
+        TypeError
+            If the value is not an integer.
         """
 
         self.heart_rate.append(heart_rate)
+        self._update_score()
 
     def add_blushing_level(self, blushing_level: Blushing) -> None:
-        """Adds a blushing level value to the list.
+        """Adds a blushing level value to the column.
 
         Parameters
         ----------
         blushing_level : str
             The value of blushing level.
+
+        Raises
+        ------
+        OverflowError
+            If the value is not from 0 to 255.
+        TypeError
+            If the value is not an integer.
         """
 
         self.blushing_level.append(blushing_level)
+        self._update_score()
 
     def add_pupillary_dilation(self, pupillary_dilation: int) -> None:
-        """Adds a pupillary dilation value to the list.
+        """Adds a pupillary dilation value to the column.
 
         Parameters
         ----------
         pupillary_dilation : str
             The value of pupillary dilation.
+
+        Raises
+        ------
+        OverflowError
+            If the value is not from 0 to 255.
+        TypeError
+            If the value is not an integer.
         """
 
         self.pupillary_dilation.append(pupillary_dilation)
+        self._update_score()
+
+    def add_reading(self, reading: Reading) -> None:
+        """Adds all values taken for one question.
+
+        Parameters
+        ----------
+        reading : Reading
+            Readings taken for one question.
+        """
+
+        self.readings.append(reading)
+        self._update_score()
+
+    def add_columns(
+        self,
+        respiration,
+        heart_rate,
+        blushing_level,
+        pupillary_dilation
+    ) -> None:
+        """Adds the readings taken for many questions at once.
+
+        Parameters
+        ----------
+        respiration : iterable
+            Respiration values.
+        heart_rate : iterable
+            Heart rate values.
+        blushing_level : iterable
+            Blushing level values.
+        pupillary_dilation : iterable
+            Pupillary dilation values.
+
+        Raises
+        ------
+        OverflowError
+            If an integer reading does not fit into one byte.
+        TypeError
+            If a reading is not a number or an integer reading is a
+            float.
+
+        All columns are converted before any is extended, so the test is
+        left unchanged if a value is rejected.
+        """
+
+        self._update_score()
+        columns = (
+            (self.respiration, array('d', respiration)),
+            (self.heart_rate, array('B', heart_rate)),
+            (self.blushing_level, array('B', blushing_level)),
+            (self.pupillary_dilation, array('B', pupillary_dilation)),
+        )
+        for column, values in columns:
+            column.extend(values)
+        if len(set(len(column) for column, _ in columns)) != 1:
+            self._update_score()
+            return
+        scored_count = self.scored_count
+        self.normal_count += self.rules.count_columns(*(
+            memoryview(column)[scored_count:] for column, _ in columns
+        ))
+        self.scored_count = len(self.readings)
+        if metrics.enabled:
+            metrics.count('readings', amount=self.scored_count - scored_count)
+
+    def get_coefficient(self) -> float:
+        """Returns the share of values within the normal ranges. The value
+        is kept up to date as the readings are added.
+
+        Returns
+        -------
+        float
+            The coefficient from 0 to 1.
+
+        Raises
+        ------
+        ZeroDivisionError
+            If no complete reading has been added.
+        """
+
+        self._update_score()
+        return self.normal_count/(self.scored_count * 4)
+
+    def verdict_is_final(self, remaining_questions: int) -> bool:
+        """Checks whether the result can still change if the remaining
+        questions are answered.
+
+        Parameters
+        ----------
+        remaining_questions : int
+            The number of questions that have not been asked yet.
+
+        Returns
+        -------
+        bool
+            Returns True if the result is the same whatever readings are
+            taken for the remaining questions. False - otherwise.
+        """
+
+        self._update_score()
+        number_answers = (self.scored_count + remaining_questions) * 4
+        if number_answers == 0:
+            return False
+        best = (self.normal_count + remaining_questions * 4)/number_answers
+        worst = self.normal_count/number_answers
+        return self.rules.is_human(best) == self.rules.is_human(worst)
 
     def get_result(self) -> str:
         """Defines and returns the test result.
@@ -86,30 +264,42 @@ class VoightKampffTest():
             Returns the message "human" or "replicant"
         """
 
-        answers = []
-        for respiration, heart_rate, blushing_level, pupillary_dilation in zip(
-            self.respiration,
-            self.heart_rate,
-            self.blushing_level,
-            self.pupillary_dilation
-        ):
-            answer = self.is_human_value(
-                respiration,
-                heart_rate,
-                blushing_level,
-                pupillary_dilation
-            )
-            for val in answer:
-                answers.append(val)
-        number_answers = len(answers)
-        sum_answers = sum(answers)
-        coefficient: float = sum_answers/number_answers
-        print(number_answers)
-        if coefficient >= 0.9:
+        self._update_score()
+        print(self.scored_count * 4)
+        return self.get_verdict()
+
+    def get_verdict(self) -> str:
+        """Returns the test result without printing anything.
+
+        Returns
+        -------
+        str
+            Returns the message "human" or "replicant"
+        """
+
+        with metrics.phase('scoring'):
+            coefficient: float = self.get_coefficient()
+        if self.rules.is_human(coefficient):
             return 'human'
         else:
             return 'replicant'
 
+    def _update_score(self) -> None:
+        """Counts the readings completed since the last call."""
+
+        scored_count = self.scored_count
+        count = self.rules.count
+        for i in range(scored_count, len(self.readings)):
+            self.normal_count += count(
+                self.respiration[i],
+                self.heart_rate[i],
+                self.blushing_level[i],
+                self.pupillary_dilation[i]
+            )
+        self.scored_count = len(self.readings)
+        if metrics.enabled and self.scored_count > scored_count:
+            metrics.count('readings', amount=self.scored_count - scored_count)
+
     def is_human_value(
         self,
         respiration: float,
@@ -132,21 +322,9 @@ class VoightKampffTest():
             The value of pupillary dilation.
         """
 
-        resp_is_normal = False
-        if respiration >= 12.0 and respiration <= 16.0:
-            resp_is_normal = True
-        heart_is_normal = False
-        if heart_rate >= 60 and heart_rate <= 100:
-            heart_is_normal = True
-        blushing_is_normal = False
-        if blushing_level >= 2 and blushing_level <= 4:
-            blushing_is_normal = True
-        pupillary_is_normal = False
-        if pupillary_dilation >= 2 and pupillary_dilation <= 8:
-            pupillary_is_normal = True
-        return (
-            resp_is_normal,
-            heart_is_normal,
-            blushing_is_normal,
-            pupillary_is_normal
+        return self.rules.is_normal(
+            respiration,
+            heart_rate,
+            blushing_level,
+            pupillary_dilation
         )